@@ -0,0 +1,85 @@
+"""
+Driver pipeline throughput from a recorded session (no MCU, no GUI).
+
+Replays capture files (Driver/Capture_File.py) through Driver_Core: PPP decoding,
+channel routing and the batched GUI queue. A thread in this process drains the
+queue like the GUI refresh timer does. Stage metrics cover the whole replay.
+
+Run:
+    python -m Benchmark.Bench_Driver_Replay "Capture/*.cap" --speed 0
+    python -m Benchmark.Bench_Driver_Replay session.cap --speed 10 --json replay.json
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from Driver.Driver_Core import Driver_Core, PORT_NAME
+from Driver.Replay_Source import Replay_Source
+from Setup.Queue_Setup import Queue_Group_Creator, Main_Queue_port
+
+
+def drain(port, stop, counts):
+    """GUI side: read the queue every 10 ms."""
+    while not stop.is_set():
+        while port.receive_fifo():
+            counts["messages"] += 1
+            counts["values"] += len(port.JSON_in)
+        time.sleep(0.01)
+
+
+def run(paths, speed, flush_ms, batch_max):
+    q_group = Queue_Group_Creator({PORT_NAME: 20}).q_group_dict
+    source = Replay_Source(paths, speed=speed)
+    core = Driver_Core(source, q_group, flush_ms, batch_max, stats_ms=0)  # metrics cover the whole replay
+
+    counts = {"messages": 0, "values": 0}
+    stop = threading.Event()
+    consumer = threading.Thread(target=drain, args=(Main_Queue_port(q_group).Port[PORT_NAME], stop, counts), daemon=True)
+    consumer.start()
+
+    t_start = time.perf_counter()
+    while not source.finished:
+        core.step()
+    core.sink.flush()
+    elapsed = time.perf_counter() - t_start
+    report = core.metrics.report()
+    time.sleep(0.1)
+    stop.set()
+    consumer.join()
+
+    return {
+        "captures": source.paths,
+        "speed": speed,
+        "seconds": elapsed,
+        "datagrams": source.records,
+        "datagrams_s": source.records / elapsed,
+        "values": core.router.messages,
+        "values_s": core.router.messages / elapsed,
+        "values_received_gui": counts["values"],
+        "bad_frames": core.decoder.bad_frames,
+        "dropped": core.sink.dropped,
+        "stages": report,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("captures", nargs="+", help="capture files or glob patterns")
+    parser.add_argument("--speed", type=float, default=0, help="replay speed factor, 0 = as fast as possible")
+    parser.add_argument("--flush-ms", type=int, default=20)
+    parser.add_argument("--batch-max", type=int, default=256)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    result = run(args.captures, args.speed, args.flush_ms, args.batch_max)
+    print(f"\n{result['datagrams']} datagrams, {result['values']} values in {result['seconds']:.2f} s: {result['datagrams_s']:.0f} datagrams/s, {result['values_s']:.0f} values/s")
+    print("Whole run:", Driver_Core.format_stages(result["stages"]))
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(result, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
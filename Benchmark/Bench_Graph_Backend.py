@@ -0,0 +1,114 @@
+"""
+Frames per second vs. points on screen for the Temp_Graph rendering backends.
+
+Draws 24 curves (one per RTD channel) in a 1280x720 Temp_Graph, replaces their data every
+frame and forces a synchronous repaint. Each backend is measured for several point counts.
+Clip-to-view and downsampling of the live curves are switched off, so every point is drawn;
+"points" is the vertex count the curves actually hold. The GL_RENDERER string of the viewport
+is recorded to tell software (llvmpipe) from hardware runs.
+
+Run (CPU-only Linux, software GL through Mesa llvmpipe):
+    LIBGL_ALWAYS_SOFTWARE=1 python -m Benchmark.Bench_Graph_Backend
+    python -m Benchmark.Bench_Graph_Backend --points 10000 100000 --frames 100 --json graph.json
+
+When OpenGL is unavailable the "opengl" run falls back to raster and is reported as such.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6 import QtWidgets
+from PyQt6.QtOpenGL import QOpenGLVersionFunctionsFactory, QOpenGLVersionProfile
+from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+
+from GUI.Main_Project.Graphics.Temp_Graph import BACKENDS, Temp_Graph
+
+NB_CURVES = 24
+GL_RENDERER = 0x1F01
+
+
+def gl_renderer(pw):
+    """GL_RENDERER of the plot viewport (e.g. "llvmpipe (LLVM 15.0.7, 256 bits)"), None for raster."""
+    viewport = pw.viewport()
+    if not isinstance(viewport, QOpenGLWidget) or viewport.context() is None:
+        return None
+    profile = QOpenGLVersionProfile()
+    profile.setVersion(2, 0)
+    viewport.makeCurrent()
+    try:
+        functions = QOpenGLVersionFunctionsFactory.get(profile, viewport.context())
+        return str(functions.glGetString(GL_RENDERER)) if functions is not None else None
+    finally:
+        viewport.doneCurrent()
+
+
+def run_backend(backend, points_list, frames):
+    pw = pg.PlotWidget()
+    pw.resize(1280, 720)
+    pw.show()
+    graph = Temp_Graph(pw, title=backend, backend=backend)
+    QtWidgets.QApplication.processEvents()
+    renderer = gl_renderer(pw)
+    print(f"{backend}: GL_RENDERER {renderer}")
+    results = []
+
+    for points in points_list:
+        n = max(points // NB_CURVES, 2)
+        t = np.arange(n, dtype=np.float64) * 0.1
+        rng = np.random.default_rng(0)
+        graph.clear()
+        for channel in range(NB_CURVES):
+            graph.append_topic(f"RTD{channel}", t, rng.standard_normal(n) + channel)
+        for curve in graph.curves.values():
+            # Live curves clip to the view and peak-downsample; draw every point here
+            curve.setClipToView(False)
+            curve.setDownsampling(ds=1, auto=False)
+        QtWidgets.QApplication.processEvents()
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            for channel, curve in enumerate(graph.curves.values()):
+                curve.setData(t, rng.standard_normal(n) + channel)
+            pw.viewport().repaint()
+            QtWidgets.QApplication.processEvents()
+        elapsed = time.perf_counter() - start
+        drawn = sum(len(curve.curve.getData()[0]) for curve in graph.curves.values())
+
+        results.append({
+            "backend": graph.backend,
+            "requested": backend,
+            "gl_renderer": renderer,
+            "points": drawn,
+            "frames": frames,
+            "fps": frames / elapsed,
+        })
+        print(f"{backend:>7} ({graph.backend:>6}) {drawn:>9} points: {frames / elapsed:8.1f} fps")
+
+    pw.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    results = []
+    for backend in args.backends:
+        results.extend(run_backend(backend, args.points, args.frames))
+
+    if args.json:
+        with open(args.json, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
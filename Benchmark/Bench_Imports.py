@@ -0,0 +1,199 @@
+"""
+Import time of every process role of Temperature_Logging, and of the modules loaded on first use.
+
+Roles are read from Temperature_Logging.py itself (no list to keep in sync):
+    launcher : module-level imports
+    driver   : launcher + imports inside Driver_thread (+ the default transport adapter)
+    gui      : launcher + imports inside QT_thread
+With the spawn start method (Windows) every child re-imports the launcher module,
+so the launcher imports are paid again by each child.
+
+First-use modules (FIRST_USE) are timed on top of the gui role: the cost of the
+first New project / history review / CSV export / Excel import / gauge report.
+
+Each measurement runs in a fresh interpreter, `--repeat` times, and keeps the fastest
+run. The heaviest imports of each role come from `python -X importtime`. Modules
+that do not exist on this platform (msvcrt, missing optional packages) are skipped
+and listed.
+
+Results go to Benchmark/Results/<date>_<time>_imports.json; --compare prints the
+change against an earlier result file.
+
+Run:
+    python -m Benchmark.Bench_Imports
+    python -m Benchmark.Bench_Imports --repeat 10 --compare Benchmark/Results/2026_01_05_10_00_00_imports.json
+"""
+
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+ROLE_FUNCTIONS = {"Driver_thread": "driver", "QT_thread": "gui"}
+ROLE_EXTRA = {"driver": ["import Driver.RJ45_UDP"]}  # loaded by make_source() at driver start
+FIRST_USE = (
+    "GUI.Main_Project.New_Project.New_Project",
+    "Setup.LOD_Cache",
+    "csv",
+    "Setup.Read_Excel_Task",
+    "pandas",
+    "Setup.Gauge_Report",
+    "matplotlib.figure",
+)
+
+
+def available(module):
+    try:
+        return importlib.util.find_spec(module.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_statements(nodes, skipped):
+    """Source of the import nodes whose top-level package exists here."""
+    statements = []
+    for node in nodes:
+        modules = [alias.name for alias in node.names] if isinstance(node, ast.Import) else [node.module or ""]
+        missing = [module for module in modules if not available(module)]
+        if missing:
+            skipped.update(missing)
+            continue
+        statements.append(ast.unparse(node))
+    return statements
+
+
+def role_statements(launcher_path):
+    """{role: [import statement, ...]} from the launcher source."""
+    with open(launcher_path, encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    skipped = set()
+    launcher = import_statements([node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))], skipped)
+    roles = {"launcher": launcher}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in ROLE_FUNCTIONS:
+            role = ROLE_FUNCTIONS[node.name]
+            own = import_statements([child for child in ast.walk(node) if isinstance(child, (ast.Import, ast.ImportFrom))], skipped)
+            roles[role] = launcher + own + ROLE_EXTRA.get(role, [])
+    return roles, sorted(skipped)
+
+
+def run_python(code, root, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    env = dict(os.environ, PYTHONPATH=root, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    return subprocess.run(command, cwd=root, env=env, capture_output=True, text=True)
+
+
+def timed_import(setup, statements, root, repeat):
+    """Fastest wall time (ms) of `statements` after `setup`, each run in a new interpreter."""
+    code = "\n".join(setup + ["import time as _t", "_t0 = _t.perf_counter()"] + statements + ["print((_t.perf_counter() - _t0) * 1e3)"])
+    best = None
+    for _ in range(repeat):
+        result = run_python(code, root)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}")
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def heaviest(statements, root, top):
+    """Largest cumulative import times (ms) at the first two nesting levels, from -X importtime."""
+    result = run_python("\n".join(statements), root, importtime=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            entries.append((cumulative_us / 1e3, name.strip()))
+    entries.sort(reverse=True)
+    return [{"module": name, "ms": round(ms, 1)} for ms, name in entries[:top]]
+
+
+def run(args):
+    root = rooth_path_finder()
+    roles, skipped = role_statements(os.path.join(root, "Temperature_Logging.py"))
+    result = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "skipped": skipped,
+        "roles": {},
+        "first_use": {},
+    }
+    for role, statements in roles.items():
+        try:
+            result["roles"][role] = {"ms": round(timed_import([], statements, root, args.repeat), 1), "statements": statements, "heaviest": heaviest(statements, root, args.top)}
+        except RuntimeError as e:
+            result["roles"][role] = {"error": str(e), "statements": statements}
+        print_role(role, result["roles"][role])
+
+    gui = roles.get("gui", roles["launcher"])
+    for module in FIRST_USE:
+        if not available(module):
+            result["first_use"][module] = {"error": "not installed"}
+        else:
+            try:
+                result["first_use"][module] = {"ms": round(timed_import(gui, [f"import {module}"], root, args.repeat), 1)}
+            except RuntimeError as e:
+                result["first_use"][module] = {"error": str(e)}
+        info = result["first_use"][module]
+        print(f"  first use {module:45s} " + (f"{info['ms']:8.1f} ms" if "ms" in info else info["error"]))
+    if skipped:
+        print(f"  skipped (not available here): {', '.join(skipped)}")
+    return result
+
+
+def print_role(role, info):
+    if "error" in info:
+        print(f"{role:10s} error: {info['error']}")
+        return
+    print(f"{role:10s} {info['ms']:8.1f} ms")
+    for entry in info["heaviest"]:
+        print(f"    {entry['ms']:8.1f} ms  {entry['module']}")
+
+
+def compare(result, reference_path):
+    with open(reference_path) as reference_file:
+        reference = json.load(reference_file)
+    print(f"\nChange against {reference_path}:")
+    for section in ("roles", "first_use"):
+        for name, info in result[section].items():
+            before = reference.get(section, {}).get(name, {})
+            if "ms" in info and "ms" in before:
+                print(f"  {name:45s} {before['ms']:8.1f} -> {info['ms']:8.1f} ms ({info['ms'] - before['ms']:+.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement (fastest kept)")
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports listed per role")
+    parser.add_argument("--json", help="result file (default: Benchmark/Results/<date>_<time>_imports.json)")
+    parser.add_argument("--compare", help="earlier result file to compare with")
+    args = parser.parse_args()
+
+    result = run(args)
+    output = args.json or os.path.join(rooth_path_finder(), "Benchmark", "Results", time.strftime("%Y_%m_%d_%H_%M_%S") + "_imports.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as result_file:
+        json.dump(result, result_file, indent=2)
+    if args.compare:
+        compare(result, args.compare)
+    print(f"\nResults: {output}")
+
+
+if __name__ == "__main__":
+    main()
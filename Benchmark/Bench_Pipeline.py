@@ -0,0 +1,472 @@
+"""
+Throughput and latency of every acquisition stage, and of the whole pipeline.
+
+Stages (synthetic RTD frames, `--channels` channels, `--messages` messages per frame):
+    ppp_format     : Serial_ppp.ppp_format, one frame per call
+    cmdtable       : CmdTable.convert / get_type and COMPILED lookups, one value per call
+    json_q         : JSON_Q send (child process) -> receive (this process), one batch per message
+    linear_buffer  : LinearBuffer.RT_append_data + rb_array_time, one block per call
+    append_sample  : Main_Project.append_sample, one sample per call          (headless GUI)
+    refresh        : Main_Project.refresh_display, one queue batch per call     (headless GUI)
+    database_write : Main_Project.database_write, one second of samples per call (SQLite file)
+    save_csv       : Main_Project.Save_cvs_cmd, whole database per call
+    end_to_end     : MCU_Simulator -> UDP -> Driver_Core (child processes) -> GUI queue,
+                     latency = driver receive -> GUI receive
+
+Every stage reports items/s, p50/p99 latency per call (µs) and the peak Python
+allocation (tracemalloc, measured on a separate shorter pass). A stage that cannot
+run here (missing module, no display) is reported with its error instead.
+
+Results go to Benchmark/Results/<date>_<time>_pipeline.json; --compare prints the
+change against an earlier result file.
+
+Run:
+    QT_QPA_PLATFORM=offscreen python -m Benchmark.Bench_Pipeline
+    python -m Benchmark.Bench_Pipeline --stages ppp_format json_q end_to_end --rate 20000
+    python -m Benchmark.Bench_Pipeline --compare Benchmark/Results/2026_01_05_10_00_00_pipeline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+STAGES = ("ppp_format", "cmdtable", "json_q", "linear_buffer", "append_sample", "refresh", "database_write", "save_csv", "end_to_end")
+PORT_BENCH = "RJ45_UDP"
+
+
+# ── Helpers ─────────────────────────────────────────────────────────────────────
+
+
+def rtd_channels(count):
+    from Setup.Channel_Registry import get_registry
+
+    registry = get_registry()
+    names = registry.names("RTD")
+    return [registry.channel(names[i % len(names)]) for i in range(count)]
+
+
+def make_frames(channels, messages, count, seed=0):
+    """`count` framed datagrams of `messages` RTD messages each (raw ints around 25 °C)."""
+    from Driver.Serial_ppp import Serial_ppp
+
+    serial_ppp = Serial_ppp()
+    rng = np.random.default_rng(seed)
+    frames = []
+    index = 0
+    for _ in range(count):
+        data = bytearray()
+        for _ in range(messages):
+            channel = channels[index % len(channels)]
+            index += 1
+            data += struct.pack("<Bi", channel["cmd"], int(rng.normal(25.0, 5.0) * 1024))
+        serial_ppp.add_length(data)
+        serial_ppp.add_crc(data)
+        frames.append(bytes(serial_ppp.add_frame(data)))
+    return frames
+
+
+def summary(name, latencies_ns, items, seconds, extra=None):
+    latencies = np.asarray(latencies_ns, dtype=np.float64) / 1e3
+    result = {
+        "stage": name,
+        "calls": int(latencies.size),
+        "items": int(items),
+        "seconds": seconds,
+        "items_s": items / seconds if seconds else 0.0,
+        "p50_us": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+        "p99_us": float(np.percentile(latencies, 99)) if latencies.size else 0.0,
+    }
+    result.update(extra or {})
+    return result
+
+
+def timed_calls(fn, calls, items_per_call):
+    """Call fn(i) `calls` times; per-call latency and throughput."""
+    latencies = np.empty(calls, dtype=np.int64)
+    clock = time.perf_counter_ns
+    t_start = clock()
+    for i in range(calls):
+        t0 = clock()
+        fn(i)
+        latencies[i] = clock() - t0
+    seconds = (clock() - t_start) / 1e9
+    return latencies, calls * items_per_call, seconds
+
+
+def peak_alloc_kb(fn, calls):
+    """Peak Python allocation while calling fn(i) `calls` times."""
+    tracemalloc.start()
+    try:
+        for i in range(calls):
+            fn(i)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_calls(name, setup, calls, items_per_call, extra=None):
+    """Stage pattern: setup() -> fn(i); timed pass + shorter allocation pass."""
+    fn = setup()
+    latencies, items, seconds = timed_calls(fn, calls, items_per_call)
+    result = summary(name, latencies, items, seconds, extra)
+    result["peak_alloc_kb"] = peak_alloc_kb(fn, max(1, calls // 10))
+    return result
+
+
+# ── Stages ──────────────────────────────────────────────────────────────────────
+
+
+def bench_ppp_format(args):
+    from Driver.Serial_ppp import Serial_ppp
+
+    frames = make_frames(rtd_channels(args.channels), args.messages, 1000)
+
+    def setup():
+        serial_ppp = Serial_ppp()
+        return lambda i: serial_ppp.ppp_format(bytearray(frames[i % 1000]))
+
+    return run_calls("ppp_format", setup, args.frames, 1, {"samples_s_per_frame": args.messages})
+
+
+def bench_cmdtable(args):
+    from Setup.CMD_TABLE import CmdTable, COMPILED
+
+    channels = rtd_channels(args.channels)
+    codes = [channel["cmd"] for channel in channels]
+
+    def setup():
+        table = CmdTable()
+        names, scales = COMPILED.name, COMPILED.scale_list
+
+        def lookup(i):
+            cmd = codes[i % len(codes)]
+            table.convert(cmd)
+            table.get_type(cmd)
+            return names[cmd], scales[cmd]
+
+        return lookup
+
+    return run_calls("cmdtable", setup, args.frames * 4, 1)
+
+
+def _json_q_producer(q_group, batches, batch_size, rate):
+    from Setup.Queue_Setup import Queue_Sec_port
+
+    port = Queue_Sec_port(q_group, PORT_BENCH).Port
+    period = batch_size / rate if rate else 0.0
+    t_next = time.perf_counter()
+    for i in range(batches):
+        port.JSON_out = [{"RTDA1": [time.perf_counter_ns(), float(i)]} for _ in range(batch_size)]
+        while not port.send():
+            time.sleep(0.0001)  # queue full: the consumer sets the pace
+        if period:
+            t_next += period
+            delay = t_next - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def bench_json_q(args):
+    """One-way latency across processes (perf_counter_ns is system-wide on Windows and Linux)."""
+    from Setup.Queue_Setup import Queue_Group_Creator, Main_Queue_port
+
+    q_group = Queue_Group_Creator({PORT_BENCH: 20}).q_group_dict
+    port = Main_Queue_port(q_group).Port[PORT_BENCH]
+    batches = max(1, args.frames // args.batch)
+    producer = mp.Process(target=_json_q_producer, args=(q_group, batches, args.batch, args.rate))
+    producer.start()
+
+    latencies = []
+    received = 0
+    t_start = None
+    deadline = time.perf_counter() + 60
+    while received < batches and time.perf_counter() < deadline:
+        if port.receive_fifo():
+            now = time.perf_counter_ns()
+            if t_start is None:
+                t_start = now
+            latencies.append(now - port.JSON_in[0]["RTDA1"][0])
+            received += 1
+    seconds = (time.perf_counter_ns() - t_start) / 1e9 if t_start else 0.0
+    producer.join()
+    return summary("json_q", latencies, received * args.batch, seconds, {"batch": args.batch, "rate": args.rate})
+
+
+def bench_linear_buffer(args):
+    from Setup.LinearBuffer import LinearBuffer
+
+    block = np.random.default_rng(0).standard_normal((args.channels, args.batch))
+
+    def setup():
+        buffer = LinearBuffer(args.channels, 10, 0.1, 100_000)
+
+        def append(i):
+            buffer.RT_append_data(block)
+            return buffer.rb_array_time(60.0)
+
+        return append
+
+    return run_calls("linear_buffer", setup, max(1, args.frames // args.batch), args.batch)
+
+
+def headless_main_project(q_group):
+    """Main_Project as started by Temperature_Logging (offscreen Qt platform when there is no display)."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from GUI.Main_Project.Main_Project import Main_Project
+
+    window = Main_Project(q_group)
+    window.timer.stop()  # the benchmark calls the timer slots itself
+    window.timer2.stop()
+    return app, window
+
+
+def open_bench_project(window, folder):
+    from Setup.DataBaseWrap import Project
+
+    window.DB.connect_DB(os.path.join(folder, "bench.db"))
+    with window.DB.get_session() as session:
+        project = Project()
+        project.Name = "bench"
+        session.add(project)
+        session.commit()
+    window.DB.connect_DB(window.DB.db_file_path)  # reload project_DB (project_key)
+    window.project_created = True
+
+
+def bench_gui(args, stages):
+    """append_sample, refresh, database_write and save_csv share one headless Main_Project."""
+    from Setup.Queue_Setup import Queue_Group_Creator, Queue_Sec_port
+
+    q_group = Queue_Group_Creator({PORT_BENCH: 0}).q_group_dict
+    app, window = headless_main_project(q_group)
+    names = [channel["name"] for channel in rtd_channels(args.channels)]
+    results = []
+
+    if "append_sample" in stages:
+
+        def setup():
+            window.Buffer_Sample_List.clear()
+            window.plot_pending.clear()
+            return lambda i: window.append_sample(names[i % len(names)], i * 1_000_000, 25.0)
+
+        results.append(run_calls("append_sample", setup, args.frames, 1))
+        window.Buffer_Sample_List.clear()
+
+    if "refresh" in stages:
+        driver_port = Queue_Sec_port(q_group, PORT_BENCH).Port
+        calls = max(1, args.frames // args.batch)
+
+        def setup():
+            def refresh(i):
+                t_ns = time.perf_counter_ns()
+                driver_port.JSON_out = [{names[k % len(names)]: [t_ns + k, 25.0 + (k % 7)]} for k in range(args.batch)]
+                driver_port.send()
+                time.sleep(0)  # let the queue feeder thread pass the batch
+                window.refresh_display()
+                app.processEvents()
+
+            return refresh
+
+        results.append(run_calls("refresh", setup, calls, args.batch, {"batch": args.batch}))
+        window.Buffer_Sample_List.clear()
+
+    if "database_write" in stages or "save_csv" in stages:
+        with tempfile.TemporaryDirectory() as folder:
+            open_bench_project(window, folder)
+            per_call = max(1, args.rate)  # database_write runs once per second
+
+            def setup():
+                def write(i):
+                    t0 = i * 1.0
+                    window.Buffer_Sample_List.extend((names[k % len(names)], t0 + k / per_call, 25.0) for k in range(per_call))
+                    window.database_write()
+
+                return write
+
+            calls = max(2, args.frames // per_call)
+            with contextlib.redirect_stdout(io.StringIO()):  # per-commit prints are not part of the stage
+                result = run_calls("database_write", setup, calls, per_call, {"samples_per_commit": per_call})
+            if "database_write" in stages:
+                results.append(result)
+
+            if "save_csv" in stages:
+                import GUI.Main_Project.Main_Project as main_project_module
+
+                information = main_project_module.QMessageBox.information
+                main_project_module.QMessageBox.information = staticmethod(lambda *a, **k: None)  # no modal dialog in a benchmark
+                try:
+                    with window.DB.get_session() as session:
+                        from Setup.DataBaseWrap import Sample
+
+                        rows = session.query(Sample).count()
+                    with contextlib.redirect_stdout(io.StringIO()):  # Save_cvs_cmd prints its paths and progress
+                        results.append(run_calls("save_csv", lambda: (lambda i: window.Save_cvs_cmd()), 3, rows, {"rows": rows}))
+                finally:
+                    main_project_module.QMessageBox.information = information
+            window.DB.engine.dispose()
+
+    window.close()
+    return results
+
+
+def _driver_process(q_group, port, exit_event):
+    from Driver.Driver_Core import Driver_Core
+    from Driver.RJ45_UDP import RJ45_UDP
+
+    Driver_Core(RJ45_UDP(host_port=port), q_group, stats_ms=0).run(exit_event)
+
+
+def _simulator_process(port, rate, channels, seconds, messages):
+    from Driver.MCU_Simulator import MCU_Simulator
+    from Setup.Channel_Registry import get_registry
+
+    boards = get_registry().boards()[: max(1, channels // 8)]
+    simulator = MCU_Simulator(port=port, boards=boards, rtd_rate=rate / len(boards), messages_per_frame=messages, seed=0)
+    simulator.run(duration=seconds, stats_s=1e9)
+
+
+def bench_end_to_end(args):
+    from Driver.Driver_Core import PORT_NAME
+    from Setup.Queue_Setup import Queue_Group_Creator, Main_Queue_port
+
+    q_group = Queue_Group_Creator({PORT_NAME: 20}).q_group_dict
+    port = Main_Queue_port(q_group).Port[PORT_NAME]
+    exit_event = mp.Event()
+    udp_port = args.udp_port
+    driver = mp.Process(target=_driver_process, args=(q_group, udp_port, exit_event))
+    driver.start()
+    time.sleep(2.0)  # driver process import + bind
+    simulator = mp.Process(target=_simulator_process, args=(udp_port, args.rate, args.channels, args.seconds, args.messages))
+    simulator.start()
+
+    latencies = []
+    samples = 0
+    t_first = t_last = 0
+    deadline = time.perf_counter() + args.seconds + 1.0
+    while time.perf_counter() < deadline:
+        if port.receive_fifo():
+            now = time.perf_counter_ns()
+            t_first = t_first or now
+            t_last = now
+            for sample in port.JSON_in:
+                for t_ns, _value in sample.values():
+                    latencies.append(now - t_ns)
+            samples += len(port.JSON_in)
+        else:
+            time.sleep(0.001)
+    seconds = (t_last - t_first) / 1e9
+
+    simulator.join()
+    exit_event.set()
+    driver.join(timeout=5)
+    if driver.is_alive():
+        driver.terminate()
+    return summary("end_to_end", latencies, samples, seconds, {"rate": args.rate, "messages_per_frame": args.messages})
+
+
+# ── Runner ──────────────────────────────────────────────────────────────────────
+
+
+def run(args):
+    results = []
+    stage_functions = {
+        "ppp_format": bench_ppp_format,
+        "cmdtable": bench_cmdtable,
+        "json_q": bench_json_q,
+        "linear_buffer": bench_linear_buffer,
+        "end_to_end": bench_end_to_end,
+    }
+    gui_stages = [stage for stage in args.stages if stage in ("append_sample", "refresh", "database_write", "save_csv")]
+
+    for stage in args.stages:
+        if stage in gui_stages:
+            if stage != gui_stages[0]:
+                continue
+            try:
+                stage_results = bench_gui(args, gui_stages)
+            except Exception as e:  # e.g. no PyQt6 / SQLAlchemy, or a Python older than the GUI code
+                stage_results = [{"stage": name, "error": f"{type(e).__name__}: {e}"} for name in gui_stages]
+        else:
+            try:
+                stage_results = [stage_functions[stage](args)]
+            except Exception as e:
+                stage_results = [{"stage": stage, "error": f"{type(e).__name__}: {e}"}]
+        for result in stage_results:
+            print_result(result)
+        results.extend(stage_results)
+    return results
+
+
+def print_result(result):
+    if "error" in result:
+        print(f"{result['stage']:>15}: skipped ({result['error']})")
+    else:
+        peak = f"  peak {result['peak_alloc_kb']:>8.0f} kB" if "peak_alloc_kb" in result else ""
+        print(f"{result['stage']:>15}: {result['items_s']:>12.0f} items/s  p50 {result['p50_us']:>9.1f} us  p99 {result['p99_us']:>9.1f} us{peak}")
+
+
+def compare(results, reference_path):
+    with open(reference_path, "r") as json_file:
+        reference = {result["stage"]: result for result in json.load(json_file)["results"]}
+    print(f"\nChange vs. {reference_path}:")
+    for result in results:
+        old = reference.get(result["stage"])
+        if old is None or "error" in result or "error" in old:
+            continue
+        ratio = result["items_s"] / old["items_s"] if old["items_s"] else float("nan")
+        print(f"{result['stage']:>15}: throughput x{ratio:.2f}, p99 {old['p99_us']:.1f} -> {result['p99_us']:.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--channels", type=int, default=24, help="RTD channels in the synthetic traffic")
+    parser.add_argument("--messages", type=int, default=1, help="messages per frame")
+    parser.add_argument("--frames", type=int, default=20000, help="frames/samples per stage")
+    parser.add_argument("--batch", type=int, default=64, help="samples per queue message / buffer block")
+    parser.add_argument("--rate", type=int, default=5000, help="samples/s offered (json_q, database_write, end_to_end), 0 = max")
+    parser.add_argument("--seconds", type=float, default=5.0, help="end_to_end duration")
+    parser.add_argument("--udp-port", type=int, default=18888, help="end_to_end driver port")
+    parser.add_argument("--json", help="result file (default: Benchmark/Results/<date>_<time>_pipeline.json)")
+    parser.add_argument("--compare", help="earlier result file to compare with")
+    args = parser.parse_args()
+    if args.rate == 0 and "end_to_end" in args.stages:
+        parser.error("end_to_end needs a rate (the simulator is paced)")
+
+    results = run(args)
+
+    output = args.json or os.path.join(rooth_path_finder(), "Benchmark", "Results", time.strftime("%Y_%m_%d_%H_%M_%S") + "_pipeline.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+    with open(output, "w") as json_file:
+        json.dump({"meta": meta, "results": results}, json_file, indent=2)
+    print(f"\nResults: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Module: Driver/Capture_File.py
+
+Purpose
+-------
+Binary capture of the raw MCU datagrams (field sessions): written by RJ45_UDP
+through Capture_Recorder, read back by the replay transport (Driver/Replay_Source.py).
+
+File layout (little-endian)
+---------------------------
+HEADER : MAGIC(8) | wall_offset_ns (int64)
+RECORD : t_ns (int64) | ip (uint32) | port (uint16) | length (uint16) | data(length)
+
+t_ns is the receive time on the perf_counter_ns clock of the recording process;
+t_ns + wall_offset_ns gives the wall-clock time (time.time_ns) of the datagram.
+A file cut in the middle of a record (crash, power loss) is read up to the last
+complete record.
+"""
+
+import collections
+import glob
+import os
+import re
+import socket
+import struct
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+MAGIC = b"MCUCAP1\n"
+HEADER = struct.Struct("<8sq")
+RECORD = struct.Struct("<qIHH")
+FILE_NAME = re.compile(r"^(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})_(\d+)\.cap$")  # <session>_<index>.cap
+
+
+def capture_paths(patterns: Iterable[str]) -> List[str]:
+    """Files matching the given paths/glob patterns, in name order (rotated files sort by index)."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
+def read_capture(path: str) -> Iterator[Tuple[int, Tuple[str, int], bytes]]:
+    """(t_ns, (ip, port), data) of every complete record of one capture file."""
+    with open(path, "rb") as capture:
+        header = capture.read(HEADER.size)
+        if len(header) < HEADER.size or header[:8] != MAGIC:
+            raise ValueError(f"{path}: not a capture file")
+        content = capture.read()
+
+    view = memoryview(content)
+    pos = 0
+    end = len(content)
+    record_size = RECORD.size
+    while pos + record_size <= end:
+        t_ns, ip, port, length = RECORD.unpack_from(content, pos)
+        pos += record_size
+        if pos + length > end:
+            break  # truncated last record
+        yield t_ns, (socket.inet_ntoa(struct.pack("!I", ip)), port), bytes(view[pos : pos + length])
+        pos += length
+
+
+def read_captures(paths: Iterable[str]) -> Iterator[Tuple[int, Tuple[str, int], bytes]]:
+    """Records of several files in sequence (a rotated session)."""
+    for path in paths:
+        if os.path.getsize(path) >= HEADER.size:
+            yield from read_capture(path)
+
+
+class Capture_Recorder:
+    """
+    Rotating capture writer; the receive path only appends a reference to a deque.
+
+    A background thread packs the records and writes them every `flush_s`. A new file
+    is started past `max_bytes`. The limits `max_files` and `max_total_bytes` apply to all
+    recorder files of the directory (every session): the oldest are deleted first. Other
+    files (renamed or copied captures) are never touched.
+    Files: <directory>/<session YYYY_MM_DD_HH_MM_SS>_<index>.cap (name order = time order).
+
+    Parameters
+    ----------
+    directory : str
+        Capture folder (relative paths are below the project root).
+    max_bytes : int
+        Size of one file.
+    max_files : int
+        Recorder files kept in the directory, all sessions together.
+    max_total_bytes : int, optional
+        Disk space of those files (default max_bytes * max_files).
+    max_pending : int
+        Records held in memory when the disk is slower than the link (oldest dropped first).
+    """
+
+    def __init__(self, directory: str = "Capture", max_bytes: int = 64 * 1024 * 1024, max_files: int = 50, max_total_bytes: Optional[int] = None, max_pending: int = 200000, flush_s: float = 0.2):
+        self.directory = directory if os.path.isabs(directory) else os.path.join(rooth_path_finder(), directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes if max_total_bytes is not None else max_bytes * max_files
+        self.flush_s = flush_s
+        self.session = time.strftime("%Y_%m_%d_%H_%M_%S")
+
+        self.pending = collections.deque(maxlen=max_pending)  # (t_ns, addr, data), append/popleft are thread-safe
+        self.records = 0  # records appended by the receive path
+        self.written = 0  # records on disk
+        self.bytes = 0
+
+        self.file = None
+        self.file_bytes = 0
+        self.index = 0
+        self.paths: List[str] = []
+        self._ips = {}  # ip string -> uint32
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._writer_loop, name="Capture_writer", daemon=True)
+        self.thread.start()
+
+    def record(self, t_ns: int, addr: Tuple[str, int], data: bytes) -> None:
+        """Receive path: keep the datagram for the writer thread (no copy, no I/O)."""
+        self.pending.append((t_ns, addr, data))
+        self.records += 1
+
+    @property
+    def dropped(self) -> int:
+        """Records lost because the writer could not keep up."""
+        return self.records - self.written - len(self.pending)
+
+    def close(self) -> None:
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+        if self.thread.is_alive():
+            # Writer still blocked on the disk: writing from here too would interleave records
+            print(f"Capture: writer did not stop, {len(self.pending)} records not written")
+            return
+        self._write_pending()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _writer_loop(self) -> None:
+        while not self.stop_event.wait(self.flush_s):
+            try:
+                self._write_pending()
+            except OSError as e:
+                print(f"Capture: write error: {e}")
+
+    def _write_pending(self) -> None:
+        pending = self.pending
+        if not pending:
+            return
+        out = bytearray()
+        pack = RECORD.pack
+        ips = self._ips
+        count = 0
+        while pending:
+            t_ns, (ip, port), data = pending.popleft()
+            ip_int = ips.get(ip)
+            if ip_int is None:
+                ip_int = ips[ip] = struct.unpack("!I", socket.inet_aton(ip))[0]
+            out += pack(t_ns, ip_int, port, len(data))
+            out += data
+            count += 1
+
+        if self.file is None or self.file_bytes >= self.max_bytes:
+            self._rotate()
+        self.file.write(out)
+        self.file.flush()
+        self.file_bytes += len(out)
+        self.bytes += len(out)
+        self.written += count
+
+    def _rotate(self) -> None:
+        if self.file is not None:
+            self.file.close()
+        self.index += 1
+        path = os.path.join(self.directory, f"{self.session}_{self.index:03d}.cap")
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, time.time_ns() - time.perf_counter_ns()))
+        self.file_bytes = HEADER.size
+        self.paths.append(path)
+        self._trim(path)
+
+    def _trim(self, current: str) -> None:
+        """Delete the oldest recorder files (any session) past max_files / max_total_bytes, keeping `current`."""
+        captures = []
+        for name in os.listdir(self.directory):
+            match = FILE_NAME.match(name)
+            if match:
+                captures.append((match.group(1), int(match.group(2)), os.path.join(self.directory, name)))
+        captures.sort()  # session then index: oldest first
+
+        sizes = {}
+        for _, _, path in captures:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
+                sizes[path] = 0
+        files = len(captures)
+        total = sum(sizes.values()) - sizes.get(current, 0) + self.max_bytes  # room for the file just started
+        for _, _, path in captures:
+            if files <= self.max_files and total <= self.max_total_bytes:
+                break
+            if path == current:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            files -= 1
+            total -= sizes[path]
@@ -0,0 +1,332 @@
+"""
+Module: Driver/Driver_Core.py
+
+Purpose
+-------
+Transport-agnostic MCU driver (runs in the driver process):
+
+    byte source -> frame decoder -> channel router -> batched sink
+
+- byte source    : transport adapter (RJ45_UDP datagrams, MCU_X86_USB serial stream)
+- frame decoder  : PPP_Stream (START..END split, unescape, length + CRC-8 check)
+- channel router : CMD byte -> channel name / scale / offset (compiled CmdTable)
+- batched sink   : samples grouped into one queue message per flush period
+
+Every stage is timed (Stage_Metrics): throughput, busy time per item, share of the
+loop time, and the receive -> GUI queue latency of the samples.
+
+Transport adapter interface
+---------------------------
+read()      -> (t_ns, bytes) of one receive, or None on timeout (must return within ~0.1 s)
+write(data) : send one framed packet to the MCU
+close()
+DATAGRAM    : True if every read() holds whole frames (a partial tail is then dropped)
+PAUSABLE    : True if reading can wait without losing data (replay); the loop then stops
+              reading while the GUI queue is full instead of letting the sink drop samples
+
+Queues
+------
+Port "RJ45_UDP" (name kept for the GUI): list of {name: [t_ns, value]} per flush;
+{"CMD": .., "VAL": ..} received from the GUI is framed and written to the MCU;
+{"PROFILE": mode, "SECONDS": s} opens a profiling window of the driver process (Setup/Profiler.py).
+
+Configuration
+-------------
+Operation_database.json "Driver" section (see make_source()).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+from Driver.Serial_ppp import Serial_ppp, PPP_Stream
+from Setup.CMD_TABLE import COMPILED
+from Setup.Metrics import get_metrics
+from Setup.Profiler import DEFAULT_SECONDS, get_profiler
+from Setup.Queue_Setup import DRIVER_PORT, Queue_Sec_port
+from Setup.Time_Cycle import Timer_Cycle
+
+PORT_NAME = DRIVER_PORT
+HOLD_WAIT = 0.001  # s, pause of a PAUSABLE source while the sink waits for room in the GUI queue
+
+
+def make_source(driver_config: Dict):
+    """
+    Transport adapter selected by driver_config["transport"] ("udp", "serial" or "replay").
+
+    Adapters are imported here so that a UDP setup does not need pyserial.
+    """
+    transport = driver_config["transport"]
+    if transport == "udp":
+        from Driver.RJ45_UDP import RJ45_UDP
+
+        return RJ45_UDP(**driver_config.get("udp", {}))
+    if transport == "serial":
+        from Driver.MCU_X86_USB import MCU_X86_USB
+
+        return MCU_X86_USB(**driver_config.get("serial", {}))
+    if transport == "replay":
+        from Driver.Replay_Source import Replay_Source
+
+        return Replay_Source(**driver_config.get("replay", {}))
+    raise ValueError(f"Unknown driver transport: {transport!r}")
+
+
+class Channel_Router:
+    """
+    Convert decoded (cmd1, val1, cmd2, val2, ...) tuples into named, scaled samples.
+
+    Lookups are lists indexed by the CMD byte (COMPILED), no dict access per value.
+    Messages whose CMD byte has no entry in the command table are skipped and counted (unknown_cmd).
+    """
+
+    def __init__(self) -> None:
+        self.names = COMPILED.name
+        self.scales = COMPILED.scale_list
+        self.offsets = COMPILED.offset_list
+        self.messages = 0
+        self.unknown_cmd = 0
+        self.metrics = get_metrics()
+
+    def route(self, messages_tuple, t_ns: int, out: List[Dict]) -> None:
+        """Append {name: [t_ns, value]} for every message of one frame to `out`."""
+        names, scales, offsets = self.names, self.scales, self.offsets
+        unknown = 0
+        for x2 in range(0, len(messages_tuple), 2):
+            cmd = messages_tuple[x2]
+            name = names[cmd]
+            if name is None:
+                unknown += 1  # would reach the GUI and the database as a None topic
+                continue
+            value = messages_tuple[x2 + 1]
+            scale, offset = scales[cmd], offsets[cmd]
+            if scale != 1.0 or offset != 0.0:
+                value = value * scale + offset  # RTD -> float Celsius, ADC -> float Volts
+            out.append({name: [t_ns, value]})
+        self.messages += len(messages_tuple) // 2 - unknown
+        if unknown:
+            self.unknown_cmd += unknown
+            self.metrics.count("unknown_cmd", unknown)
+
+
+class Batch_Sink:
+    """
+    Collect routed samples and send them to the GUI as one list per flush.
+
+    A flush happens every `flush_ms` or as soon as `batch_max` samples are waiting.
+    When the queue is full the batch is kept and retried (up to `batch_max` * 8 samples,
+    older samples are dropped beyond that). PAUSABLE sources are not read while a full batch
+    is waiting (backlog()), so they never reach that limit.
+    """
+
+    def __init__(self, port, flush_ms: int = 20, batch_max: int = 256) -> None:
+        self.port = port
+        self.batch: List[Dict] = []
+        self.batch_max = batch_max
+        self.timer_flush = Timer_Cycle(flush_ms)
+        self.batches = 0
+        self.dropped = 0
+
+    def backlog(self) -> bool:
+        """True while a full batch could not leave (GUI queue full)."""
+        return len(self.batch) >= self.batch_max
+
+    def poll(self) -> bool:
+        if self.batch and (len(self.batch) >= self.batch_max or self.timer_flush.run()):
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """Send the waiting samples; True if they left (False: nothing to send or queue full)."""
+        if not self.batch:
+            return False
+        self.port.JSON_out = self.batch
+        if self.port.send():
+            self.batch = []
+            self.batches += 1
+            self.timer_flush.reset()
+            return True
+        if len(self.batch) > self.batch_max * 8:
+            drop = len(self.batch) - self.batch_max * 8
+            del self.batch[:drop]
+            self.dropped += drop
+        return False
+
+
+class Stage_Metrics:
+    """
+    Per-stage counters of the driver loop, reported and reset by report().
+
+    Stages: read (receives), decode (frames), route (values), sink (values sent).
+    The read time includes waiting for data, so its "load" is the idle share of the loop.
+    """
+
+    STAGES = ("read", "decode", "route", "sink")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.busy_ns = dict.fromkeys(self.STAGES, 0)
+        self.items = dict.fromkeys(self.STAGES, 0)
+        self.latency_sum_ns = 0
+        self.latency_max_ns = 0
+        self.latency_count = 0
+        self.t_start = time.perf_counter_ns()
+
+    def add(self, stage: str, busy_ns: int, items: int) -> None:
+        self.busy_ns[stage] += busy_ns
+        self.items[stage] += items
+
+    def latency(self, latency_ns: int, count: int) -> None:
+        """`count` samples that waited `latency_ns` between receive and the GUI queue."""
+        self.latency_sum_ns += latency_ns * count
+        self.latency_count += count
+        if latency_ns > self.latency_max_ns:
+            self.latency_max_ns = latency_ns
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {"items_s", "us_per_item", "load"}} plus {"latency": {"mean_ms", "max_ms"}} since the last report."""
+        elapsed = max(time.perf_counter_ns() - self.t_start, 1)
+        report = {}
+        for stage in self.STAGES:
+            items, busy = self.items[stage], self.busy_ns[stage]
+            report[stage] = {
+                "items_s": items * 1e9 / elapsed,
+                "us_per_item": busy / items / 1e3 if items else 0.0,
+                "load": busy / elapsed,
+            }
+        report["latency"] = {
+            "mean_ms": self.latency_sum_ns / self.latency_count / 1e6 if self.latency_count else 0.0,
+            "max_ms": self.latency_max_ns / 1e6,
+        }
+        self.reset()
+        return report
+
+
+class Driver_Core:
+    """
+    Driver loop shared by all transports.
+
+    Parameters
+    ----------
+    source : transport adapter (see module docstring)
+    q_group : queue group dictionary (Queue_Group_Creator.q_group_dict)
+    flush_ms, batch_max : Batch_Sink settings
+    stats_ms : period of the link statistics print (0 = off)
+    """
+
+    def __init__(self, source, q_group, flush_ms: int = 20, batch_max: int = 256, stats_ms: int = 5000) -> None:
+        self.source = source
+        self.serial_ppp = Serial_ppp()
+        self.decoder = PPP_Stream(self.serial_ppp)
+        self.router = Channel_Router()
+
+        self.Port_obj = Queue_Sec_port(q_group, PORT_NAME)
+        self.Port = self.Port_obj.Port
+        self.sink = Batch_Sink(self.Port, flush_ms, batch_max)
+
+        self.timer_stats = Timer_Cycle(stats_ms) if stats_ms else None
+        self.link_stats: Dict[str, float] = {}
+        self._last_messages = (time.perf_counter(), 0)
+
+        self.metrics = Stage_Metrics()
+        self.shared_metrics = get_metrics()  # counters/histograms shown by the GUI metrics panel
+        self.profiler = get_profiler()
+        self.stage_stats: Dict[str, Dict[str, float]] = {}
+        self._waiting = []  # (receive t_ns, values) of the samples not sent yet
+
+    def step(self) -> None:
+        """One receive + decode + route, then the periodic work (flush, GUI commands, statistics)."""
+        metrics = self.metrics
+        t0 = time.perf_counter_ns()
+        if self.source.PAUSABLE and self.sink.backlog():
+            time.sleep(HOLD_WAIT)  # backpressure: leave the data in the source until the batch leaves
+            received = None
+        else:
+            received = self.source.read()
+        t1 = time.perf_counter_ns()
+        metrics.add("read", t1 - t0, received is not None)
+
+        if received is not None:
+            t_ns, chunk = received
+            batch = self.sink.batch
+            before = len(batch)
+            frames = self.decoder.decode(chunk)
+            if self.source.DATAGRAM:
+                self.decoder.reset()
+            t2 = time.perf_counter_ns()
+            for messages_tuple in frames:
+                self.router.route(messages_tuple, t_ns, batch)
+            t3 = time.perf_counter_ns()
+            metrics.add("decode", t2 - t1, len(frames))
+            metrics.add("route", t3 - t2, len(batch) - before)
+            if len(batch) > before:
+                self._waiting.append((t_ns, len(batch) - before))
+            t1 = t3
+            shared_metrics = self.shared_metrics
+            shared_metrics.count("datagrams")
+            shared_metrics.count("values", len(batch) - before)
+            shared_metrics.record("driver_step_ns", t3 - t0)
+
+        values = len(self.sink.batch)
+        if self.sink.poll():
+            t_sent = time.perf_counter_ns()
+            metrics.add("sink", t_sent - t1, values)
+            for t_ns, count in self._waiting:
+                metrics.latency(t_sent - t_ns, count)
+            self._waiting.clear()
+        elif len(self._waiting) > self.sink.batch_max * 8:
+            del self._waiting[0]  # samples dropped by the sink
+        self.send_ppp()
+        if self.profiler.active:
+            self.profiler.poll()
+
+        if self.timer_stats is not None and self.timer_stats.run():
+            self.link_stats = self.stats()
+            self.stage_stats = self.metrics.report()
+            print(
+                "{transport}: {bytes_s:.0f} B/s, {frames_s:.0f} frames/s, {messages_s:.0f} values/s, "
+                "resyncs {resyncs}, bad frames {bad_frames}, unknown cmd {unknown_cmd}, dropped {dropped}".format(**self.link_stats)
+            )
+            print(self.format_stages(self.stage_stats))
+
+    @staticmethod
+    def format_stages(stage_stats: Dict[str, Dict[str, float]]) -> str:
+        parts = [f"{stage} {info['items_s']:.0f}/s {info['us_per_item']:.1f} us {info['load']:.0%}" for stage, info in stage_stats.items() if stage != "latency"]
+        latency = stage_stats["latency"]
+        return " | ".join(parts) + f" | latency {latency['mean_ms']:.2f} ms (max {latency['max_ms']:.2f})"
+
+    def run(self, exit_event) -> None:
+        try:
+            while not exit_event.is_set():
+                self.step()
+        finally:
+            self.profiler.stop()
+            self.sink.flush()
+            self.source.close()
+
+    def send_ppp(self) -> None:
+        """Frame the commands received from the GUI and write them to the MCU (profiling requests are handled here)."""
+        while self.Port.receive_fifo():
+            JSON_message = self.Port.JSON_in
+            if "PROFILE" in JSON_message:
+                self.profiler.start(JSON_message["PROFILE"], JSON_message.get("SECONDS", DEFAULT_SECONDS))
+                continue
+            self.send_command(JSON_message)
+
+    def send_command(self, JSON_message: Dict) -> None:
+        self.source.write(self.serial_ppp.send_ppp(JSON_message))
+
+    def stats(self) -> Dict[str, float]:
+        """Link rates since the previous call plus cumulative error counters."""
+        rates = self.decoder.rates()
+        now = time.perf_counter()
+        last_time, last_messages = self._last_messages
+        rates["messages_s"] = (self.router.messages - last_messages) / max(now - last_time, 1e-9)
+        self._last_messages = (now, self.router.messages)
+        rates["unknown_cmd"] = self.router.unknown_cmd
+        rates["dropped"] = self.sink.dropped
+        rates["transport"] = type(self.source).__name__
+        return rates
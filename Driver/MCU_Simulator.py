@@ -0,0 +1,222 @@
+"""
+Module: Driver/MCU_Simulator.py
+
+Purpose
+-------
+Software stand-in for the Temp_UDP firmware (Task_LTM2985 + Task_read_ADC + Task_UDP):
+PPP-framed RTD and ADC datagrams sent to the PC driver (HOST_PORT 8888), for
+benchmarks and regression tests without hardware.
+
+Firmware behaviour reproduced
+-----------------------------
+- RTD : one channel per measurement, channels of a board in round robin, raw int
+        (°C * 1024), one datagram per sample
+- ADC : ADC1 + ADC2 of a board in one frame every second, raw int (V * 72)
+- CMD codes, types and scales come from the channel registry (same as CmdTable)
+
+Test knobs (beyond the firmware)
+--------------------------------
+speed               : time acceleration (rates are multiplied, signals follow simulated time)
+messages_per_frame  : RTD samples packed in one frame (multi-message frames)
+burst               : frames held and then sent back-to-back (WiFi stack batching)
+loss, corrupt       : probability of dropping / flipping one bit of a datagram
+
+Run:
+    python -m Driver.MCU_Simulator --speed 50
+    python -m Driver.MCU_Simulator --boards RTDA RTDB --rtd-rate 20 --messages-per-frame 4 --loss 0.01 --duration 60
+"""
+
+import argparse
+import math
+import random
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+from Driver.Serial_ppp import Serial_ppp
+from Setup.Channel_Registry import get_registry
+
+
+class MCU_Simulator:
+    """
+    Parameters
+    ----------
+    host, port : destination (PC driver)
+    boards : list of str, optional
+        Boards to simulate (default: all boards of the registry).
+    rtd_rate : float
+        RTD samples per second and per board (firmware: one channel per conversion).
+    adc_rate : float
+        ADC frames (ADC1 + ADC2) per second and per board.
+    speed, messages_per_frame, burst, loss, corrupt : see module docstring
+    seed : int, optional
+        Random seed (signals noise, loss, corruption) for reproducible runs.
+    """
+
+    MAX_DATAGRAM = 512  # UDP_TX_PACKET_MAX_SIZE of the firmware
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8888,
+        boards: Optional[List[str]] = None,
+        rtd_rate: float = 10.0,
+        adc_rate: float = 1.0,
+        speed: float = 1.0,
+        messages_per_frame: int = 1,
+        burst: int = 1,
+        loss: float = 0.0,
+        corrupt: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.addr = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.serial_ppp = Serial_ppp()
+        self.random = random.Random(seed)
+
+        registry = get_registry()
+        self.boards = boards or registry.boards()
+        self.rtd_channels: Dict[str, List[Dict]] = {board: [registry.channel(name) for name in registry.names("RTD", board)] for board in self.boards}
+        self.adc_channels: Dict[str, List[Dict]] = {board: [registry.channel(name) for name in registry.names("ADC", board)] for board in self.boards}
+        self.phase = {channel["name"]: self.random.uniform(0, 2 * math.pi) for channels in self.rtd_channels.values() for channel in channels}
+
+        self.rtd_period = 1.0 / rtd_rate
+        self.adc_period = 1.0 / adc_rate
+        self.speed = speed
+        # One frame = whole messages and still fits the firmware datagram once escaped (worst case 2x)
+        self.messages_per_frame = max(1, min(messages_per_frame, (self.MAX_DATAGRAM // 2 - 4) // 5))
+        self.burst = max(1, burst)
+        self.loss = loss
+        self.corrupt = corrupt
+
+        self.datagrams = 0
+        self.values = 0
+        self.lost = 0
+        self.corrupted = 0
+
+    # ── Signals ─────────────────────────────────────────────────────────────────
+
+    def rtd_raw(self, channel: Dict, t: float) -> int:
+        """Temperature: slow sine around 25 °C + noise, in raw LTM2985 counts."""
+        celsius = 25.0 + 10.0 * math.sin(2 * math.pi * t / 120.0 + self.phase[channel["name"]]) + self.random.gauss(0, 0.05)
+        return int(round((celsius - channel["offset"]) / channel["scale"]))
+
+    def adc_raw(self, channel: Dict, t: float) -> int:
+        """Rails: ADC1 ~ 5.0 V, ADC2 ~ 3.8 V (battery slowly discharging)."""
+        volts = 5.0 + self.random.gauss(0, 0.01) if channel["alarm_group"] == "ADC1" else 3.8 - 0.0005 * t + self.random.gauss(0, 0.01)
+        return int(round((volts - channel["offset"]) / channel["scale"]))
+
+    # ── Frames ──────────────────────────────────────────────────────────────────
+
+    def frame(self, messages: List[Tuple[int, int]]) -> bytes:
+        """START + escaped([CMD VAL] * N, LEN, CRC) + END, as Serial_PPP::convert_out of the firmware."""
+        data = bytearray()
+        for cmd, val in messages:
+            data += self.serial_ppp.messaging_formating({"CMD": cmd, "VAL": val})
+        self.serial_ppp.add_length(data)
+        self.serial_ppp.add_crc(data)
+        return bytes(self.serial_ppp.add_frame(data))
+
+    def send(self, datagram: bytes) -> None:
+        if self.loss and self.random.random() < self.loss:
+            self.lost += 1
+            return
+        if self.corrupt and self.random.random() < self.corrupt:
+            damaged = bytearray(datagram)
+            damaged[self.random.randrange(1, len(damaged) - 1)] ^= 1 << self.random.randrange(8)
+            datagram = bytes(damaged)
+            self.corrupted += 1
+        self.sock.sendto(datagram, self.addr)
+        self.datagrams += 1
+
+    # ── Main loop ───────────────────────────────────────────────────────────────
+
+    def run(self, duration: Optional[float] = None, stop_event=None, stats_s: float = 5.0) -> None:
+        """Send until `duration` (real seconds) has elapsed or `stop_event` is set (Ctrl+C also stops)."""
+        next_rtd = {board: 0.0 for board in self.boards}  # simulated time of the next sample
+        rtd_index = {board: 0 for board in self.boards}
+        next_adc = {board: self.adc_period for board in self.boards}
+        held = []  # frames waiting for a full burst
+
+        t_start = time.perf_counter()
+        t_stats = t_start + stats_s
+        try:
+            while True:
+                now = time.perf_counter()
+                if (duration is not None and now - t_start >= duration) or (stop_event is not None and stop_event.is_set()):
+                    break
+                t_sim = (now - t_start) * self.speed
+
+                # Samples due since the last pass, grouped into frames like the firmware would send them
+                rtd_messages = []
+                frames = []
+                for board in self.boards:
+                    channels = self.rtd_channels[board]
+                    while channels and next_rtd[board] <= t_sim:
+                        channel = channels[rtd_index[board]]
+                        rtd_messages.append((channel["cmd"], self.rtd_raw(channel, next_rtd[board])))
+                        rtd_index[board] = (rtd_index[board] + 1) % len(channels)
+                        next_rtd[board] += self.rtd_period
+                    while self.adc_channels[board] and next_adc[board] <= t_sim:
+                        frames.append(self.frame([(channel["cmd"], self.adc_raw(channel, next_adc[board])) for channel in self.adc_channels[board]]))
+                        self.values += len(self.adc_channels[board])
+                        next_adc[board] += self.adc_period
+                for i in range(0, len(rtd_messages), self.messages_per_frame):
+                    frames.append(self.frame(rtd_messages[i : i + self.messages_per_frame]))
+                self.values += len(rtd_messages)
+
+                held += frames
+                if len(held) >= self.burst:
+                    for datagram in held:
+                        self.send(datagram)
+                    held.clear()
+
+                if now >= t_stats:
+                    elapsed = now - t_start
+                    print(f"MCU_Simulator: {self.datagrams / elapsed:.0f} datagrams/s, {self.values / elapsed:.0f} values/s, lost {self.lost}, corrupted {self.corrupted}")
+                    t_stats += stats_s
+
+                # Sleep until the next sample is due (real time)
+                t_next = min(list(next_rtd.values()) + list(next_adc.values()))
+                wait = (t_next - (time.perf_counter() - t_start) * self.speed) / self.speed
+                if wait > 0:
+                    time.sleep(min(wait, 0.1))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--boards", nargs="+", help="boards to simulate (default: all)")
+    parser.add_argument("--rtd-rate", type=float, default=10.0, help="RTD samples/s per board")
+    parser.add_argument("--adc-rate", type=float, default=1.0, help="ADC frames/s per board")
+    parser.add_argument("--speed", type=float, default=1.0, help="time acceleration")
+    parser.add_argument("--messages-per-frame", type=int, default=1)
+    parser.add_argument("--burst", type=int, default=1, help="frames held and sent back-to-back")
+    parser.add_argument("--loss", type=float, default=0.0, help="datagram loss probability")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="datagram corruption probability")
+    parser.add_argument("--duration", type=float, help="seconds (default: until Ctrl+C)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    MCU_Simulator(
+        args.host,
+        args.port,
+        args.boards,
+        args.rtd_rate,
+        args.adc_rate,
+        args.speed,
+        args.messages_per_frame,
+        args.burst,
+        args.loss,
+        args.corrupt,
+        args.seed,
+    ).run(args.duration)
+
+
+if __name__ == "__main__":
+    main()
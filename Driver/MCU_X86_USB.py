@@ -1,144 +1,200 @@
 """
 MCU communication driver for USB serial interface.
-Handles PPP protocol messaging over serial ports with automatic device detection and connection management.
-Provides USB-based communication between PC and MCU with CRC validation and error handling.
+Serial transport adapter of the MCU driver (see Driver/Driver_Core.py): the byte stream is
+split into PPP frames, decoded and routed by Driver_Core, the same way as for UDP.
+
+Full duplex
+- RX         : read() is called by the driver loop (bulk reads, never waits on TX or on reconnects)
+- TX         : thread writing framed commands taken from a queue
+- supervisor : thread (re)connecting with exponential backoff; the matched port is cached by VID/PID
 """
 
-from Driver.Serial_ppp import Serial_ppp
+import queue
+import threading
 import time
+from typing import Optional, Tuple
+
 import serial
 from serial.tools import list_ports
-from crc import Calculator, Configuration
 
 
 class MCU_X86_USB:
-    def __init__(self, q_group):
-        self.usb_com = USB_Queue(q_group)
-        self.serial_ppp = Serial_ppp()
+    """
+    Serial byte source for Driver_Core.
+
+    Parameters
+    ----------
+    vid, pid : int
+        USB ids of the MCU serial device (pid None = any).
+    baudrate : int
+    """
+
+    DATAGRAM = False  # stream: frames may span reads
+    PAUSABLE = False  # the port buffer overflows if reads stop
+    READ_MAX = 65536  # largest single read from the port
+    RX_TIMEOUT = 0.1  # s, read timeout (bounds the driver loop reaction to exit)
+    TX_TIMEOUT = 1.0  # s, write timeout
+    BACKOFF_MIN = 0.25  # s, first reconnect delay
+    BACKOFF_MAX = 8.0  # s, reconnect delay cap
+    TX_QUEUE_SIZE = 1000
+
+    def __init__(self, vid: int = 11914, pid: Optional[int] = None, baudrate: int = 921600):
+        self.USB_IDS = ((vid, pid),)
+        self.BAUDRATE = baudrate
         self.serial_port = None
         self.connected = False
 
-        self.faillure_timeout = time.perf_counter_ns()
-        self.received_msg = None
-
-        self.ser = None
-        self.config = Configuration(
-            width=8,
-            polynomial=0x07,
-            init_value=0x00,
-            final_xor_value=0x00,
-            reverse_input=False,
-            reverse_output=False,
-        )
-
-        self.calculator = Calculator(self.config, optimized=True)
-        self.exit = False
-
-    def read_serial_lock(self):
-        self.received_msg = self.serial_port.read(1)
-
-    def read_ppp(self):
-        if not self.connected:
-            print("connection")
-            self.connection()
-            time.sleep(3)
-        elif not self.serial_port.is_open:
-            self.connection()
-            time.sleep(3)
-        else:
+        # Threads and their synchronisation
+        self.tx_queue = queue.Queue(self.TX_QUEUE_SIZE)  # framed packets waiting for the TX thread
+        self.link_up = threading.Event()  # set while the port is open and healthy
+        self.link_lost = threading.Event()  # wakes the supervisor
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.port_lock = threading.Lock()  # open/close of the port vs. RX/TX use
+        self.port_generation = 0  # bumped by every close: errors of an older generation are not a lost link
+        self.cached_port = None  # device path of the last matched port
+        self.reconnects = 0
+
+        self.start()
+
+    # ── Threads ─────────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start the TX and supervisor threads."""
+        self.stop_event.clear()
+        self.link_lost.set()  # first connection
+        for target, name in ((self._supervisor_loop, "USB_supervisor"), (self._tx_loop, "USB_TX")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def close(self):
+        self.stop_event.set()
+        self.link_lost.set()
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads.clear()
+        self.close_com()
+
+    def _tx_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                ppp_DATA = self.tx_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            while not self.link_up.wait(0.1):  # hold the command until the link is back
+                if self.stop_event.is_set():
+                    return
+            port, generation = self._current_port()
             try:
-                #############################
-                #       Get Data Frame      #
-                #############################
-                startbyte = self.serial_port.read_until(b"\r")
-            except serial.SerialException as e:
-                self.connection()
-                ###########################
-                # Get the raw stream frame
-                ###########################
+                port.write(ppp_DATA)
+            except (serial.SerialException, AttributeError, OSError) as e:
+                self._port_error("TX", e, generation)
+
+    def _supervisor_loop(self):
+        delay = self.BACKOFF_MIN
+        while not self.stop_event.is_set():
+            self.link_lost.wait()
+            if self.stop_event.is_set():
+                break
+            if self.connection():
+                self.link_lost.clear()
+                self.link_up.set()
+                delay = self.BACKOFF_MIN
             else:
-                #################
-                # Find Start Frame Byte (\r,0x0D,13)
-                #################
-                if startbyte:
-                    if startbyte[-1] == 13:
-                        #################
-                        # start saving the stream
-                        #################
-                        self.InputRead_Bytes = bytearray(bytes([13]))  # initiate the stream
-                        #################
-                        # End saving the stream Byte (\n,0x0A,10) or reset if Start Frame Byte (\r,0x0D,13)
-                        #################
-                        while self.InputRead_Bytes[-1] != 10:
-                            self.InputRead_Bytes.extend(bytearray(self.serial_port.read_until()))
-                            if self.InputRead_Bytes[-1] == 13:
-                                self.InputRead_Bytes = bytearray(bytes([13]))  # initiate the stream
-
-                        messages_tuple = self.serial_ppp.ppp_format(self.InputRead_Bytes)
-                        if messages_tuple:
-                            for x2 in range(0, int(len(messages_tuple) / 2)):
-                                self.usb_com.QT.JSON_out = {
-                                    "CMD": messages_tuple[x2 * 2],
-                                    "VAL": messages_tuple[x2 * 2 + 1],
-                                }
-                                self.usb_com.QT.send()
-
-    def send_ppp(self):
-        while self.usb_com.QT.receive_fifo():
-            ppp_DATA = self.serial_ppp.send_ppp(self.usb_com.QT.JSON_in)
-
-            if not self.connected:
-                print("connection")
-                self.connection()
-                # time.sleep(3)
-            elif not self.serial_port.is_open:
-                self.connection()
-
-            ################################################
-            #       add the start and ending character     #
-            ################################################
+                self.stop_event.wait(delay)  # interruptible backoff
+                delay = min(delay * 2, self.BACKOFF_MAX)
 
-            else:
-                # ffff=bytes(new_DATA)
-                print("send 0d", bytes(ppp_DATA).hex(" "), "0a")
-                self.serial_port.write(ppp_DATA)
+    def _set_link_lost(self):
+        self.connected = False
+        self.link_up.clear()
+        self.link_lost.set()
+
+    def _current_port(self):
+        """The open port and its generation, read together."""
+        with self.port_lock:
+            return self.serial_port, self.port_generation
+
+    def _port_error(self, direction, error, generation):
+        """RX/TX failure: a lost link, unless the port was closed meanwhile (reconnect or shutdown)."""
+        if generation != self.port_generation or self.stop_event.is_set():
+            return
+        print(f"USB {direction} error: {error}")
+        self._set_link_lost()
+
+    # ── RX / TX ─────────────────────────────────────────────────────────────────
+
+    def read(self) -> Optional[Tuple[int, bytes]]:
+        """Everything waiting on the port (blocks up to the port timeout when idle), or None."""
+        if not self.link_up.wait(self.RX_TIMEOUT):
+            return None
+        # The read itself runs unlocked (it may block RX_TIMEOUT); the generation tells apart a
+        # port closed under it by the supervisor from a real device error.
+        port, generation = self._current_port()
+        try:
+            waiting = port.in_waiting
+            chunk = port.read(min(max(waiting, 1), self.READ_MAX))
+        except (serial.SerialException, AttributeError, OSError) as e:
+            self._port_error("RX", e, generation)
+            return None
+        if not chunk:
+            return None
+        return time.perf_counter_ns(), chunk
+
+    def write(self, ppp_DATA: bytes) -> None:
+        """Queue one framed packet for the TX thread (never blocks the caller)."""
+        try:
+            self.tx_queue.put_nowait(ppp_DATA)
+        except queue.Full:
+            print("USB TX queue full, command dropped")
+
+    # ── Connection ──────────────────────────────────────────────────────────────
+
+    def _matches(self, device):
+        return any(device.vid == vid and (pid is None or device.pid == pid) for vid, pid in self.USB_IDS)
+
+    def find_port(self):
+        """Device path of the MCU: the cached one if still present, else the first VID/PID match."""
+        ports = list_ports.comports()
+        if self.cached_port is not None:
+            for device in ports:
+                if device.device == self.cached_port and self._matches(device):
+                    return device.device
+        for device in ports:
+            if self._matches(device):
+                if device.device != self.cached_port:
+                    print(f"USB device: {device.device} {device.description} (VID {device.vid}, PID {device.pid}, SN {device.serial_number})")
+                self.cached_port = device.device
+                return device.device
+        return None
 
     def connection(self):
+        """One connection attempt; returns True when the port is open."""
         self.connected = False
-        try:
-            self.serial_port.close()
-        except:
-            pass
+        self.close_com()
 
         try:
-            self.ports_list = list_ports.comports()
-            for device in self.ports_list:
-                print("_______________________________________________")
-                print("manufacturer:", device.manufacturer)
-                print("name:", device.name)
-                print("description:", device.description)
-                print("hwid:", device.hwid)
-                print("vid:", device.vid)
-                print("pid:", device.pid)
-                print("serial_number:", device.serial_number)
-                print("location:", device.location)
-                print("product:", device.product)
-                print("interface:", device.interface)
-                print("_______________________________________________")
-                print(device.manufacturer)
-                print(device.vid)
-
-                # if (device.manufacturer=="Silicon Labs" or device.vid==4292) or (device.manufacturer=="Microsoft" and device.vid==11914) or (device.manufacturer=="Microsoft" and device.vid==1155 and device.pid==22336):
-
-                if device.manufacturer == "Microsoft" and device.vid == 11914:
-                    self.serial_port = serial.Serial(device.device, 921600, 8, "N", 1, timeout=1)
-
-                    if self.serial_port.is_open:
-                        self.connected = True
-                        print("connected")
-                        break
-        except:
-            self.connected = False
+            port = self.find_port()
+            if port is None:
+                return False
+            with self.port_lock:
+                self.serial_port = serial.Serial(port, self.BAUDRATE, 8, "N", 1, timeout=self.RX_TIMEOUT, write_timeout=self.TX_TIMEOUT)
+                self.connected = self.serial_port.is_open
+        except (serial.SerialException, OSError) as e:
+            print(f"USB connection failed: {e}")
+            self.cached_port = None  # rescan next time
+            return False
+
+        if self.connected:
+            self.reconnects += 1
+            print("connected")
+        return self.connected
 
     def close_com(self):
-        self.serial_port.close()
+        with self.port_lock:
+            self.port_generation += 1
+            try:
+                if self.serial_port is not None:
+                    self.serial_port.close()
+            except (serial.SerialException, OSError):
+                pass
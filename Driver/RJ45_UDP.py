@@ -1,132 +1,98 @@
 """
-Module: Driver/MCU_X86_RJ45.py
+Module: Driver/RJ45_UDP.py
 
 Purpose
 -------
-Process-isolated UDP driver bridging PC <-> MCU.
-- Receives PPP frames via Serial_ppp, routes values to inter-process queues
-- Sends outbound commands over UDP
-- Streams ADC as (3, N) NumPy block: [ts_ns, Va, Ia]
-- Maintains link watchdog status (RJ45_ST)
-
-Queues
-------
-RJ45_CMD : small dict updates (status/telemetry)
-RJ45_ADC : NumPy blocks (ADC stream)
-
-Watchdog
---------
-- Set RJ45_ST=1 on periodic flush
-- Set RJ45_ST=2 if no RX for wd_receive_rate ns
-- Optional ping: CMD=250, VAL=8888
-
-ADC Buffer Policy
------------------
-Fill Va and Ia until both reach N. If one channel fills first, keep overwriting
-its last slot until the other catches up; then emit the block and reset.
-"""
+UDP transport adapter of the MCU driver (see Driver/Driver_Core.py).
+- Receives MCU datagrams on HOST_PORT, each one holding whole PPP frames
+- Sends framed commands back to the MCU
 
-from Setup.Queue_Setup import Queue_Sec_port
-from Driver.Serial_ppp import Serial_ppp
-from Setup.CMD_TABLE import CmdTable
-import time
-import socket
-from Setup.Time_Cycle import Timer_Cycle
-import numpy as np
-from typing import Dict, Tuple, Union
+Frame decoding, channel routing and the queue output to the GUI are done by
+Driver_Core, the same way for every transport.
 
+Capture
+-------
+With "capture" enabled (the default) every received datagram is also kept, with its receive
+timestamp and source address, in rotating capture files (Driver/Capture_File.py)
+written by a background thread; replay them with the "replay" transport.
 
-class RJ45_UDP:
-    """
-    UDP communication driver for MCU frames (intended to run in its own process).
+Sockets
+-------
+UDP/IPv4 with 100 ms recv timeout (the driver loop stays responsive to exit).
+Bound on host port; commands go to MCU_IP:MCU_PORT when configured, else to the
+address the last datagram came from.
+"""
 
-    Sockets
-    -------
-    UDP/IPv4 with 100 ms recv timeout. Bound on host port, sends to `MCU_IP:MCU_PORT`.
+import socket
+import time
+from typing import Dict, Optional, Tuple
 
-    Inter-process
-    -------------
-    - `self.Port_CMD`: JSON_Q for small dicts to/from GUI/main
-    - `self.Port_ADC`: JSON_Q for NumPy blocks (ADC stream)
+from Driver.Capture_File import Capture_Recorder
 
-    Notes
-    -----
-    - TX framing: current code sends [CMD,VAL,LEN,CRC] without add_frame(); ensure this
-      matches the MCU's UDP expectations. If framing is required, call add_frame().
 
+class RJ45_UDP:
+    """
+    UDP byte source for Driver_Core.
+
+    Parameters
+    ----------
+    host_port : int
+        Local port the MCU sends to.
+    mcu_ip, mcu_port : optional
+        Destination of the commands (default: sender of the last datagram).
+    recv_size : int
+        Largest datagram accepted.
+    capture : dict, optional
+        {"enabled", and Capture_Recorder arguments}; None or enabled False = no capture.
     """
 
-    def __init__(self, q_group):
-        # ── Queues for GUI/process integration ──────────────────────────────────
-
-
-        self.Port_RJ45_obj = Queue_Sec_port(q_group, "RJ45_UDP")
-        self.Port_RJ45 = self.Port_RJ45_obj.Port
-
-        # ── Timing and mappings ─────────────────────────────────────────────────
-        self.timer_port_refresh = Timer_Cycle(500)    # GUI flush timer (units per Timer_Cycle impl)
-        self.t = CmdTable()                           # Command/type lookup
-        self.serial_ppp = Serial_ppp()                # PPP parser/packer
-
-        self.RTDA_VAL_CMD=["RTDA1", "RTDA2", "RTDA3", "RTDA4", "RTDA5", "RTDA6", "RTDA7", "RTDA8"]
-        self.RTDB_VAL_CMD=["RTDB1", "RTDB2", "RTDB3", "RTDB4", "RTDB5", "RTDB6", "RTDB7", "RTDB8"]
-        self.RTDC_VAL_CMD=["RTDC1", "RTDC2", "RTDC3", "RTDC4", "RTDC5", "RTDC6", "RTDC7", "RTDC8"]
-        self.RTD_VAL_CMD=self.RTDA_VAL_CMD+self.RTDB_VAL_CMD+self.RTDC_VAL_CMD
-
-        self.RTDA_ADC_CMD=["RTDA_ADC1", "RTDA_ADC2"]
-        self.RTDB_ADC_CMD=["RTDB_ADC1", "RTDB_ADC2"]
-        self.RTDC_ADC_CMD=["RTDC_ADC1", "RTDC_ADC2"]
-        self.RTD_ADC_CMD=self.RTDA_ADC_CMD+self.RTDB_ADC_CMD+self.RTDC_ADC_CMD
-
-
-        self.HOST_PORT = 8888
+    DATAGRAM = True  # every read() holds whole frames
+    PAUSABLE = False  # the socket buffer overflows if reads stop
+    RCVBUF = 4 * 1024 * 1024  # socket receive buffer (bytes, the OS may cap it)
 
+    def __init__(self, host_port: int = 8888, mcu_ip: Optional[str] = None, mcu_port: Optional[int] = None, recv_size: int = 2048, capture: Optional[Dict] = None):
+        self.HOST_PORT = host_port
+        self.recv_size = recv_size
+        self.mcu_addr: Optional[Tuple[str, int]] = (mcu_ip, mcu_port) if mcu_ip and mcu_port else None
+        self.fixed_addr = self.mcu_addr is not None
 
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF)  # absorbs short stalls (GC, capture writer)
         self.sock.settimeout(0.1)
         self.sock.bind(("", self.HOST_PORT))
 
+        self.capture = None
+        if capture and capture.get("enabled", True):
+            self.capture = Capture_Recorder(**{key: value for key, value in capture.items() if key != "enabled"})
 
-    # ── Receive path ────────────────────────────────────────────────────────────
-    def read_ppp(self) -> None:
-        """
-        Try to read one datagram, parse PPP frames, route values, and perform link checks.
-
-        RX flow
-        -------
-        recv -> Serial_ppp.ppp_format(bytearray) -> (cmd,val,...) -> collectQT()
-
-        Link checks
-        -----------
-        - If time since last send > wd_send_rate: send_wd()
-        - If time since last receive > wd_receive_rate: set RJ45_ST=2 and push status
-        """
+    def read(self) -> Optional[Tuple[int, bytes]]:
+        """One datagram with its receive time (perf_counter_ns), or None on timeout."""
         try:
-            self.InputRead_Bytes = bytearray(self.sock.recv(1024))
+            data, addr = self.sock.recvfrom(self.recv_size)
             # For raw debugging, uncomment:
-            # print("Hex:", ' '.join(f'{byte:02X}' for byte in self.InputRead_Bytes))
-        except Exception:
+            # print("Hex:", ' '.join(f'{byte:02X}' for byte in data))
+        except OSError:
             # Timeout or no data -> quiet; driver stays responsive.
-            pass
-        else:
-            messages_tuple = self.serial_ppp.ppp_format(self.InputRead_Bytes)
-            if messages_tuple:
-                # Walk (cmd,val) pairs
-                for x2 in range(0, int(len(messages_tuple) / 2)):
-                    self.CMD_in = self.t.convert(messages_tuple[x2 * 2])  # mnemonic str
-                    self.VAL_in = messages_tuple[x2 * 2 + 1]
-
-
-
-                    if self.CMD_in in self.RTD_ADC_CMD:
-                        self.VAL_in = self.VAL_in / 72  # Scale ADC to float Volts
-                    
-                    if self.CMD_in in self.RTD_VAL_CMD:
-                        self.VAL_in = self.VAL_in / 1024  # Scale RTD to float Celsius
-
-                    self.Port_RJ45.JSON_out = {self.CMD_in: [time.perf_counter_ns(), self.VAL_in]}
-                    print(f"RJ45_UDP: {self.CMD_in} = {self.VAL_in}")
-                    self.Port_RJ45.send()
-
-
-
+            return None
+        t_ns = time.perf_counter_ns()
+        if self.capture is not None:
+            self.capture.record(t_ns, addr, data)
+        if not self.fixed_addr:
+            self.mcu_addr = addr
+        return t_ns, data
+
+    def write(self, data: bytes) -> None:
+        if self.mcu_addr is None:
+            print("RJ45_UDP: MCU address unknown yet, command dropped")
+            return
+        try:
+            self.sock.sendto(data, self.mcu_addr)
+        except OSError as e:
+            print(f"RJ45_UDP TX error: {e}")
+
+    def close(self) -> None:
+        self.sock.close()
+        if self.capture is not None:
+            self.capture.close()
+            if self.capture.dropped:
+                print(f"RJ45_UDP: capture dropped {self.capture.dropped} datagrams")
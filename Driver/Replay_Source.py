@@ -0,0 +1,97 @@
+"""
+Module: Driver/Replay_Source.py
+
+Purpose
+-------
+Replay transport adapter of the MCU driver (see Driver/Driver_Core.py): recorded
+datagrams (Driver/Capture_File.py) go through the normal PPP decoding, channel
+routing and GUI queue, without the MCU.
+
+Speed
+-----
+speed = 1.0 : recorded pace
+speed = N   : N times faster
+speed = 0   : as fast as the pipeline accepts
+
+Replay is PAUSABLE: while the GUI queue is full, Driver_Core stops calling read()
+instead of dropping samples, so no recorded value is lost at any speed (a paced
+replay then falls behind, see lag_ns).
+
+The receive timestamp given to the pipeline is the replay time, so the GUI sees
+a live session and Driver_Core's latency metrics measure the PC side only.
+"""
+
+import time
+from typing import Iterable, Optional, Tuple
+
+from Driver.Capture_File import capture_paths, read_captures
+
+
+class Replay_Source:
+    """
+    Capture-file byte source for Driver_Core.
+
+    Parameters
+    ----------
+    paths : list of str
+        Capture files or glob patterns, replayed in name order.
+    speed : float
+        Replay speed factor (0 = as fast as possible).
+    loop : bool
+        Restart from the first file at the end.
+    """
+
+    DATAGRAM = True
+    PAUSABLE = True  # records wait in the file while the GUI queue is full
+    MAX_WAIT = 0.1  # s, longest sleep in one read()
+
+    def __init__(self, paths: Iterable[str], speed: float = 1.0, loop: bool = False):
+        self.paths = capture_paths(paths)
+        if not self.paths:
+            raise ValueError("Replay: no capture file given")
+        self.speed = float(speed)
+        self.loop = loop
+
+        self.records = 0
+        self.finished = False
+        self.lag_ns = 0  # how late the last record was sent vs. its schedule (paced replay)
+        self._start()
+
+    def _start(self):
+        self._records = read_captures(self.paths)
+        self._next = next(self._records, None)
+        self._t0_rec = self._next[0] if self._next else 0
+        self._t0_replay = time.perf_counter_ns()
+
+    def read(self) -> Optional[Tuple[int, bytes]]:
+        """Next recorded datagram when it is due, or None (not due yet / end of replay)."""
+        if self._next is None:
+            if self.loop and self.records:
+                self._start()
+            if self._next is None:
+                if not self.finished:
+                    self.finished = True
+                    print(f"Replay: done, {self.records} datagrams")
+                time.sleep(self.MAX_WAIT)
+                return None
+
+        t_rec, _addr, data = self._next
+        now = time.perf_counter_ns()
+        if self.speed > 0:
+            due = self._t0_replay + int((t_rec - self._t0_rec) / self.speed)
+            if due > now:
+                time.sleep(min((due - now) / 1e9, self.MAX_WAIT))
+                now = time.perf_counter_ns()
+                if due > now:
+                    return None
+            self.lag_ns = now - due
+
+        self._next = next(self._records, None)
+        self.records += 1
+        return now, data
+
+    def write(self, data: bytes) -> None:
+        pass  # no MCU: commands are dropped
+
+    def close(self) -> None:
+        self._records.close()
@@ -21,17 +21,23 @@ Public API
 ----------
 ppp_format(bytearray) -> tuple(cmd1, val1, cmd2, val2, ...)
 messaging_formating({"CMD":..,"VAL":..}) -> bytearray([CMD,VAL])
+PPP_Stream.decode(chunk) -> [tuple(cmd1, val1, ...), ...] for every complete frame of a byte stream
+                           (serial chunks or UDP datagrams, see Driver_Core)
 
 Notes
 -----
-- RX path expects a complete datagram/frame (not a streaming parser).
+- ppp_format expects a complete datagram/frame; PPP_Stream splits a byte stream
+  (serial link) into frames first. START/END never appear escaped, so a frame is
+  the bytes between a START and the next END.
 - TX may or may not call add_frame() depending on the MCU's UDP expectations.
 """
 
-from Setup.CMD_TABLE import CmdTable
+from Setup.CMD_TABLE import CmdTable, COMPILED
+from Setup.Metrics import get_metrics
 import struct
 from crc import Calculator, Configuration
 import copy
+import time
 from typing import Dict, List, Tuple, Union
 
 class Serial_ppp:
@@ -56,6 +62,7 @@ class Serial_ppp:
 
         self.t = CmdTable()                 # Lookup for command types ("i"/"f")
         self.debug_stream = 0               # Last raw frame (for diagnostics)
+        self.structs = {}                   # struct format -> compiled struct.Struct
 
        
         self.config = Configuration(width=8,                    # CRC configuration
@@ -176,19 +183,19 @@ class Serial_ppp:
         """
         Unpack [ CMD VAL(4) ] * N into a flat tuple: (cmd1, val1, cmd2, val2, ...)
 
-        Endianness: little ('<'), VAL type comes from CmdTable.get_type(CMD).
+        Endianness: little ('<'), VAL type comes from the compiled CmdTable (indexed by CMD byte).
         """
 
-        total_bytes = len(bytes_array)  # take the total length of the message
-        total_messages = int(total_bytes / 5)  # calculate the total number of messages
-        structure = "<"  # Little-endian format
+        # Build the structure format: every 5th byte is a CMD
+        types = COMPILED.type
+        structure = "<" + "".join(["B" + types[cmd] for cmd in bytes_array[0::5]])
 
-        # Build the structure format
-        for x in range(0, total_messages):
-            structure += "B" + self.t.get_type(bytes_array[x * 5])  # add the datatype of the message
-
-
-        return struct.unpack(structure, bytes_array)  # extract the message in a tuple of pair CMD and VAL
+        unpacker = self.structs.get(structure)
+        if unpacker is None:
+            if len(self.structs) > 256:
+                self.structs.clear()  # keep the cache bounded
+            unpacker = self.structs[structure] = struct.Struct(structure)  # frames repeat the same layouts
+        return unpacker.unpack(bytes_array)  # extract the message in a tuple of pair CMD and VAL
 
     def ppp_format(self, bytes_array: bytearray) -> Tuple[Union[int, float], ...]:
         """
@@ -268,3 +275,108 @@ class Serial_ppp:
         Each message is 5 bytes ([CMD,VAL(4)]), so LEN = len(data) // 5.
         """
         data.append(int(len(data) / 5))
+
+
+class PPP_Stream:
+    """
+    Streaming frame splitter for byte-stream links (serial).
+
+    Chunks of any size are appended to one reusable buffer; every complete
+    START..END frame is cut out and decoded with Serial_ppp.ppp_format, an
+    incomplete tail is kept for the next chunk.
+
+    Stats (cumulative): bytes, frames (valid), bad_frames (length/CRC errors),
+    resyncs (bytes dropped outside a frame, or a frame cut by a new START).
+    """
+
+    MAX_FRAME = 4096  # bytes without END before the partial frame is dropped
+
+    def __init__(self, serial_ppp: "Serial_ppp" = None):
+        self.serial_ppp = serial_ppp if serial_ppp is not None else Serial_ppp()
+        self.buffer = bytearray()
+
+        self.bytes = 0
+        self.frames = 0
+        self.bad_frames = 0
+        self.resyncs = 0
+        self._last_rates = (time.perf_counter(), 0, 0)
+        self.metrics = get_metrics()
+
+    def split(self, chunk) -> List[bytearray]:
+        """Append `chunk` and return the complete frames (START and END included)."""
+        buf = self.buffer
+        buf += chunk
+        self.bytes += len(chunk)
+
+        frames = []
+        pos = 0
+        while True:
+            start = buf.find(13, pos)
+            if start < 0:
+                if pos < len(buf):
+                    self.resyncs += 1  # noise outside any frame
+                pos = len(buf)
+                break
+            if start > pos:
+                self.resyncs += 1  # bytes before the START
+
+            end = buf.find(10, start + 1)
+            if end < 0:
+                if len(buf) - start > self.MAX_FRAME:
+                    self.resyncs += 1  # END lost: drop and wait for the next START
+                    start = buf.find(13, start + 1)
+                    pos = start if start >= 0 else len(buf)
+                    continue
+                pos = start  # incomplete frame, keep it
+                break
+
+            restart = buf.rfind(13, start + 1, end)
+            if restart >= 0:
+                self.resyncs += 1  # frame cut by a new START: keep the last one
+                start = restart
+            frames.append(buf[start : end + 1])
+            pos = end + 1
+
+        del buf[:pos]
+        return frames
+
+    def decode(self, chunk) -> List[Tuple[Union[int, float], ...]]:
+        """Message tuples (cmd1, val1, ...) of every valid frame completed by `chunk`."""
+        t0 = time.perf_counter_ns()
+        decoded = []
+        bad = 0
+        for frame in self.split(chunk):
+            messages_tuple = self.serial_ppp.ppp_format(frame)
+            if messages_tuple:
+                decoded.append(messages_tuple)
+            else:
+                bad += 1
+        self.frames += len(decoded)
+        self.bad_frames += bad
+
+        metrics = self.metrics
+        metrics.count("bytes", len(chunk))
+        metrics.count("frames", len(decoded))
+        if bad:
+            metrics.count("bad_frames", bad)
+        metrics.record("decode_ns", time.perf_counter_ns() - t0)
+        return decoded
+
+    def reset(self) -> None:
+        """Drop an incomplete frame (datagram links: a frame never spans two datagrams)."""
+        if self.buffer:
+            self.resyncs += 1
+            self.buffer.clear()
+
+    def rates(self) -> Dict[str, float]:
+        """bytes/s and frames/s since the previous call, plus the cumulative error counters."""
+        now = time.perf_counter()
+        last_time, last_bytes, last_frames = self._last_rates
+        elapsed = max(now - last_time, 1e-9)
+        self._last_rates = (now, self.bytes, self.frames)
+        return {
+            "bytes_s": (self.bytes - last_bytes) / elapsed,
+            "frames_s": (self.frames - last_frames) / elapsed,
+            "resyncs": self.resyncs,
+            "bad_frames": self.bad_frames,
+        }
@@ -0,0 +1,64 @@
+"""
+Dock listing the alarm events (event_table) of the live project or of a recorded one.
+Double-clicking an event zooms the graph panels on it.
+"""
+
+from PyQt6 import QtCore, QtWidgets
+from PyQt6.QtGui import QColor
+
+from Setup.Limit_Check import LimitCheck
+
+
+class Event_List(QtWidgets.QDockWidget):
+    jump_requested = QtCore.pyqtSignal(float, float)  # x0, x1 of the graph range to show
+
+    COLUMNS = ["Start (s)", "End (s)", "Topic", "Kind", "Level", "Peak"]
+    MIN_SPAN = 10.0  # seconds shown around an event (still open or very short)
+
+    def __init__(self, parent=None):
+        super().__init__("Alarm events", parent)
+        self.LimitCheck_obj = LimitCheck()
+        self.events = []
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.cellDoubleClicked.connect(self._on_double_click)
+        self.setWidget(self.table)
+
+    def set_events(self, events):
+        """Show a list of event dicts (DataBaseWrap.list_events), oldest first."""
+        at_bottom = self.table.verticalScrollBar().value() == self.table.verticalScrollBar().maximum()
+        self.events = list(events)
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(self.events))
+        for row, event in enumerate(self.events):
+            if event["kind"] == "rate":
+                level_text = "RATE"
+            else:
+                level_text = self.LimitCheck_obj.warning[event["level"]]["key"]
+            cells = [
+                f"{event['t_start']:.1f}",
+                "active" if event["t_end"] is None else f"{event['t_end']:.1f}",
+                event["topic"],
+                event["kind"],
+                level_text,
+                "" if event["peak"] is None else f"{event['peak']:.3f}",
+            ]
+            color = QColor(self.LimitCheck_obj.warning[event["level"]]["color_code"])
+            for column, text in enumerate(cells):
+                item = QtWidgets.QTableWidgetItem(text)
+                item.setBackground(color)
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+        if at_bottom:
+            self.table.scrollToBottom()  # follow new events unless the user scrolled up
+
+    def _on_double_click(self, row, column):
+        event = self.events[row]
+        t_end = event["t_end"] if event["t_end"] is not None else event["t_start"]
+        margin = max((t_end - event["t_start"]) * 0.5, self.MIN_SPAN / 2)
+        self.jump_requested.emit(event["t_start"] - margin, t_end + margin)
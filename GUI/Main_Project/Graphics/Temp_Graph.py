@@ -1,12 +1,81 @@
-
+import os
+import re
 import numpy as np
 import pyqtgraph as pg
+from PyQt6.QtGui import QOffscreenSurface, QOpenGLContext
+
+# Rendering backends: "raster" (QPainter) or "opengl" (QOpenGLWidget viewport + PlotCurveItem.paintGL).
+# pyqtgraph >= 0.14 draws curves with paintGL on any GL viewport, from one vertex buffer per curve
+# re-uploaded on each setData. Before 0.14 paintGL also needed the process-wide enableExperimental
+# option (set only then: in 0.14 it just swaps the QPainterPath builder of every raster plot) and sent
+# the vertices on every paint. Axes, grid and legend stay QPainter items.
+# Default from the TEMP_GRAPH_BACKEND env var.
+BACKENDS = ("raster", "opengl")
+_PG_VERSION = tuple(int(part) for part in re.findall(r"\d+", pg.__version__)[:2])
+_opengl_ok = None
+
+
+def opengl_available():
+    """True if an OpenGL context can be created and made current (checked once per process)."""
+    global _opengl_ok
+    if _opengl_ok is None:
+        context = QOpenGLContext()
+        surface = QOffscreenSurface()
+        surface.create()
+        _opengl_ok = bool(context.create() and surface.isValid() and context.makeCurrent(surface))
+        if _opengl_ok:
+            context.doneCurrent()
+    return _opengl_ok
+
+
+def resolve_backend(backend=None):
+    """Backend actually used: the requested one, or "raster" when OpenGL is unavailable."""
+    backend = (backend or os.environ.get("TEMP_GRAPH_BACKEND", "raster")).lower()
+    if backend not in BACKENDS:
+        print(f"Temp_Graph: unknown backend {backend!r}, using raster")
+        return "raster"
+    if backend == "opengl" and not opengl_available():
+        print("Temp_Graph: OpenGL not available, falling back to raster")
+        return "raster"
+    return backend
+
+
+def minmax_envelope(t, y, n_bins):
+    """
+    Reduce (t, y) to about 2*n_bins points, keeping the min and max of each bin in time order.
+    Bins are equal sample counts, which matches equal time spans for regularly sampled data.
+    """
+    n = t.size
+    if n <= 2 * n_bins:
+        return t, y
+
+    chunk = n // n_bins
+    stop = chunk * n_bins
+    blocks = y[:stop].reshape(n_bins, chunk)
+    base = np.arange(n_bins) * chunk
+    i_min = base + blocks.argmin(axis=1)
+    i_max = base + blocks.argmax(axis=1)
+
+    if stop < n:  # leftover samples form one last, shorter bin
+        i_min = np.append(i_min, stop + y[stop:].argmin())
+        i_max = np.append(i_max, stop + y[stop:].argmax())
+
+    idx = np.empty(2 * i_min.size, dtype=np.intp)
+    idx[0::2] = np.minimum(i_min, i_max)
+    idx[1::2] = np.maximum(i_min, i_max)
+    return t[idx], y[idx]
+
 
 class Temp_Graph:
     def __init__(self, plot_widget: pg.PlotWidget,
                  title="Topics", x_label="Time", x_units="s",
-                 y_label="Value", y_units=""):
+                 y_label="Value", y_units="", backend=None):
         self.pw = plot_widget
+        # Per-widget viewport: other plots of the process keep their own backend
+        self.backend = resolve_backend(backend)
+        self.pw.useOpenGL(self.backend == "opengl")
+        if self.backend == "opengl" and _PG_VERSION < (0, 14):
+            pg.setConfigOptions(enableExperimental=True)  # paintGL path of older pyqtgraph
         self.pw.setBackground('#F0EFEF')
         self.pw.setTitle(title, color="k", size="10pt")
 
@@ -27,17 +96,265 @@ class Temp_Graph:
         self.curves = {}       # topic -> PlotDataItem
         self._order = []       # to assign colors consistently
 
-        # Make big plots faster
-        pg.setConfigOptions(antialias=False, useOpenGL=False)
+        # Full-resolution data and decimation cache
+        self._raw = {}         # topic -> (t in seconds, y) full-resolution data
+        self._time_scale = {}  # topic -> 1e-9 (ns timestamps) or 1.0 (seconds), decided once
+        self._data_key = {}    # topic -> (len, first t, last t, store number) of the stored data
+        self._stores = 0       # store counter: new values under the same timestamps get a new key
+        self._drawn_key = {}   # topic -> (data key, x-range, width) last sent to the curve
+        self._auto_ranged = False
+
+        # Incremental (append) mode: preallocated per-topic arrays, pyqtgraph gets views
+        self._buffers = {}          # topic -> {"t": ndarray, "y": ndarray, "n": int}
+        self.initial_capacity = 1024
+        self.max_points = None      # keep/show only the last N samples per topic (None = all)
+        self.scroll_seconds = None  # scrolling "last N seconds" window (None = off)
+
+        # History mode: curves drawn from a LOD_Cache for the visible range only
+        self._lod = None
+        self._lod_topics = []
+
+        # Inactive (hidden/collapsed) graphs keep appended data but skip pushing it to pyqtgraph
+        self.active = True
+        self._dirty = set()  # appended topics not pushed to their curve yet
 
-    def _ns_to_s_if_needed(self, t_array):
-        """Convert ns → s when values look like perf_counter_ns()."""
+        # Re-decimate when the visible range or the plot size changes
+        self.pi.vb.sigXRangeChanged.connect(self._on_view_changed)
+        self.pi.vb.sigResized.connect(self._on_view_changed)
+
+    def _ns_to_s_if_needed(self, topic, t_array):
+        """Convert ns → s when values look like perf_counter_ns(). Decided once per topic."""
         t_array = np.asarray(t_array)
-        # If median timestamp is >= 1e10, assume ns and convert to s
-        if t_array.size and np.median(t_array) >= 1e10:
-            return t_array * 1e-9
+        scale = self._time_scale.get(topic)
+        if scale is None:
+            if not t_array.size:
+                return t_array
+            # If median timestamp is >= 1e10, assume ns and convert to s
+            scale = 1e-9 if np.median(t_array) >= 1e10 else 1.0
+            self._time_scale[topic] = scale
+        if scale != 1.0:
+            return t_array * scale
         return t_array
 
+    def _store(self, topic, arr):
+        """Keep the full-resolution data of a topic; returns False if it did not change."""
+        t_key = (arr.shape[0], arr[0, 0], arr[-1, 0]) if arr.shape[0] else (0,)
+        stored = self._raw.get(topic)
+        # Same time span: still compare the values (rescaled units, corrected data), no copy
+        if stored is not None and self._data_key[topic][:-1] == t_key and np.array_equal(stored[1], arr[:, 1]):
+            return False
+        # Contiguous copies: callers may pass views of buffers they keep mutating
+        t = np.ascontiguousarray(self._ns_to_s_if_needed(topic, arr[:, 0]), dtype=np.float64)
+        y = np.ascontiguousarray(arr[:, 1], dtype=np.float64)
+        self._raw[topic] = (t, y)
+        self._stores += 1
+        self._data_key[topic] = t_key + (self._stores,)
+        return True
+
+    def _redraw(self, topic):
+        """
+        Decimate a topic to ~2 points per horizontal pixel of the current view and push it.
+        Only whole-array topics (set_topic_data/update_topic) go through here. Live acquisition uses
+        append_topic, where pyqtgraph's clip-to-view + peak downsampling do this job instead.
+        """
+        if not self.active:
+            return  # redrawn by set_active(True)
+        t, y = self._raw[topic]
+        vb = self.pi.vb
+        width = max(int(vb.width()), 100)
+
+        if vb.autoRangeEnabled()[0] or not t.size:
+            # Auto-ranging follows the data bounds, so decimate the whole curve
+            x_range = None
+            i0, i1 = 0, t.size
+        else:
+            x_range = tuple(vb.viewRange()[0])
+            # Keep one sample beyond each edge so the line reaches the border
+            i0 = max(int(np.searchsorted(t, x_range[0], side="left")) - 1, 0)
+            i1 = min(int(np.searchsorted(t, x_range[1], side="right")) + 1, t.size)
+
+        key = (self._data_key[topic], x_range, width)
+        if self._drawn_key.get(topic) == key:
+            return
+        self._drawn_key[topic] = key
+
+        t_d, y_d = minmax_envelope(t[i0:i1], y[i0:i1], width)
+        curve = self.curves[topic]
+        # For small N, show markers to help debugging
+        if t.size <= 64:
+            curve.setData(t_d, y_d, symbol='o', symbolSize=4)
+        else:
+            curve.setData(t_d, y_d, symbol=None)
+
+    def _redraw_lod(self, topic):
+        """Fetch the tiles covering the visible range at the matching level and push them."""
+        if not self.active:
+            return  # redrawn by set_active(True)
+        vb = self.pi.vb
+        width = max(int(vb.width()), 100)
+        x_range = tuple(vb.viewRange()[0])
+        key = ("lod", x_range, width)
+        if self._drawn_key.get(topic) == key:
+            return
+        self._drawn_key[topic] = key
+        t, y = self._lod.fetch(topic, x_range[0], x_range[1], width)
+        self.curves[topic].setData(t, y)
+
+    def _on_view_changed(self, *args):
+        if not self.active:
+            return
+        for topic, curve in self.curves.items():
+            if not curve.isVisible():
+                continue
+            if topic in self._raw:
+                self._redraw(topic)
+            elif self._lod is not None and topic in self._lod_topics:
+                self._redraw_lod(topic)
+
+    def show_history(self, lod_cache, topics=None):
+        """
+        Browse a recorded project from a built LOD_Cache.
+        Only the tiles covering the visible range are read, at the level matching the zoom.
+        """
+        self.clear()
+        self._lod = lod_cache
+        self._lod_topics = sorted(topics if topics is not None else lod_cache.levels)
+        for topic in self._lod_topics:
+            self._ensure_curve(topic)
+
+        span = lod_cache.time_span()
+        if span is None:
+            return
+        self.pi.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+        self.pi.setAutoVisible(y=True)
+        self.pi.setXRange(span[0], span[1], padding=0.02)
+        self._on_view_changed()
+
+    def _make_room(self, buf, needed):
+        """
+        Free or add space in an append buffer so it can hold `needed` samples.
+        Samples outside max_points / scroll_seconds are dropped by moving the kept tail to the
+        front; the arrays only grow (x2) when the kept part still fills more than half of them.
+        """
+        t_buf, y_buf, n = buf["t"], buf["y"], buf["n"]
+        start = 0
+        if self.max_points is not None:
+            start = max(start, n - self.max_points)
+        if self.scroll_seconds is not None and n:
+            start = max(start, int(np.searchsorted(t_buf[:n], t_buf[n - 1] - self.scroll_seconds, side="left")))
+
+        kept = n - start
+        extra = needed - n
+        if kept + extra <= t_buf.size // 2:
+            t_buf[:kept] = t_buf[start:n]
+            y_buf[:kept] = y_buf[start:n]
+        else:
+            capacity = t_buf.size
+            while capacity < 2 * (kept + extra):
+                capacity *= 2
+            buf["t"] = np.empty(capacity, dtype=np.float64)
+            buf["y"] = np.empty(capacity, dtype=np.float64)
+            buf["t"][:kept] = t_buf[start:n]
+            buf["y"][:kept] = y_buf[start:n]
+        buf["n"] = kept
+
+    def append_topic(self, topic: str, t_new, y_new):
+        """
+        Append new samples to a topic without re-sending its history.
+        - t_new, y_new: 1-D arrays of the same length (ns timestamps are converted like set_topic_data).
+        - The curve clips to the view and peak-downsamples itself, so only views are passed.
+        """
+        t_new = np.asarray(t_new, dtype=np.float64).ravel()
+        y_new = np.asarray(y_new, dtype=np.float64).ravel()
+        if t_new.size != y_new.size:
+            print(f"TopicMultiPlot.append_topic: size mismatch for {topic}: {t_new.size} vs {y_new.size}")
+            return
+        if not t_new.size:
+            return
+
+        curve = self._ensure_curve(topic)
+        if topic not in self._buffers:
+            # Leave the full-refresh path for this topic
+            self._raw.pop(topic, None)
+            self._data_key.pop(topic, None)
+            self._drawn_key.pop(topic, None)
+            curve.setClipToView(True)
+            curve.setDownsampling(auto=True, method="peak")
+            self._buffers[topic] = {
+                "t": np.empty(self.initial_capacity, dtype=np.float64),
+                "y": np.empty(self.initial_capacity, dtype=np.float64),
+                "n": 0,
+            }
+
+        buf = self._buffers[topic]
+        count = t_new.size
+        if buf["n"] + count > buf["t"].size:
+            self._make_room(buf, buf["n"] + count)
+
+        n = buf["n"]
+        buf["t"][n : n + count] = self._ns_to_s_if_needed(topic, t_new)
+        buf["y"][n : n + count] = y_new
+        n += count
+        buf["n"] = n
+
+        if self.active and curve.isVisible():
+            self._push(topic)
+        else:
+            self._dirty.add(topic)
+
+    def _push(self, topic):
+        """Hand the appended data of a topic to its curve (views, no copy)."""
+        self._dirty.discard(topic)
+        buf = self._buffers[topic]
+        n = buf["n"]
+        start = 0 if self.max_points is None else max(0, n - self.max_points)
+        self.curves[topic].setData(buf["t"][start:n], buf["y"][start:n])
+
+        if self.scroll_seconds is not None:
+            t_last = buf["t"][n - 1]
+            self.pi.setXRange(t_last - self.scroll_seconds, t_last, padding=0)
+        elif not self._auto_ranged:
+            self.pi.enableAutoRange(axis=pg.ViewBox.XYAxes, enable=True)
+            self._auto_ranged = True
+
+    def set_active(self, active: bool):
+        """Resume (True) or suspend (False) curve updates, e.g. when the panel is shown/collapsed."""
+        self.active = active
+        if active:
+            for topic in list(self._dirty):
+                if self.curves[topic].isVisible():
+                    self._push(topic)
+            self._on_view_changed()
+
+    def _on_curve_shown(self, topic):
+        """A curve hidden from the legend came back: bring it up to date."""
+        curve = self.curves.get(topic)
+        if not self.active or curve is None or not curve.isVisible():
+            return
+        if topic in self._dirty:
+            self._push(topic)
+        elif topic in self._raw:
+            self._redraw(topic)
+        elif self._lod is not None and topic in self._lod_topics:
+            self._redraw_lod(topic)
+
+    def set_scroll_window(self, seconds=None):
+        """Follow the newest appended data over the last `seconds` (None returns to auto-range)."""
+        self.scroll_seconds = seconds
+        if seconds is None:
+            self.pi.enableAutoRange(axis=pg.ViewBox.XYAxes, enable=True)
+        else:
+            # X follows the newest sample, Y fits what is visible
+            self.pi.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+            self.pi.setAutoVisible(y=True)
+
+    def show_range(self, x0, x1):
+        """Show [x0, x1] (e.g. around an event); stops the scrolling window, Y fits the visible data."""
+        self.scroll_seconds = None
+        self.pi.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+        self.pi.setAutoVisible(y=True)
+        self.pi.setXRange(x0, x1, padding=0)
+
     def _ensure_curve(self, topic):
         if topic in self.curves:
             return self.curves[topic]
@@ -46,7 +363,9 @@ class Temp_Graph:
             self._order.append(topic)
         idx = self._order.index(topic)
         pen = pg.mkPen(pg.intColor(idx), width=2)
-        curve = self.pi.plot([], [], pen=pen, name=topic)
+        # No antialiasing on these curves (big plots draw faster); other plots keep the global option
+        curve = self.pi.plot([], [], pen=pen, name=topic, antialias=False)
+        curve.visibleChanged.connect(lambda topic=topic: self._on_curve_shown(topic))
         self.curves[topic] = curve
         return curve
 
@@ -55,6 +374,8 @@ class Temp_Graph:
         Full refresh from a dict: {topic: ndarray(N,2) with [time, value]}.
         - If time looks like ns, auto-convert to seconds.
         - Creates curves for new topics and updates existing ones.
+        - Meant for whole recorded arrays: these curves are view-range decimated (_redraw).
+          Live acquisition goes through append_topic and does not use this decimation.
         """
         if not isinstance(topic_data, dict):
             print(f"TopicMultiPlot: expected dict, got {type(topic_data)}")
@@ -69,23 +390,21 @@ class Temp_Graph:
                 print(f"TopicMultiPlot: bad shape for {topic}: {arr.shape}, expect (N,2)")
                 continue
 
-            t = self._ns_to_s_if_needed(arr[:, 0])
-            y = arr[:, 1].astype(np.float64, copy=False)
-
-            curve = self._ensure_curve(topic)
-            # For small N, show markers to help debugging
-            if len(t) <= 512:
-                curve.setData(t, y, symbol=None if len(t) > 64 else 'o', symbolSize=4)
-            else:
-                curve.setData(t, y)
+            self._ensure_curve(topic)
+            self._buffers.pop(topic, None)  # full data replaces any appended history
+            self._dirty.discard(topic)
+            self._store(topic, arr)
+            self._redraw(topic)  # no-op unless the data or the view changed
             seen.add(topic)
 
         # (Optional) hide curves for topics no longer present
         for topic, curve in self.curves.items():
             curve.setVisible(topic in seen)
 
-        # Optional: auto-range only once or when you want
-        self.pi.enableAutoRange(axis=pg.ViewBox.XYAxes, enable=True)
+        # Auto-range once; afterwards the user's zoom/pan is kept
+        if not self._auto_ranged and seen:
+            self.pi.enableAutoRange(axis=pg.ViewBox.XYAxes, enable=True)
+            self._auto_ranged = True
 
     def update_topic(self, topic: str, arr):
         """
@@ -96,14 +415,24 @@ class Temp_Graph:
         if arr.ndim != 2 or arr.shape[1] != 2:
             print(f"TopicMultiPlot.update_topic: bad shape for {topic}: {arr.shape}")
             return
-        t = self._ns_to_s_if_needed(arr[:, 0])
-        y = arr[:, 1].astype(np.float64, copy=False)
-        curve = self._ensure_curve(topic)
-        curve.setData(t, y)
+        self._ensure_curve(topic)
+        self._buffers.pop(topic, None)
+        self._dirty.discard(topic)
+        self._store(topic, arr)
+        self._redraw(topic)
 
     def clear(self):
         for c in self.curves.values():
             self.pi.removeItem(c)
         self.curves.clear()
         self._order.clear()
+        self._raw.clear()
+        self._time_scale.clear()
+        self._data_key.clear()
+        self._drawn_key.clear()
+        self._buffers.clear()
+        self._dirty.clear()
+        self._lod = None
+        self._lod_topics = []
+        self._auto_ranged = False
         self.legend.clear()
\ No newline at end of file
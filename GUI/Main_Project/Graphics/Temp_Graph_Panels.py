@@ -0,0 +1,98 @@
+"""
+Stacked plot panels, one per plot group of the channel registry (one per RTD board plus the ADC rails).
+All panels share the time axis; hidden panels keep their data but skip every curve update.
+"""
+
+import pyqtgraph as pg
+from PyQt6 import QtCore, QtWidgets
+
+from GUI.Main_Project.Graphics.Temp_Graph import Temp_Graph
+from Setup.Channel_Registry import get_registry
+
+
+class Temp_Graph_Panels:
+
+    def __init__(self, placeholder: pg.PlotWidget, registry=None, backend=None):
+        """
+        Replace the single PlotWidget of the UI by a column of linked panels at the same place.
+        A check box per panel shows/collapses it. `backend`: "raster" or "opengl" (see Temp_Graph).
+        Panels and topic -> panel mapping come from the channel registry.
+        """
+        self.registry = registry if registry is not None else get_registry()
+        self.PANELS = self.registry.plot_groups  # group -> (panel title, y label, y units)
+        self.topic_group = {name: channel["plot_group"] for name, channel in self.registry.by_name.items()}
+        parent = placeholder.parentWidget()
+        self.container = QtWidgets.QWidget(parent)
+        self.container.setGeometry(placeholder.geometry())
+        placeholder.hide()
+
+        layout = QtWidgets.QVBoxLayout(self.container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QtWidgets.QHBoxLayout()
+        layout.addLayout(toolbar)
+        self.splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
+        layout.addWidget(self.splitter)
+
+        self.widgets = {}     # group -> PlotWidget
+        self.graphs = {}      # group -> Temp_Graph
+        self.check_boxes = {}  # group -> QCheckBox
+        master = None
+        for group, (title, y_label, y_units) in self.PANELS.items():
+            pw = pg.PlotWidget()
+            graph = Temp_Graph(pw, title=title, x_label="Time", y_label=y_label, y_units=y_units, backend=backend)
+            if master is None:
+                master = pw.plotItem
+            else:
+                pw.plotItem.setXLink(master)
+            self.splitter.addWidget(pw)
+            self.widgets[group] = pw
+            self.graphs[group] = graph
+
+            check_box = QtWidgets.QCheckBox(title)
+            check_box.setChecked(True)
+            check_box.toggled.connect(lambda checked, group=group: self.set_panel_visible(group, checked))
+            toolbar.addWidget(check_box)
+            self.check_boxes[group] = check_box
+        toolbar.addStretch()
+
+        self.container.show()
+
+    def group_of(self, topic: str):
+        """Panel group of a topic: RTDA_ADC1 -> "ADC", RTDB3 -> "RTDB" (None if not plotted)."""
+        return self.topic_group.get(topic)
+
+    def set_panel_visible(self, group: str, visible: bool):
+        self.widgets[group].setVisible(visible)
+        self.graphs[group].set_active(visible)
+
+    def visible_groups(self):
+        return [group for group, graph in self.graphs.items() if graph.active]
+
+    @property
+    def max_points(self):
+        return next(iter(self.graphs.values())).max_points
+
+    @max_points.setter
+    def max_points(self, value):
+        for graph in self.graphs.values():
+            graph.max_points = value
+
+    def append_topic(self, topic: str, t_new, y_new):
+        graph = self.graphs.get(self.group_of(topic))
+        if graph is None:
+            print(f"Temp_Graph_Panels: no panel for {topic}")
+            return
+        graph.append_topic(topic, t_new, y_new)
+
+    def show_history(self, lod_cache, topics):
+        for group, graph in self.graphs.items():
+            graph.show_history(lod_cache, [topic for topic in topics if self.group_of(topic) == group])
+
+    def show_range(self, x0, x1):
+        """Show [x0, x1] on every panel (the X axes are linked)."""
+        for graph in self.graphs.values():
+            graph.show_range(x0, x1)
+
+    def clear(self):
+        for graph in self.graphs.values():
+            graph.clear()
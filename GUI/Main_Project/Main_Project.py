@@ -3,8 +3,6 @@ Main GUI window for performing BlueSoft operations.
 Provides comprehensive GUI for creating, editing, and managing operations.
 Handles database interactions, real-time updates, and operation workflow management.
 """
-import pickle
-from pathlib import Path
 from PyQt6 import QtCore, QtWidgets
 from PyQt6.QtCore import QCoreApplication
 from PyQt6.QtWidgets import QTableWidgetItem
@@ -14,15 +12,13 @@ from PyQt6.QtGui import QColor, QBrush, QFont
 
 from PyQt6.QtCore import QDateTime, Qt
 from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
-import shutil, tempfile
 from GUI.Main_Project.Main_Project_UI import Ui_Main_Project
-from dvg_ringbuffer import RingBuffer
 import re
 
-from GUI.Main_Project.New_Project.New_Project import New_Project
-from GUI.Main_Project.Graphics.Temp_Graph import Temp_Graph
+from GUI.Main_Project.Graphics.Temp_Graph_Panels import Temp_Graph_Panels
+from GUI.Main_Project.Event_List.Event_List import Event_List
+from GUI.Main_Project.Metrics_Panel.Metrics_Panel import Metrics_Panel
 from Setup.Operation_JSON_Loader import Operation_JSON_Loader
-import csv
 from Setup.Rooth_Path_Finder import rooth_path_finder
 
 from Setup.Queue_Setup import Main_Queue_port
@@ -32,10 +28,11 @@ from Setup.DataBaseWrap import (
     Project,
     Sample,
 )
-from sqlalchemy.orm import joinedload
-import re
+from Setup.Alarm_Engine import Alarm_Engine
+from Setup.Channel_Registry import get_registry
+from Setup.Metrics import get_metrics
+from Setup.Profiler import get_profiler
 import numpy as np
-from sqlalchemy import func
 import time
 import json
 import os
@@ -145,27 +142,39 @@ class Main_Project(QtWidgets.QMainWindow):
         self.Port = self.Main_Port_obj.Port
         self.project_created = False
         self.DB = DataBaseWrap()
-        self.RTD_data = {}
+        self.plot_pending = {}  # topic -> [(t_sec, value), ...] received since the last graph refresh
         self.ADC_data = {}
 
-        self.RTDA_VAL_CMD=["RTDA1", "RTDA2", "RTDA3", "RTDA4", "RTDA5", "RTDA6", "RTDA7", "RTDA8"]
-        self.RTDB_VAL_CMD=["RTDB1", "RTDB2", "RTDB3", "RTDB4", "RTDB5", "RTDB6", "RTDB7", "RTDB8"]
-        self.RTDC_VAL_CMD=["RTDC1", "RTDC2", "RTDC3", "RTDC4", "RTDC5", "RTDC6", "RTDC7", "RTDC8"]
-        self.RTD_VAL_CMD=self.RTDA_VAL_CMD+self.RTDB_VAL_CMD+self.RTDC_VAL_CMD
-
-        self.RTDA_ADC_CMD=["RTDA_ADC1", "RTDA_ADC2"]
-        self.RTDB_ADC_CMD=["RTDB_ADC1", "RTDB_ADC2"]
-        self.RTDC_ADC_CMD=["RTDC_ADC1", "RTDC_ADC2"]
-        self.RTD_ADC_CMD=self.RTDA_ADC_CMD+self.RTDB_ADC_CMD+self.RTDC_ADC_CMD
+        # Channels from the channel registry (same file as the driver process)
+        self.registry = get_registry()
+        self.RTD_VAL_CMD = self.registry.names(kind="RTD")
+        self.RTD_ADC_CMD = self.registry.names(kind="ADC")
+        self.channel_kind = {name: channel["kind"] for name, channel in self.registry.by_name.items()}  # topic -> kind
 
+        # Live alarm stage (thresholds from the "Alarm" section of the Operation database)
+        self.Alarm_Engine_obj = Alarm_Engine(self.RTD_VAL_CMD + self.RTD_ADC_CMD, Operation_JSON_Loader().Load_Alarm())
+        self.Alarm_Event_List = []  # alarm transitions not yet written to the database (event_table)
 
-        self.Temp_Graph_view = Temp_Graph(self.Ui_Main_Project_obj.Temp_Graph_widget_obj, title="MQTT Topics", x_label="Time", y_label="Value")
+        self.max_buffer_size = 1000 # Max samples to keep in memory per topic
+        self.Temp_Graph_view = Temp_Graph_Panels(self.Ui_Main_Project_obj.Temp_Graph_widget_obj, self.registry)  # one panel per board + ADC rails
+        self.Temp_Graph_view.max_points = self.max_buffer_size
+        self.Event_List_view = Event_List(self)  # alarm events of the project, double-click to show one
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.Event_List_view)
+        self.Event_List_view.jump_requested.connect(self.Temp_Graph_view.show_range)
+        self.metrics = get_metrics()  # counters/histograms of this process (shared with the driver when started by the launcher)
+        self.profiler = get_profiler()  # on-demand profiling of this process (and of the driver, through the queue)
+        self.Metrics_Panel_view = Metrics_Panel(self.metrics, self)
+        self.Metrics_Panel_view.profile_requested.connect(self.start_profiling)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.Metrics_Panel_view)
+        self.tabifyDockWidget(self.Event_List_view, self.Metrics_Panel_view)
+        self.Event_List_view.raise_()
         self.refresh_timer()
         self.database_write_timer()
         self.Buffer_Sample_List = []
         self.init_time=0
         self.init_date=0
-        self.max_buffer_size = 1000 # Max samples to keep in memory per topic
+        self.history_DB = None  # DataBaseWrap of a recorded project opened for review
+        self.max_event_rows = 1000  # newest live events listed
 
 
 
@@ -210,18 +219,38 @@ class Main_Project(QtWidgets.QMainWindow):
         self.close()
 
     def closeEvent(self, event):        
+        self.profiler.stop()
         QCoreApplication.instance().quit()
 
+    def start_profiling(self, mode, seconds):
+        """Profile the GUI process and ask the driver process for the same window."""
+        self.profiler.start(mode, seconds)
+        self.Port["RJ45_UDP"].JSON_out = {"PROFILE": mode, "SECONDS": seconds}
+        if not self.Port["RJ45_UDP"].send():
+            print("Profiling request not sent to the driver (queue full)")
+
 
 
     def refresh_display(self):
+        if self.profiler.active:
+            self.profiler.poll()
+        t_refresh = time.perf_counter_ns()
         new_update = False
+        samples = 0
 
         while self.Port["RJ45_UDP"].receive_fifo():
 
             incoming = self.Port["RJ45_UDP"].JSON_in
             new_update = False
 
+            # Driver receive -> GUI dequeue of the oldest sample of the batch (same monotonic clock)
+            first = incoming[0] if isinstance(incoming, list) and incoming else incoming
+            if isinstance(first, dict) and first:
+                try:
+                    self.metrics.record("queue_latency_ns", max(0, time.perf_counter_ns() - int(next(iter(first.values()))[0])))
+                except (TypeError, ValueError, IndexError):
+                    pass
+
             # Case 1: JSON_in is a dict like {"topic": (timestamp, value), ...}
             if isinstance(incoming, dict):
                 for topic, data in incoming.items():
@@ -236,6 +265,7 @@ class Main_Project(QtWidgets.QMainWindow):
                             self.init_date = time.strftime("%H_%M_%S")
 
                         self.append_sample(topic, (ts - self.init_time), payload)                        
+                        samples += 1
 
                         new_update = True
                     else:
@@ -258,6 +288,7 @@ class Main_Project(QtWidgets.QMainWindow):
                                 self.init_date = time.strftime("%H_%M_%S")
 
                             self.append_sample(topic, (ts - self.init_time), payload)
+                            samples += 1
 
                             new_update = True
                         else:
@@ -267,17 +298,33 @@ class Main_Project(QtWidgets.QMainWindow):
                 print(f"⚠️ Unexpected JSON_in type: {type(incoming)!r}")
 
         if new_update:
-            # Convert ring buffers to numpy arrays for the graph
-            topic_arrays = {}
-            for topic, ring_buffer in self.RTD_data.items():
-                topic_arrays[topic] = np.asarray(ring_buffer)
-            self.Temp_Graph_view.set_topic_data(topic_arrays)
+            # Alarm transitions of the new samples (all channels at once)
+            for event in self.Alarm_Engine_obj.process(self.plot_pending):
+                print(f"Alarm {event['kind']} {event['topic']}: {event['prev_level']} -> {event['level']} at {event['t']:.1f} s ({event['value']:.3f})")
+                self.Alarm_Event_List.append(event)
+
+            # Push only the samples received since the last refresh
+            # (panels that are collapsed only store them)
+            t_plot = time.perf_counter_ns()
+            for topic, pending in self.plot_pending.items():
+                if pending:
+                    if self.history_DB is None:  # the graph shows a recorded project otherwise
+                        block = np.asarray(pending)
+                        self.Temp_Graph_view.append_topic(topic, block[:, 0], block[:, 1])
+                    pending.clear()
+            self.metrics.record("plot_ns", time.perf_counter_ns() - t_plot)
+
+        if samples:
+            self.metrics.count("samples", samples)
+            self.metrics.record("refresh_ns", time.perf_counter_ns() - t_refresh)
 
 
 
     def database_write(self):
         if self.project_created == True:
-            if self.Buffer_Sample_List:
+            if self.Buffer_Sample_List or self.Alarm_Event_List:
+                events_written = False
+                t_commit = time.perf_counter_ns()
                 with self.DB.get_session() as session:
                     try:
                         # Bulk insert all samples in the buffer
@@ -291,12 +338,23 @@ class Main_Project(QtWidgets.QMainWindow):
                             for topic, t_sec, payload in self.Buffer_Sample_List
                         ]
                         session.bulk_save_objects(samples_to_add)
+                        # Alarm transitions go in the same transaction
+                        self.DB.add_events(session, self.Alarm_Event_List, self.DB.project_DB.project_key)
                         session.commit()
-                        print(f"Inserted {len(samples_to_add)} samples into the database.")
+                        print(f"Inserted {len(samples_to_add)} samples and {len(self.Alarm_Event_List)} alarm transitions into the database.")
+                        events_written = bool(self.Alarm_Event_List)
+                        self.metrics.count("db_commits")
+                        self.metrics.count("db_rows", len(samples_to_add))
                         self.Buffer_Sample_List.clear()  # Clear the buffer after successful insert
+                        self.Alarm_Event_List.clear()
                     except Exception as e:
                         session.rollback()
+                        self.metrics.count("db_errors")
                         print(f"Error inserting samples into database: {e}")
+                self.metrics.record("db_commit_ns", time.perf_counter_ns() - t_commit)
+
+                if events_written and self.history_DB is None:
+                    self.Event_List_view.set_events(self.DB.list_events(limit=self.max_event_rows))
     
 
 
@@ -326,24 +384,21 @@ class Main_Project(QtWidgets.QMainWindow):
         t_sec = float(ts_ns) * 1e-9
 
 
-        if topic in self.RTD_VAL_CMD:
-            # If topic not yet created, initialize its array
-            if topic not in self.RTD_data:
-                self.RTD_data[topic] = RingBuffer(capacity=self.max_buffer_size, dtype=(np.float64, 2))
-
-            # Append row [time_sec, value]
-            self.RTD_data[topic].append([t_sec, payload])
+        kind = self.channel_kind.get(topic)
+        if kind == "RTD":
+            # Queue row [time_sec, value] for the next graph refresh
+            self.plot_pending.setdefault(topic, []).append((t_sec, payload))
             self.Buffer_Sample_List.append((topic, t_sec, payload))
-        elif topic in self.RTD_ADC_CMD:
-            match = re.match(r"RTD([ABC])_ADC([12])", topic)
+        elif kind == "ADC":
+            match = re.match(r".*_ADC(\d+)$", topic)
             if match:
-                RTD_module, RTD_number = match.groups()   # unpack into variables
-                rtd_name_module = f"RTD{RTD_module}"   # e.g. "RTDA", "RTDB", or "RTDC"
-                rtd_name_number = f"RTD{RTD_number}"   # e.g. "RTDA", "RTDB", or "RTDC"
+                RTD_number = match.group(1)   # "1" = 5v rail, "2" = battery
+                rtd_name_module = self.registry.by_name[topic]["board"]   # e.g. "RTDA", "RTDB", or "RTDC"
 
                 if rtd_name_module not in self.ADC_data:
                     self.ADC_data[rtd_name_module] = {}
                 self.ADC_data[rtd_name_module].update({RTD_number:payload})
+                self.plot_pending.setdefault(topic, []).append((t_sec, payload))
 
                 self.Ui_Main_Project_obj.RTDA_5v_rd.setText(f"{self.ADC_data.get('RTDA', {}).get('1', 0.0):.3f} V")
                 self.Ui_Main_Project_obj.RTDB_5v_rd.setText(f"{self.ADC_data.get('RTDB', {}).get('1', 0.0):.3f} V")
@@ -360,6 +415,8 @@ class Main_Project(QtWidgets.QMainWindow):
     def New_Project_cmd(self):
         self.hide()
         self.Project_para = {}
+        from GUI.Main_Project.New_Project.New_Project import New_Project  # dialog: loaded on first use
+
         New_Project_obj = New_Project(self.Project_para)
         result = New_Project_obj.exec()
         self.show()  # Show the GUI
@@ -371,6 +428,13 @@ class Main_Project(QtWidgets.QMainWindow):
             self.DB.connect_DB(full_path)
             self.project_created = True
 
+            # Back to the live view if a recorded project was being reviewed
+            if self.history_DB is not None:
+                self.history_DB.engine.dispose()
+                self.history_DB = None
+                self.Temp_Graph_view.clear()
+            self.Event_List_view.set_events([])
+
             self.Ui_Main_Project_obj.Date_var.setText(self.Project_para["Day_str"])
             self.Ui_Main_Project_obj.Time_var.setText(self.Project_para["Time_str"])
             self.Ui_Main_Project_obj.Project_Name_var.setText(self.Project_para["Project_name"])
@@ -396,6 +460,73 @@ class Main_Project(QtWidgets.QMainWindow):
                 session.commit()
 
 
+    def Open_Project_cmd(self):
+        """
+        Open a recorded project database for review.
+        Min/max pyramids are built (or reused) next to the .db so the graph only reads the visible tiles.
+        Indexes missing from older files are only built if the user agrees (it writes to the file).
+        """
+        db_file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Database File",
+            "",
+            "Database files (*.db *.sqlite *.sqlite3);;All files (*.*)"
+        )
+        if not db_file_path:
+            return  # User cancelled
+
+        from Setup.LOD_Cache import LOD_Cache  # history review only: loaded on first use
+
+        try:
+            history_DB = DataBaseWrap()
+            history_DB.connect_DB(db_file_path, read_only=True)
+            missing = history_DB.missing_indexes()
+            if missing:
+                self.offer_index_build(history_DB, missing)
+            lod_cache = LOD_Cache(history_DB)
+            topics = lod_cache.build()
+        except Exception as e:
+            error_msg = f"Error opening project database: {str(e)}"
+            print(error_msg)
+            QMessageBox.critical(self, "Open Error", error_msg)
+            return
+
+        if self.history_DB is not None:
+            self.history_DB.engine.dispose()
+        self.history_DB = history_DB
+        self.Temp_Graph_view.show_history(lod_cache, topics)
+        self.Event_List_view.set_events(history_DB.list_events())
+        print(f"Reviewing {db_file_path}: {len(topics)} topics")
+
+    def offer_index_build(self, db_wrap, missing):
+        """Ask before adding the indexes an older project file lacks, and show which one is being built."""
+        names = ", ".join(index.name for index in missing)
+        answer = QMessageBox.question(
+            self,
+            "Missing indexes",
+            f"This project file was recorded without the indexes: {names}.\n\n"
+            "Building them makes zoomed review faster, but it writes to the file and can take "
+            "several minutes on a long recording. Review works without them.\n\nBuild them now?",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+
+        progress = QProgressDialog("", None, 0, len(missing), self)
+        progress.setWindowTitle("Migrating project file")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def report(i, n, name):
+            progress.setValue(i)
+            progress.setLabelText(f"Building index {name} ({i + 1}/{n})...")
+            QCoreApplication.processEvents()
+
+        try:
+            db_wrap.create_indexes(missing, progress=report)
+        finally:
+            progress.close()
+        print(f"Built indexes {names} in {db_wrap.db_file_path}")
+
     def Save_cvs_cmd(self):
         """
         Export database samples to CSV format.
@@ -458,7 +589,7 @@ class Main_Project(QtWidgets.QMainWindow):
                 
                 # Create a temporary database connection
                 temp_db = DataBaseWrap()
-                temp_db.connect_DB(db_file_path)
+                temp_db.connect_DB(db_file_path, read_only=True)
                 
                 print(f"Using selected database: {db_file_path}")
                 print(f"CSV will be saved as: {csv_file_path}")
@@ -502,6 +633,8 @@ class Main_Project(QtWidgets.QMainWindow):
                 max_samples = max(len(topics_data[topic]) for topic in sorted_topics) if sorted_topics else 0
                 
                 # Write CSV file
+                import csv  # export only: loaded on first use
+
                 with open(csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
                     writer = csv.writer(csvfile)
                     
@@ -560,7 +693,7 @@ class Main_Project(QtWidgets.QMainWindow):
         y = (v >> 16) & 0xFFFF
         m = (v >> 8)  & 0xFF
         d =  v        & 0xFF
-        return f"{y:04d}{"_"}{m:02d}{"_"}{d:02d}"
+        return f"{y:04d}_{m:02d}_{d:02d}"
 
 
 
@@ -708,12 +708,16 @@ class Ui_Main_Project(object):
         self.actionNew_Project.setObjectName("actionNew_Project")
         self.actionNew_Project_obj = QtGui.QAction(parent=Main_Project)
         self.actionNew_Project_obj.setObjectName("actionNew_Project_obj")
+        self.actionOpen_Project_obj = QtGui.QAction(parent=Main_Project)
+        self.actionOpen_Project_obj.setObjectName("actionOpen_Project_obj")
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionNew_Project_obj)
+        self.menuFile.addAction(self.actionOpen_Project_obj)
         self.menubar.addAction(self.menuFile.menuAction())
 
         self.retranslateUi(Main_Project)
         self.actionNew_Project_obj.triggered.connect(Main_Project.New_Project_cmd) # type: ignore
+        self.actionOpen_Project_obj.triggered.connect(Main_Project.Open_Project_cmd) # type: ignore
         self.Quit_bt.released.connect(Main_Project.Quit_cmd) # type: ignore
         self.Save_cvs_bt.released.connect(Main_Project.Save_cvs_cmd) # type: ignore
         QtCore.QMetaObject.connectSlotsByName(Main_Project)
@@ -771,4 +775,5 @@ class Ui_Main_Project(object):
         self.actionImport_OPCheck_Test.setText(_translate("Main_Project", "Import OPCheck Test"))
         self.actionNew_Project.setText(_translate("Main_Project", "New Project"))
         self.actionNew_Project_obj.setText(_translate("Main_Project", "New Project"))
+        self.actionOpen_Project_obj.setText(_translate("Main_Project", "Open Project"))
 from pyqtgraph import PlotWidget
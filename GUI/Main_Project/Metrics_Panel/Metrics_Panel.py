@@ -0,0 +1,93 @@
+"""
+Dock showing the live acquisition metrics (Setup/Metrics.py) of the driver and GUI processes:
+counter totals and rates, latency percentiles. Export writes a JSON snapshot to Metrics/.
+Profile requests a profiling window of both processes (Setup/Profiler.py).
+"""
+
+import os
+import time
+
+from PyQt6 import QtCore, QtWidgets
+
+from Setup.Metrics import COUNTERS, HISTOGRAMS, ROLES
+from Setup.Profiler import DEFAULT_SECONDS, MODES
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+
+class Metrics_Panel(QtWidgets.QDockWidget):
+    profile_requested = QtCore.pyqtSignal(str, int)  # mode, seconds
+
+    COLUMNS = ["Process", "Metric", "Total / count", "Rate (/s) / p50 (us)", "p99 (us)", "Max (us)"]
+    REFRESH_MS = 1000
+
+    def __init__(self, metrics, parent=None):
+        super().__init__("Metrics", parent)
+        self.metrics = metrics
+        self.rows = [(role, "counters", name) for role in ROLES for name in COUNTERS] + [(role, "histograms", name) for role in ROLES for name in HISTOGRAMS]
+
+        self.table = QtWidgets.QTableWidget(len(self.rows), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for row, (role, _, name) in enumerate(self.rows):
+            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(role))
+            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(name))
+            for column in range(2, len(self.COLUMNS)):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(""))
+
+        self.export_button = QtWidgets.QPushButton("Export")
+        self.export_button.clicked.connect(self.export)
+        self.profile_mode = QtWidgets.QComboBox()
+        self.profile_mode.addItems(MODES)
+        self.profile_seconds = QtWidgets.QSpinBox()
+        self.profile_seconds.setRange(1, 3600)
+        self.profile_seconds.setValue(DEFAULT_SECONDS)
+        self.profile_seconds.setSuffix(" s")
+        self.profile_button = QtWidgets.QPushButton("Profile")
+        self.profile_button.clicked.connect(lambda: self.profile_requested.emit(self.profile_mode.currentText(), self.profile_seconds.value()))
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addWidget(self.profile_mode)
+        buttons.addWidget(self.profile_seconds)
+        buttons.addWidget(self.profile_button)
+        buttons.addStretch(1)
+        buttons.addWidget(self.export_button)
+
+        content = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(content)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        self.setWidget(content)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        """Update the table from a new snapshot (skipped while the dock is hidden; rates then span the gap)."""
+        if not self.isVisible():
+            return
+        snapshot = self.metrics.snapshot()
+        self.table.setUpdatesEnabled(False)
+        for row, (role, kind, name) in enumerate(self.rows):
+            info = snapshot[role][kind][name]
+            if kind == "counters":
+                cells = [f"{info['total']}", f"{info['rate_s']:.1f}", "", ""]
+            else:
+                cells = [f"{info['count']}", f"{info['p50_us']:.1f}", f"{info['p99_us']:.1f}", f"{info['max_us']:.1f}"]
+            for column, text in enumerate(cells, start=2):
+                self.table.item(row, column).setText(text)
+        self.table.setUpdatesEnabled(True)
+
+    def export(self):
+        directory = os.path.join(rooth_path_finder(), "Metrics")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("%Y_%m_%d_%H_%M_%S") + "_metrics.json")
+        try:
+            self.metrics.export(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Metrics", f"Export failed: {e}")
+        else:
+            QtWidgets.QMessageBox.information(self, "Metrics", f"Metrics exported to {path}")
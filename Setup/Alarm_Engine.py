@@ -0,0 +1,226 @@
+"""
+Module: Setup/Alarm_Engine.py
+
+Purpose
+-------
+Streaming alarm stage for the live channels (RTD temperatures and ADC rails):
+- HH/H/L/LL thresholds per channel, checked with LimitCheck.level_check_array
+- Hysteresis: leaving a level needs the value back inside the threshold by `hyst`
+- Debounce: a new level (or rate alarm) is confirmed only after `debounce_s` seconds
+- Rate of change: |dV/dt| above `rate_max` (units per second) raises a rate alarm
+Only transitions are reported, as event dicts.
+
+Configuration
+-------------
+"Alarm" section of Setup/Operation_database.json (see Operation_Data_Base_Struct):
+- default[group]  : thresholds of every channel of a group (RTD, ADC1, ADC2; alarm_group of the channel registry)
+- channels[topic] : per-topic overrides of any field
+
+Public API
+----------
+Alarm_Engine(topics, alarm_config)
+process(batch) : {topic: [(t_sec, value), ...]} -> list of events
+reset()        : forget all alarm states (new project)
+
+Events
+------
+{"topic", "kind" ("level" | "rate"), "level", "prev_level", "t", "value", "t_start", "t_end", "peak"}
+Levels use the LimitCheck codes (3 HH, 2 H, 1 pass, -2 L, -3 LL, 0 NA); rate alarms use 2 (active) / 1 (cleared).
+t_end and peak are set when an alarm episode closes (back to pass); peak is the extreme value
+(or |rate| for rate alarms) reached during the episode.
+
+Notes
+-----
+All channels are processed at once: samples of a batch are sorted into rounds of one
+sample per channel and every round is a few numpy operations over the channel vectors.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from Setup.Channel_Registry import get_registry
+from Setup.Limit_Check import LimitCheck
+
+
+class Alarm_Engine:
+    """
+    Alarm states of a fixed set of channels.
+
+    Parameters
+    ----------
+    topics : sequence of str
+        Channels checked by the engine (other topics of a batch are ignored).
+    alarm_config : dict
+        "Alarm" section of the Operation database ({"default": {...}, "channels": {...}}).
+    """
+
+    FIELDS = ("LL", "L", "H", "HH", "hyst", "debounce_s", "rate_max")
+
+    def __init__(self, topics: Sequence[str], alarm_config: Dict) -> None:
+        self.topics = list(topics)
+        self.index = {topic: i for i, topic in enumerate(self.topics)}
+        self.LimitCheck_obj = LimitCheck()
+
+        settings = [self.channel_settings(topic, alarm_config) for topic in self.topics]
+        self.units = [setting.get("unit", "") for setting in settings]
+        self.limits = self.LimitCheck_obj.limit_vectors(settings)  # (4, channels) [LL, L, H, HH]
+        self.hyst = np.array([setting["hyst"] for setting in settings], dtype=float)
+        self.debounce = np.array([setting["debounce_s"] for setting in settings], dtype=float)
+        self.rate_max = np.array([setting["rate_max"] for setting in settings], dtype=float)
+
+        self.reset()
+
+    @staticmethod
+    def group_of(topic: str) -> str:
+        """Configuration group of a topic (alarm_group of the channel registry): RTDA_ADC1 -> "ADC1", RTDC5 -> "RTD"."""
+        return get_registry().channel(topic)["alarm_group"]
+
+    @classmethod
+    def channel_settings(cls, topic: str, alarm_config: Dict) -> Dict:
+        """Group defaults of a topic updated with its own overrides."""
+        setting = dict(alarm_config["default"][cls.group_of(topic)])
+        setting.update(alarm_config.get("channels", {}).get(topic, {}))
+        missing = [field for field in cls.FIELDS if field not in setting]
+        if missing:
+            raise KeyError(f"Alarm settings of {topic} miss {missing}")
+        return setting
+
+    def reset(self) -> None:
+        nb = len(self.topics)
+        # Level alarm
+        self.level = np.ones(nb, dtype=np.int8)  # confirmed level (starts at pass)
+        self.level_pending = self.level.copy()  # candidate level waiting for its debounce
+        self.level_since = np.full(nb, np.nan)  # time the candidate first appeared
+        self.level_t_start = np.full(nb, np.nan)  # start of the current episode
+        self.level_peak = np.full(nb, np.nan)  # extreme value of the current episode
+        # Rate alarm (2 active, 1 cleared)
+        self.rate = np.ones(nb, dtype=np.int8)
+        self.rate_pending = self.rate.copy()
+        self.rate_since = np.full(nb, np.nan)
+        self.rate_t_start = np.full(nb, np.nan)
+        self.rate_peak = np.full(nb, np.nan)
+        # Previous sample (rate of change)
+        self.last_t = np.full(nb, np.nan)
+        self.last_v = np.full(nb, np.nan)
+
+    # ── Processing ─────────────────────────────────────────────────────────────
+
+    def process(self, batch: Dict[str, Sequence]) -> List[Dict]:
+        """
+        Run a batch of samples through the alarm stage.
+
+        batch : {topic: [(t_sec, value), ...] or (n, 2) array}, time increasing per topic.
+        Returns the alarm transitions of the batch, in time order.
+        """
+        T, V, present = self._rounds(batch)
+        events = []
+        for t, v, p in zip(T, V, present):
+            events.extend(self._step(t, v, p))
+        events.sort(key=lambda event: event["t"])
+        return events
+
+    def _rounds(self, batch: Dict[str, Sequence]):
+        """Scatter a batch into (rounds, channels) time/value matrices, one sample per channel per round."""
+        nb = len(self.topics)
+        channels, blocks = [], []
+        for topic, samples in batch.items():
+            i = self.index.get(topic)
+            if i is None or len(samples) == 0:
+                continue
+            block = np.asarray(samples, dtype=float).reshape(-1, 2)
+            blocks.append(block)
+            channels.append(np.full(block.shape[0], i))
+        if not blocks:
+            return np.empty((0, nb)), np.empty((0, nb)), np.empty((0, nb), dtype=bool)
+
+        data = np.concatenate(blocks)
+        channel = np.concatenate(channels)
+        order = np.lexsort((data[:, 0], channel))
+        data, channel = data[order], channel[order]
+
+        counts = np.bincount(channel, minlength=nb)
+        rank = np.arange(channel.shape[0]) - (np.cumsum(counts) - counts)[channel]  # sample number inside its channel
+
+        T = np.full((counts.max(), nb), np.nan)
+        V = np.full((counts.max(), nb), np.nan)
+        present = np.zeros((counts.max(), nb), dtype=bool)
+        T[rank, channel] = data[:, 0]
+        V[rank, channel] = data[:, 1]
+        present[rank, channel] = True
+        return T, V, present
+
+    def _step(self, t: np.ndarray, v: np.ndarray, present: np.ndarray) -> List[Dict]:
+        """One round: at most one new sample per channel."""
+        events = []
+
+        # Level with hysteresis: thresholds already crossed move back toward normal by `hyst`
+        level = self.level.copy()  # state before this round
+        shift = np.vstack((level <= -3, level <= -2, -(level >= 2).astype(float), -(level >= 3).astype(float)))
+        candidate = self.LimitCheck_obj.level_check_array(v, self.limits + shift * self.hyst)
+        # Peak of the excursion, from its first sample (before the debounce confirms it)
+        side = np.where(np.abs(level) >= 2, level, candidate)
+        onset = present & (np.abs(level) < 2) & (np.abs(candidate) >= 2) & (candidate != self.level_pending)
+        self.level_peak[onset] = v[onset]
+        high, low = present & (side >= 2), present & (side <= -2)
+        self.level_peak[high] = np.fmax(self.level_peak[high], v[high])
+        self.level_peak[low] = np.fmin(self.level_peak[low], v[low])
+
+        confirmed, since = self._debounce(candidate, self.level, self.level_pending, self.level_since, t, present)
+        for i in np.flatnonzero(confirmed):
+            events.append(self._transition("level", i, level[i], candidate[i], t[i], v[i], since[i], self.level_t_start, self.level_peak))
+
+        # Rate of change against the previous sample of the channel
+        dt = t - self.last_t
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.abs(v - self.last_v) / dt
+        valid = present & (dt > 0) & np.isfinite(rate)
+        previous = self.rate.copy()
+        candidate = np.where(valid, np.where(rate > self.rate_max, 2, 1), previous).astype(np.int8)
+        onset = valid & (previous == 1) & (candidate == 2) & (self.rate_pending == 1)
+        self.rate_peak[onset] = rate[onset]
+        active = valid & ((previous == 2) | (candidate == 2))
+        self.rate_peak[active] = np.fmax(self.rate_peak[active], rate[active])
+
+        confirmed, since = self._debounce(candidate, self.rate, self.rate_pending, self.rate_since, t, valid)
+        for i in np.flatnonzero(confirmed):
+            events.append(self._transition("rate", i, previous[i], candidate[i], t[i], v[i], since[i], self.rate_t_start, self.rate_peak))
+
+        self.last_t[present] = t[present]
+        self.last_v[present] = v[present]
+        return events
+
+    def _debounce(self, candidate, state, pending, since, t, present) -> np.ndarray:
+        """
+        Confirm candidates that stayed the same for at least `debounce_s`.
+        Updates `state`, `pending` and `since` in place; returns the mask of confirmed changes and the time each candidate appeared.
+        """
+        differs = present & (candidate != state)
+        restart = differs & (candidate != pending)
+        pending[restart] = candidate[restart]
+        since[restart] = t[restart]
+        back = present & ~differs  # candidate went back to the confirmed state
+        pending[back] = state[back]
+        since[back] = np.nan
+
+        confirmed = differs & (t - since >= self.debounce)
+        onset = since.copy()
+        state[confirmed] = candidate[confirmed]
+        since[confirmed] = np.nan
+        return confirmed, onset
+
+    def _transition(self, kind, i, prev, new, t, value, since, t_start, peak) -> Dict:
+        """Event of channel i going from `prev` to `new` (candidate since `since`); opens or closes the alarm episode."""
+        event = {"topic": self.topics[i], "kind": kind, "level": int(new), "prev_level": int(prev), "t": float(t), "value": float(value),
+                 "t_start": None, "t_end": None, "peak": None}
+
+        was_alarm, is_alarm = abs(int(prev)) >= 2, abs(int(new)) >= 2
+        if is_alarm and not was_alarm:
+            t_start[i] = since  # episode starts with its first out-of-limit sample
+        elif was_alarm and not is_alarm:
+            event.update({"t_end": float(t), "peak": float(peak[i])})  # episode closed
+        if was_alarm or is_alarm:
+            event["t_start"] = float(t_start[i])
+        return event
@@ -14,24 +14,33 @@ not pack bytes; callers enforce endianness/signedness when (de)serializing VAL.
 
 Public API
 ----------
-CmdTable.convert(x)  : int<->str mapping (113 ⇄ "VRD"; also accepts "113")
+CmdTable.convert(x)  : int<->str mapping (21 ⇄ "RTDA1"; also accepts "21")
 CmdTable.get_type(x) : returns "i" or "f" for the VAL packing
 CmdTable.parse_hex(w): splits a packed status word into 2-bit fields
+COMPILED             : 256-entry lookup arrays indexed by the CMD byte (built at import)
 
 Invariants
 ----------
 - CMD codes are unique
 - TYPE ∈ {"i","f"}
+- Optional KIND ∈ {"RTD","ADC","FAULT"}, SCALE and OFFSET (raw VAL * SCALE + OFFSET = engineering unit)
+- Data channel entries are generated from Setup/Channel_Registry.json (see Channel_Registry)
 
 Examples
 --------
 >>> t = CmdTable()
->>> t.convert("VRD"), t.get_type(113)
-(113, 'f')
+>>> t.convert("RTDA1"), t.get_type(21)
+(21, 'i')
+>>> t.array_table["RTDA1"]["KIND"], t.array_table["RTDA1"]["SCALE"]
+('RTD', 0.0009765625)
 """
 
 from __future__ import annotations
-from typing import Dict, Optional, Union, Literal
+from typing import Dict, NamedTuple, Optional, Tuple, Union, Literal
+
+import numpy as np
+
+from Setup.Channel_Registry import get_registry
 
 class CmdTable:
     """
@@ -74,58 +83,12 @@ class CmdTable:
         # Command dictionary:
         # - CMD: numeric command byte (will be truncated to 1 byte when serialized)
         # - TYPE: payload interpretation for the 4-byte value ("i" or "f")
+        # - KIND: channel kind ("RTD" temperature, "ADC" rail voltage, "FAULT" status word), optional
+        # - SCALE, OFFSET: raw VAL * SCALE + OFFSET -> engineering unit (°C, V), optional (1.0, 0.0)
         # AI_HINT: Keep names consistent and stable; callers and docs rely on these mnemonics.
         self.array_table: Dict[str, Dict[str, Union[int, Literal["i", "f"]]]] = {
-
-
-
-
-            "RTDA1": {"CMD": 21, "TYPE": "i"},  # Command to send/receive channel 1 reading
-            "RTDA2": {"CMD": 22, "TYPE": "i"},  # Command to send/receive channel 2 reading
-            "RTDA3": {"CMD": 23, "TYPE": "i"},  # Command to send/receive channel 3 reading
-            "RTDA4": {"CMD": 24, "TYPE": "i"},  # Command to send/receive channel 4 reading
-
-            "RTDA5": {"CMD": 25, "TYPE": "i"},  # Command to send/receive channel 5 reading
-            "RTDA6": {"CMD": 26, "TYPE": "i"},  # Command to send/receive channel 6 reading
-            "RTDA7": {"CMD": 27, "TYPE": "i"},  # Command to send/receive channel 7 reading
-            "RTDA8": {"CMD": 28, "TYPE": "i"},  # Command to send/receive channel 8 reading
-
-            "FAULT_RTDA": {"CMD": 31, "TYPE": "i"},  # Command to send/receive channel RTDA reading
-            "RTDA_ADC1": {"CMD": 32, "TYPE": "i"},  # ADC1 from RTDA
-            "RTDA_ADC2": {"CMD": 33, "TYPE": "i"},  # ADC2 from RTDA
-
-            "RTDB1": {"CMD": 41, "TYPE": "i"},  # Command to send/receive channel 1 reading
-            "RTDB2": {"CMD": 42, "TYPE": "i"},  # Command to send/receive channel 2 reading
-            "RTDB3": {"CMD": 43, "TYPE": "i"},  # Command to send/receive channel 3 reading
-            "RTDB4": {"CMD": 44, "TYPE": "i"},  # Command to send/receive channel 4 reading
-
-            "RTDB5": {"CMD": 45, "TYPE": "i"},  # Command to send/receive channel 5 reading
-            "RTDB6": {"CMD": 46, "TYPE": "i"},  # Command to send/receive channel 6 reading
-            "RTDB7": {"CMD": 47, "TYPE": "i"},  # Command to send/receive channel 7 reading
-            "RTDB8": {"CMD": 48, "TYPE": "i"},  # Command to send/receive channel 8 reading
-
-            "FAULT_RTDB": {"CMD": 51, "TYPE": "i"},  # Command to send/receive channel RTDB reading
-            "RTDB_ADC1": {"CMD": 52, "TYPE": "i"},  # ADC1 from RTDB
-            "RTDB_ADC2": {"CMD": 53, "TYPE": "i"},  # ADC2 from RTDB
-
-            "RTDC1": {"CMD": 61, "TYPE": "i"},  # Command to send/receive channel 1 reading
-            "RTDC2": {"CMD": 62, "TYPE": "i"},  # Command to send/receive channel 2 reading
-            "RTDC3": {"CMD": 63, "TYPE": "i"},  # Command to send/receive channel 3 reading
-            "RTDC4": {"CMD": 64, "TYPE": "i"},  # Command to send/receive channel 4 reading
-
-            "RTDC5": {"CMD": 65, "TYPE": "i"},  # Command to send/receive channel 5 reading
-            "RTDC6": {"CMD": 66, "TYPE": "i"},  # Command to send/receive channel 6 reading
-            "RTDC7": {"CMD": 67, "TYPE": "i"},  # Command to send/receive channel 7 reading
-            "RTDC8": {"CMD": 68, "TYPE": "i"},  # Command to send/receive channel 8 reading
-
-            "FAULT_RTDC": {"CMD": 71, "TYPE": "i"},  # Command to send/receive channel RTDC reading
-            "RTDC_ADC1": {"CMD": 72, "TYPE": "i"},  # ADC1 from RTDC
-            "RTDC_ADC2": {"CMD": 73, "TYPE": "i"},  # ADC2 from RTDC
-
-
-
-
-
+            # Data channels (RTD/ADC/FAULT of every board) come from the channel registry
+            **get_registry().cmd_table(),
 
             # "RTD1": {"CMD": 101, "TYPE": "i"},   # Set address
             # "RTD2": {"CMD": 102, "TYPE": "i"},   # Power ON/OFF
@@ -139,7 +102,6 @@ class CmdTable:
             # "ADC2":   {"CMD": 122, "TYPE": "i"},   # Measure Vout
             # "ADC3":   {"CMD": 123, "TYPE": "i"},   # Measure Iout
             # "ADC4":   {"CMD": 124, "TYPE": "i"},   # Temperature T1
-
         }
 
         # Precomputed lookup maps for fast conversion.
@@ -169,6 +131,8 @@ class CmdTable:
         -----
         Input like "113" is supported for convenience.
         """
+        if type(x) is int and 0 <= x < 256:
+            return COMPILED.name[x]  # fast path: command byte
         try:
             if isinstance(x, int):
                 return self.t_123_abc.get(x)
@@ -195,6 +159,8 @@ class CmdTable:
             "i" for 32-bit integer, "f" for 32-bit float.
             Defaults to "i" if unknown (preserves current behavior).
         """
+        if type(x) is int and 0 <= x < 256:
+            return COMPILED.type[x]  # fast path: command byte
         try:
             cmd_key = self.convert(x)
             if cmd_key:
@@ -221,4 +187,58 @@ class CmdTable:
             Field name -> 2-bit code (0..3), used with T_OFF/T_ON/T_FAIL/T_BUSY.
         """
         # Extract (status_word >> (pos * 2)) & 0b11 for each named field.
-        return {name: ((status_word >> (pos * 2)) & 0b11) for name, pos in self.array_hex.items()}
\ No newline at end of file
+        return {name: ((status_word >> (pos * 2)) & 0b11) for name, pos in self.array_hex.items()}
+
+
+# ── Compiled table ───────────────────────────────────────────────────────────────
+# Built once at import. Every array has 256 entries indexed by the command byte, so the
+# parser/driver decode with COMPILED.type[cmd] and NumPy paths use COMPILED.scale[cmd_array].
+
+KIND_NONE, KIND_RTD, KIND_ADC, KIND_FAULT = 0, 1, 2, 3
+KIND_CODES = {"RTD": KIND_RTD, "ADC": KIND_ADC, "FAULT": KIND_FAULT}
+
+
+class CompiledTable(NamedTuple):
+    name: Tuple[Optional[str], ...]  # mnemonic, None if unknown
+    type: Tuple[str, ...]  # struct char of VAL ("i" if unknown, as get_type)
+    scale_list: Tuple[float, ...]  # SCALE as Python floats (scalar path)
+    offset_list: Tuple[float, ...]  # OFFSET as Python floats (scalar path)
+    scale: np.ndarray  # float64 SCALE (1.0 if none)
+    offset: np.ndarray  # float64 OFFSET (0.0 if none)
+    channel: np.ndarray  # int16 index in `channels` (RTD/ADC data channels), -1 otherwise
+    kind: np.ndarray  # int8 KIND_* code
+    channels: Tuple[str, ...]  # data channel mnemonics, in table order
+
+
+def compile_table(array_table: Dict[str, Dict]) -> CompiledTable:
+    """Build the 256-entry lookup arrays of a command table."""
+    name = [None] * 256
+    type_ = ["i"] * 256
+    scale = np.ones(256, dtype=np.float64)
+    offset = np.zeros(256, dtype=np.float64)
+    channel = np.full(256, -1, dtype=np.int16)
+    kind = np.zeros(256, dtype=np.int8)
+    channels = []
+    for mnemonic, entry in array_table.items():
+        cmd = int(entry["CMD"]) & 0xFF  # 1 byte on the wire
+        name[cmd] = mnemonic
+        type_[cmd] = entry["TYPE"]
+        scale[cmd] = entry.get("SCALE", 1.0)
+        offset[cmd] = entry.get("OFFSET", 0.0)
+        kind[cmd] = KIND_CODES.get(entry.get("KIND"), KIND_NONE)
+        if kind[cmd] in (KIND_RTD, KIND_ADC):
+            channel[cmd] = len(channels)
+            channels.append(mnemonic)
+    for array in (scale, offset, channel, kind):
+        array.flags.writeable = False  # shared, read-only
+    return CompiledTable(tuple(name), tuple(type_), tuple(scale.tolist()), tuple(offset.tolist()), scale, offset, channel, kind, tuple(channels))
+
+
+def to_units(cmds: np.ndarray, raw: np.ndarray) -> np.ndarray:
+    """Engineering values of raw VALs for arrays of CMD codes (fancy indexing, no per-sample lookup)."""
+    cmds = np.asarray(cmds, dtype=np.intp)
+    return np.asarray(raw, dtype=np.float64) * COMPILED.scale[cmds] + COMPILED.offset[cmds]
+
+
+COMPILED = compile_table(CmdTable().array_table)
+CmdTable.compiled = COMPILED
@@ -0,0 +1,123 @@
+"""
+Module: Setup/Channel_Registry.py
+
+Purpose
+-------
+Single declarative description of the MCU data channels, shared by the driver
+process (RJ45_UDP) and the GUI process (Main_Project):
+- name, CMD code, raw VAL type, scale/offset (value = raw * scale + offset), unit
+- board, kind (RTD / ADC / FAULT), plot group, alarm group
+
+Configuration
+-------------
+Setup/Channel_Registry.json
+- boards          : {board: {"cmd_base": n}}; one entry per LTM2985 board
+- board_channels  : channel templates repeated on every board ("{board}" and "{n}"
+                    are substituted, CMD = cmd_base + cmd (+ n - 1 when "count" is set))
+- channels        : extra channels given explicitly (same fields, absolute "cmd")
+- plot_groups     : {group: {"title", "label", "unit"}} ("{board}" expands per board)
+Adding a board is one line in "boards".
+
+Public API
+----------
+get_registry()                 : registry of this process (loaded once)
+Channel_Registry(path=None)
+names(kind=None, board=None)   : channel names in declaration order
+channel(name)                  : channel dict
+boards()                       : board names in declaration order
+cmd_table()                    : {name: {"CMD", "TYPE", "KIND", "SCALE", "OFFSET"}} for CmdTable
+plot_groups                    : {group: (title, y label, y units)}
+The decode/scale tables indexed by CMD byte are compiled from cmd_table() by CMD_TABLE (COMPILED).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+_registry = None
+
+
+def get_registry() -> "Channel_Registry":
+    """Registry of the current process, loaded from the JSON file on first use."""
+    global _registry
+    if _registry is None:
+        _registry = Channel_Registry()
+    return _registry
+
+
+class Channel_Registry:
+    """
+    Channels expanded from Setup/Channel_Registry.json.
+
+    Parameters
+    ----------
+    path : str, optional
+        Registry file (default: Setup/Channel_Registry.json of the project).
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            path = os.path.join(rooth_path_finder(), "Setup/Channel_Registry.json")
+        with open(path, "r", encoding="utf-8") as json_file:
+            config = json.load(json_file)
+
+        self.channels: List[Dict] = []
+        for board, board_config in config["boards"].items():
+            base = int(board_config["cmd_base"])
+            for template in config["board_channels"]:
+                for n in range(1, int(template.get("count", 1)) + 1):
+                    channel = {key: (value.format(board=board, n=n) if isinstance(value, str) else value) for key, value in template.items() if key != "count"}
+                    channel["cmd"] = base + int(template["cmd"]) + (n - 1)
+                    channel["board"] = board
+                    self.channels.append(channel)
+        for channel in config.get("channels", []):
+            self.channels.append(dict(channel))
+
+        self.by_name: Dict[str, Dict] = {}
+        used = {}
+        for channel in self.channels:
+            channel.setdefault("scale", 1.0)
+            channel.setdefault("offset", 0.0)
+            channel.setdefault("unit", "")
+            channel.setdefault("board", "")
+            channel.setdefault("plot_group", None)
+            channel.setdefault("alarm_group", None)
+            if channel["type"] not in ("i", "f"):
+                raise ValueError(f"Channel {channel['name']}: TYPE must be 'i' or 'f'")
+            if not 0 <= channel["cmd"] < 256:
+                raise ValueError(f"Channel {channel['name']}: CMD {channel['cmd']} does not fit in one byte")
+            if channel["cmd"] in used:
+                raise ValueError(f"Channels {used[channel['cmd']]} and {channel['name']} share CMD {channel['cmd']}")
+            used[channel["cmd"]] = channel["name"]
+            self.by_name[channel["name"]] = channel
+
+        self.plot_groups: Dict[str, tuple] = {}
+        for group, info in config.get("plot_groups", {}).items():
+            boards = config["boards"] if "{board}" in group else [None]
+            for board in boards:
+                fill = (lambda text: text.format(board=board)) if board else (lambda text: text)
+                self.plot_groups[fill(group)] = (fill(info["title"]), info["label"], info["unit"])
+
+    def names(self, kind: Optional[str] = None, board: Optional[str] = None) -> List[str]:
+        return [
+            channel["name"]
+            for channel in self.channels
+            if (kind is None or channel["kind"] == kind) and (board is None or channel["board"] == board)
+        ]
+
+    def channel(self, name: str) -> Dict:
+        return self.by_name[name]
+
+    def boards(self) -> List[str]:
+        return list(dict.fromkeys(channel["board"] for channel in self.channels if channel["board"]))
+
+    def cmd_table(self) -> Dict[str, Dict]:
+        """CmdTable entries of the data channels."""
+        return {
+            channel["name"]: {"CMD": channel["cmd"], "TYPE": channel["type"], "KIND": channel["kind"], "SCALE": channel["scale"], "OFFSET": channel["offset"]}
+            for channel in self.channels
+        }
@@ -5,7 +5,7 @@ Handles database connections, CRUD project, and database updates for test projec
 """
 
 import os
-from sqlalchemy import create_engine, Column, Integer, Float, ForeignKey, String, Boolean, JSON, func
+from sqlalchemy import create_engine, Column, Integer, Float, ForeignKey, String, Boolean, JSON, Index, func, select, or_, inspect
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base, Session
 from sqlalchemy.sql import asc, case
 from sqlalchemy.exc import SQLAlchemyError
@@ -40,6 +40,8 @@ class Project(Base):
 
     # Relationship to Sample
     sample_list = relationship("Sample", back_populates="project_obj", passive_deletes=True)
+    # Relationship to Event
+    event_list = relationship("Event", back_populates="project_obj", passive_deletes=True)
 
 class Sample(Base):
     __tablename__ = "sample_table"
@@ -55,6 +57,30 @@ class Sample(Base):
     project_key = Column(Integer, ForeignKey("project_table.project_key", ondelete="SET NULL"))
     project_obj = relationship("Project", back_populates="sample_list")
 
+    # Time-range reads per topic (history browsing, LOD cache) use this index instead of a table scan
+    __table_args__ = (Index("ix_sample_topic_time", "topic", "time"),)
+
+
+class Event(Base):
+    """Alarm/state episode of one topic, from t_start to t_end (NULL while still active)"""
+
+    __tablename__ = "event_table"
+
+    event_key = Column(Integer, primary_key=True, autoincrement=True)
+
+    topic = Column(String(100), default="")  # Topic/sensor identifier (same as Sample.topic)
+    kind = Column(String(20), default="level")  # "level" (HH/H/L/LL) or "rate" (rate of change)
+    level = Column(Integer, default=0)  # most severe LimitCheck level of the episode (3 HH, 2 H, -2 L, -3 LL)
+    t_start = Column(Float)
+    t_end = Column(Float, nullable=True)
+    peak = Column(Float, nullable=True)  # extreme value (or |rate|) of the episode, set when it closes
+
+    project_key = Column(Integer, ForeignKey("project_table.project_key", ondelete="SET NULL"))
+    project_obj = relationship("Project", back_populates="event_list")
+
+    # Event lists of a long recording are read by time range / per topic, never through sample_table
+    __table_args__ = (Index("ix_event_time", "t_start", "t_end"), Index("ix_event_topic_time", "topic", "t_start"))
+
 
 # ------------------------------------------------------------------------
 # 2. The DataBaseWrap Class
@@ -80,18 +106,21 @@ class DataBaseWrap:
         self.project_DB = Project()
 
     # Database Connection and Setup Methods
-    def connect_DB(self, db_file_path):
+    def connect_DB(self, db_file_path, read_only=False):
         """
         Initializes the database connection and creates the schema if necessary.
 
         :param db_file_path: The full path to the database file (including filename).
+        :param read_only: Review/export of an existing file: the schema is left as it is (no table
+            or index is added; on a large older recording building an index is a long write).
+            Callers use missing_indexes() / create_indexes() only when the user asks for it.
         """
         if self.linked:
             self.engine.dispose()
             
         # Ensure the parent directory exists
         parent_dir = os.path.dirname(db_file_path)
-        if parent_dir and not os.path.exists(parent_dir):
+        if not read_only and parent_dir and not os.path.exists(parent_dir):
             os.makedirs(parent_dir, exist_ok=True)
             
         # Construct the full path for the SQLite database file.
@@ -103,9 +132,10 @@ class DataBaseWrap:
         self.engine = create_engine(self.db_url, echo=echo)
         self.SessionLocal = sessionmaker(bind=self.engine)
 
-        # Ensure the schema (all tables) exists in the database.
+        # Ensure the schema (all tables and indexes) exists in the database.
         # This call is safe even if the tables already exist.
-        self.create_tables()
+        if not read_only:
+            self.create_tables()
         self.linked = True
 
         with self.get_session() as session:
@@ -115,8 +145,35 @@ class DataBaseWrap:
                 self.project_DB = project
 
     def create_tables(self):
-        """Creates all tables in the database (if not exist)."""
+        """Creates the missing tables with their indexes, and the missing indexes of existing tables."""
         Base.metadata.create_all(self.engine)
+        self.create_indexes()
+
+    def missing_indexes(self):
+        """
+        Indexes of the schema absent from the existing tables of the file (create_all() skips those).
+        Tables missing altogether (read-only connection to an older file) are not listed.
+        """
+        inspector = inspect(self.engine)
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            missing.extend(index for index in table.indexes if index.name not in existing)
+        return missing
+
+    def create_indexes(self, indexes=None, progress=None):
+        """
+        Build `indexes` (default: all missing ones).
+        progress(i, n, name) is called before each index; one index is a single statement (no finer progress).
+        """
+        if indexes is None:
+            indexes = self.missing_indexes()
+        for i, index in enumerate(indexes):
+            if progress is not None:
+                progress(i, len(indexes), index.name)
+            index.create(self.engine, checkfirst=True)
 
     class SessionManager:
         """
@@ -174,3 +231,64 @@ class DataBaseWrap:
                 print(f"An error occurred: {e}")
                 return False
 
+    def add_events(self, session, events, project_key=None):
+        """
+        Apply Alarm_Engine transitions to event_table in the given session (the caller commits).
+        An opening transition adds a row, an escalation raises its level, a closing one sets t_end and peak.
+        The open rows of the topics involved are read with one query per call, not one per transition.
+        """
+        events = [event for event in events if event["t_start"] is not None]  # None: no alarm on either side (e.g. pass <-> NA)
+        if not events:
+            return
+
+        # (topic, kind) -> newest open row
+        open_rows = {}
+        topics = {event["topic"] for event in events}
+        for row in session.execute(
+            select(Event).where(Event.topic.in_(topics), Event.t_end.is_(None)).order_by(Event.t_start)
+        ).scalars():
+            open_rows[(row.topic, row.kind)] = row
+
+        new_rows = []
+        for event in events:
+            key = (event["topic"], event["kind"])
+            row = open_rows.get(key)
+            if row is None or row.t_start != event["t_start"]:
+                row = Event(project_key=project_key, topic=event["topic"], kind=event["kind"], level=event["level"], t_start=event["t_start"])
+                new_rows.append(row)
+                open_rows[key] = row
+
+            if event["t_end"] is not None:
+                row.t_end = event["t_end"]
+                row.peak = event["peak"]
+                del open_rows[key]
+            elif abs(event["level"]) > abs(row.level):
+                row.level = event["level"]
+        session.add_all(new_rows)
+
+    def list_events(self, t0=None, t1=None, topic=None, limit=None):
+        """
+        Events overlapping [t0, t1] (None = unbounded), oldest first, as dicts.
+        Uses the event_table indexes only; sample rows are never read.
+        Files recorded before event_table existed (opened read-only) have no events.
+        """
+        if not inspect(self.engine).has_table(Event.__tablename__):
+            return []
+        query = select(Event.topic, Event.kind, Event.level, Event.t_start, Event.t_end, Event.peak)
+        if t1 is not None:
+            query = query.where(Event.t_start <= t1)
+        if t0 is not None:
+            query = query.where(or_(Event.t_end >= t0, Event.t_end.is_(None)))
+        if topic is not None:
+            query = query.where(Event.topic == topic)
+        if limit is not None:
+            # Newest `limit` events, returned oldest first
+            query = query.order_by(Event.t_start.desc()).limit(limit)
+        else:
+            query = query.order_by(Event.t_start)
+
+        with self.get_session() as session:
+            rows = [dict(row._mapping) for row in session.execute(query)]
+        if limit is not None:
+            rows.reverse()
+        return rows
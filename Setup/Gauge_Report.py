@@ -0,0 +1,198 @@
+"""
+Module: Setup/Gauge_Report.py
+
+Purpose
+-------
+Gauge images for end-of-run reports (dozens of limit gauges per tested unit):
+- Rendered in a process pool with the object-oriented matplotlib Agg API (no pyplot state)
+- Each worker builds its figure once and redraws it for every gauge
+- PNGs come back as BytesIO and are cached by content hash (same value + limits = same image)
+
+Public API
+----------
+Gauge_Report(workers=None)
+render(limits)           : BytesIO PNG of one gauge
+render_all(limits_list)  : list of BytesIO, same order as the input
+close()                  : stop the worker processes (also on `with` exit)
+
+`limits` has the Gauge_Task form {"val": value, "lim": {"LL", "L", "H", "HH"}}.
+
+Notes
+-----
+Small batches (< POOL_MIN_JOBS new images) are rendered in the calling process,
+where starting the pool would cost more than the rendering.
+matplotlib is imported with the first figure (a few hundred ms), not with this module.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import multiprocessing as mp
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+STYLE_VERSION = 1  # part of the cache key: bump when the drawing changes
+
+# Figure and artists of the current process (one set per worker), created on first use
+_figure = None
+
+
+def _get_figure():
+    """Build the figure once: band rectangles, edge lines, bound labels and value marker are only updated later."""
+    global _figure
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Rectangle
+
+        fig = Figure(figsize=(5, 1), dpi=100)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0.06, 0.3, 0.88, 0.25])
+        ax.set_axis_off()
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        artists = {
+            "bands": [ax.add_patch(Rectangle((0, 0), 0, 1, color=color, linewidth=0)) for color in ("red", "yellow", "lime", "yellow", "red")],
+            "edges": [ax.plot([0, 0], [0, 1.15], color="k", linewidth=1, clip_on=False)[0] for _ in range(4)],
+            "labels": [ax.text(0, -0.25, "", ha="center", va="top", fontsize=9, clip_on=False) for _ in range(4)],
+            "marker": ax.annotate(
+                "",
+                xy=(0, 1),
+                xytext=(0, 1.6),
+                va="bottom",
+                ha="center",
+                annotation_clip=False,
+                bbox=dict(boxstyle="round", fc="w"),
+                arrowprops=dict(arrowstyle="wedge", color="k"),
+            ),
+        }
+        _figure = (fig, artists)
+    return _figure
+
+
+def _draw_gauge(payload: str) -> bytes:
+    """Render one gauge (JSON payload from Gauge_Report.key_payload) to PNG bytes."""
+    limits = json.loads(payload)
+    value = limits["val"]
+    bounds = [float(limits["lim"][key]) for key in ("LL", "L", "H", "HH")]
+    LL, HH = bounds[0], bounds[3]
+
+    # Axis in bar units: red extensions [0, ext] and [1 - ext, 1], limits proportional in between
+    ext = 0.1
+    span = HH - LL
+
+    def x_of(v):
+        if v < LL:
+            return ext / 2
+        if v > HH:
+            return 1 - ext / 2
+        return 0.5 if span == 0 else ext + (v - LL) / span * (1 - 2 * ext)
+
+    fig, artists = _get_figure()
+    edges = [x_of(bound) for bound in bounds]
+    for band, left, right in zip(artists["bands"], [0] + edges, edges + [1]):
+        band.set_x(left)
+        band.set_width(right - left)
+    for line, label, x, bound in zip(artists["edges"], artists["labels"], edges, bounds):
+        line.set_xdata([x, x])
+        label.set_x(x)
+        label.set_text(f"{bound:g}")
+
+    x = x_of(float(value))
+    marker = artists["marker"]
+    marker.set_text(f"{value}")
+    marker.xy = (x, 1)
+    marker.set_position((x, 1.6))
+
+    memfile = io.BytesIO()
+    fig.savefig(memfile, format="png")
+    return memfile.getvalue()
+
+
+class Gauge_Report:
+    """
+    Renders and caches report gauges.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Worker processes (default: CPU count).
+    """
+
+    POOL_MIN_JOBS = 8
+    MAX_CACHE = 4096  # PNGs kept (a few kB each)
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __enter__(self) -> "Gauge_Report":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @staticmethod
+    def key_payload(limits: Dict) -> str:
+        """Canonical JSON of what the image depends on."""
+        lim = limits["lim"]
+        return json.dumps({"val": limits["val"], "lim": {key: lim[key] for key in ("LL", "L", "H", "HH")}, "style": STYLE_VERSION}, sort_keys=True)
+
+    @staticmethod
+    def content_hash(payload: str) -> str:
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def render(self, limits: Dict) -> io.BytesIO:
+        return self.render_all([limits])[0]
+
+    def render_all(self, limits_list: List[Dict]) -> List[io.BytesIO]:
+        """Gauge PNGs of a whole report; only images not in the cache are rendered."""
+        payloads = [self.key_payload(limits) for limits in limits_list]
+        hashes = [self.content_hash(payload) for payload in payloads]
+
+        # hash -> PNG of this request; cached images are taken before new ones are stored,
+        # since storing can evict them
+        pngs = {}
+        todo = {}  # hash -> payload, each distinct image once
+        for digest, payload in zip(hashes, payloads):
+            if digest in pngs or digest in todo:
+                continue
+            png = self._cache.get(digest)
+            if png is None:
+                todo[digest] = payload
+            else:
+                self._cache.move_to_end(digest)
+                pngs[digest] = png
+
+        if todo:
+            if len(todo) < self.POOL_MIN_JOBS:
+                images = [_draw_gauge(payload) for payload in todo.values()]
+            else:
+                chunksize = max(1, len(todo) // (4 * self.workers))
+                images = list(self._get_pool().map(_draw_gauge, todo.values(), chunksize=chunksize))
+            for digest, png in zip(todo, images):
+                pngs[digest] = png
+                self._store(digest, png)
+
+        return [io.BytesIO(pngs[digest]) for digest in hashes]
+
+    def _store(self, digest: str, png: bytes) -> None:
+        self._cache[digest] = png
+        if len(self._cache) > self.MAX_CACHE:
+            self._cache.popitem(last=False)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: same behaviour on Windows (the target) and elsewhere, no forked Qt state
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+        return self._pool
@@ -1,100 +1,141 @@
 """
 Visual gauge generator for limit checking and status display.
-Creates color-coded horizontal gauge charts with boundary indicators using matplotlib.
+Creates color-coded horizontal gauge images with boundary indicators using QPainter.
 Provides visual feedback for measurement values against defined operational limits.
+
+The colour bands of a LL/L/H/HH tuple are drawn once and kept in a small cache;
+each update only copies that background and draws the value marker on it.
+Drawing text needs a QGuiApplication (the GUI one, or an offscreen one for batch use).
 """
 
-import matplotlib.pyplot as plt
-import matplotlib as mpl
 import io
+from collections import OrderedDict
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QImage, QPainter, QPen, QPolygonF
 
 
 class Gauge_Task:
+    WIDTH = 500  # image size in pixels (the former 5 x 1 inch figure at 100 dpi)
+    HEIGHT = 100
+    MARGIN = 30  # left/right space for the out-of-range markers
+    EXTEND = 40  # width of the red LL/HH extensions
+    BAR_TOP = 45
+    BAR_HEIGHT = 20
+    MAX_BACKGROUNDS = 64  # limit tuples kept in the cache
+
     def __init__(self):
         self.task_dict = {}
+        self._backgrounds = OrderedDict()  # (LL, L, H, HH) -> QImage of the colour bands
 
-    def create_image(self, limits):
-        memfile = io.BytesIO()
-        length = 5
-        height = 1
-
-        fig, ax = plt.subplots(figsize=(length, height))
-        fig.subplots_adjust(bottom=0.5)
-
-        cmap = mpl.colors.ListedColormap(["yellow", "lime", "yellow"]).with_extremes(over="red", under="red")
-
-        Val = limits["val"]
-        LL = limits["lim"]["LL"]
-        L = limits["lim"]["L"]
-        H = limits["lim"]["H"]
-        HH = limits["lim"]["HH"]
-
-        bounds = [LL, L, H, HH]
-        norm = mpl.colors.BoundaryNorm(bounds, cmap.N)
-
-        cbar = plt.colorbar(
-            mpl.cm.ScalarMappable(cmap=cmap, norm=norm),
-            cax=ax,
-            drawedges=True,
-            boundaries=[40] + bounds + [60],
-            extend="both",
-            extendfrac="auto",
-            extendrect="True",
-            ticks=bounds,
-            spacing="proportional",
-            orientation="horizontal",
-        )
-
-        if Val < LL:
-            cbar.outline.set_visible(False)
-            ax.annotate(
-                Val,
-                xy=(-4 * length, 0),
-                xycoords="axes points",
-                xytext=(-4 * length, height * 14),
-                textcoords="axes points",
-                va="bottom",
-                ha="center",
-                bbox=dict(boxstyle="round", fc="w"),
-                arrowprops=dict(
-                    arrowstyle="wedge",
-                    color="k",
-                ),
-            )
-
-        elif Val > HH:
-            cbar.outline.set_visible(False)
-            ax.annotate(
-                Val,
-                xy=(length * 42, 0),
-                xycoords="axes points",
-                xytext=(length * 42, height * 14),
-                textcoords="axes points",
-                va="bottom",
-                ha="center",
-                bbox=dict(boxstyle="round", fc="w"),
-                arrowprops=dict(
-                    arrowstyle="wedge",
-                    color="k",
-                ),
-            )
+    @staticmethod
+    def limits_key(limits):
+        lim = limits["lim"]
+        return (float(lim["LL"]), float(lim["L"]), float(lim["H"]), float(lim["HH"]))
 
+    def background(self, key):
+        """Colour bands, edges and tick labels of a (LL, L, H, HH) tuple, rendered once."""
+        image = self._backgrounds.get(key)
+        if image is None:
+            image = self._draw_background(key)
+            self._backgrounds[key] = image
+            if len(self._backgrounds) > self.MAX_BACKGROUNDS:
+                self._backgrounds.popitem(last=False)
         else:
-            cbar.outline.set_visible(False)
-            ax.annotate(
-                Val,
-                xy=(Val, 0),
-                xycoords="data",
-                xytext=(Val, 0.5),
-                textcoords="data",
-                va="bottom",
-                ha="center",
-                bbox=dict(boxstyle="round", fc="w"),
-                arrowprops=dict(
-                    arrowstyle="wedge",
-                    color="k",
-                ),
-            )
-        plt.savefig(memfile, bbox_inches="tight")
+            self._backgrounds.move_to_end(key)
+        return image
+
+    def clear_cache(self):
+        self._backgrounds.clear()
+
+    def _bar_span(self):
+        """x of the LL and HH bounds (the proportional part of the bar)."""
+        x0 = self.MARGIN + self.EXTEND
+        x1 = self.WIDTH - self.MARGIN - self.EXTEND
+        return x0, x1
+
+    def _x_of(self, key, value):
+        LL, _, _, HH = key
+        x0, x1 = self._bar_span()
+        if value < LL:
+            return self.MARGIN + self.EXTEND / 2
+        if value > HH:
+            return self.WIDTH - self.MARGIN - self.EXTEND / 2
+        if HH == LL:
+            return (x0 + x1) / 2
+        return x0 + (value - LL) / (HH - LL) * (x1 - x0)
+
+    def _draw_background(self, key):
+        image = QImage(self.WIDTH, self.HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor("white"))
+        painter = QPainter(image)
+        try:
+            top, height = self.BAR_TOP, self.BAR_HEIGHT
+            x_ll, x_hh = self._bar_span()
+            edges = [self._x_of(key, bound) for bound in key]
+
+            bands = [
+                (self.MARGIN, x_ll, "red"),  # under LL
+                (edges[0], edges[1], "yellow"),
+                (edges[1], edges[2], "lime"),
+                (edges[2], edges[3], "yellow"),
+                (x_hh, self.WIDTH - self.MARGIN, "red"),  # over HH
+            ]
+            painter.setPen(Qt.PenStyle.NoPen)
+            for left, right, color in bands:
+                painter.fillRect(QRectF(left, top, right - left, height), QColor(color))
+
+            painter.setPen(QPen(QColor("black"), 1))
+            font = QFont()
+            font.setPixelSize(11)
+            painter.setFont(font)
+            for x, bound in zip(edges, key):
+                painter.drawLine(QPointF(x, top), QPointF(x, top + height + 4))
+                painter.drawText(QRectF(x - 30, top + height + 5, 60, 16), Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, f"{bound:g}")
+        finally:
+            painter.end()
+        return image
+
+    def render(self, limits):
+        """
+        Gauge of limits {"val": value, "lim": {"LL", "L", "H", "HH"}} as a QImage.
+        Only the marker and its label are drawn; the bands come from the cache.
+        """
+        key = self.limits_key(limits)
+        image = self.background(key).copy()
+        value = limits["val"]
+        x = self._x_of(key, float(value))
+
+        painter = QPainter(image)
+        try:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            tip = self.BAR_TOP
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("black"))
+            painter.drawPolygon(QPolygonF([QPointF(x, tip), QPointF(x - 4, tip - 14), QPointF(x + 4, tip - 14)]))
+
+            font = QFont()
+            font.setPixelSize(12)
+            painter.setFont(font)
+            text = f"{value}"
+            width = painter.fontMetrics().horizontalAdvance(text) + 12
+            box = QRectF(min(max(x - width / 2, 1), self.WIDTH - width - 1), 4, width, 22)
+            painter.setPen(QPen(QColor("black"), 1))
+            painter.setBrush(QColor("white"))
+            painter.drawRoundedRect(box, 8, 8)
+            painter.drawText(box, Qt.AlignmentFlag.AlignCenter, text)
+        finally:
+            painter.end()
+        return image
+
+    def create_image(self, limits):
+        """Gauge of limits as PNG in a BytesIO (position 0)."""
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        self.render(limits).save(buffer, "PNG")
+        buffer.close()
+
+        memfile = io.BytesIO(bytes(data))
         memfile.seek(0)
         return memfile
@@ -0,0 +1,281 @@
+"""
+Module: Setup/LOD_Cache.py
+
+Purpose
+-------
+Level-of-detail (LOD) min/max pyramids for browsing recorded projects:
+- Built per topic by streaming `sample_table` in time order (never fully loaded)
+- Level 0 bucket = BUCKET samples; each level above merges 2 buckets
+- Levels are split in tiles of TILE buckets, loaded on demand and kept in a small LRU
+
+Storage
+-------
+Kept in memory, or next to the project file in "<project>.db.lod/":
+- meta.json          : {topic: {"count", "t_last", "levels"}} used to detect stale pyramids
+- <topic>_L<k>.npy   : (6, m) float64 rows [t_start, t_end, t_lo, y_lo, t_hi, y_hi]
+Files are opened with mmap, so only the tiles that are read come from disk.
+
+Public API
+----------
+LOD_Cache(db_wrap, persist=True)
+build()                        : (re)build pyramids of new/changed topics
+fetch(topic, x0, x1, n_pixels) : (t, y) with ~2 points per pixel over [x0, x1]
+time_span()                    : (t_first, t_last) over all topics
+
+Notes
+-----
+When the visible range holds fewer than ~2 samples per pixel, the raw samples
+are read from the database instead (uses the (topic, time) index when the file has it;
+older files get it only through DataBaseWrap.create_indexes(), offered on review open).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from Setup.DataBaseWrap import DataBaseWrap, Sample
+
+
+class LOD_Cache:
+    """
+    Min/max pyramids of every topic of one project database.
+
+    Parameters
+    ----------
+    db_wrap : DataBaseWrap
+        Connected project database.
+    persist : bool
+        Store pyramids next to the .db file and reuse them when still up to date.
+    """
+
+    BUCKET = 64        # samples per level-0 bucket
+    TILE = 1024        # buckets per tile
+    CHUNK = 65536      # rows fetched per database round-trip while building
+    MAX_TILES = 256    # tiles kept in the LRU
+
+    def __init__(self, db_wrap: DataBaseWrap, persist: bool = True) -> None:
+        self.db = db_wrap
+        self.persist = persist
+        self.folder = f"{db_wrap.db_file_path}.lod" if persist else None
+
+        self.meta: Dict[str, Dict[str, float]] = {}
+        self.levels: Dict[str, List[np.ndarray]] = {}  # topic -> level arrays (in memory or mmap)
+        self._tiles: "OrderedDict[Tuple[str, int, int], np.ndarray]" = OrderedDict()
+
+    # ── Build ──────────────────────────────────────────────────────────────────
+
+    def build(self) -> List[str]:
+        """
+        Build pyramids for topics that are new or changed since the last build.
+
+        Returns
+        -------
+        list[str]
+            Topics available for browsing.
+        """
+        with self.db.get_session() as session:
+            stats = session.execute(
+                select(Sample.topic, func.count(Sample.sample_key), func.max(Sample.time)).group_by(Sample.topic)
+            ).all()
+
+            stored = self._load_meta()
+            for topic, count, t_last in stats:
+                if count < 1:
+                    continue
+                info = {"count": int(count), "t_last": float(t_last)}
+                old = stored.get(topic)
+                if old and old["count"] == info["count"] and old["t_last"] == info["t_last"] and self._load_levels(topic, old["levels"]):
+                    self.meta[topic] = old
+                    continue
+
+                levels = self._build_topic(session, topic)
+                info["levels"] = len(levels)
+                self.meta[topic] = info
+                self.levels[topic] = levels
+                self._drop_tiles(topic)
+                if self.persist:
+                    self._save_levels(topic, levels)
+
+        if self.persist:
+            self._save_meta()
+        return sorted(self.meta)
+
+    def _build_topic(self, session, topic: str) -> List[np.ndarray]:
+        """Stream one topic in time order into level 0, then merge upward."""
+        result = session.execute(select(Sample.time, Sample.value).where(Sample.topic == topic).order_by(Sample.time))
+
+        blocks = []
+        carry = np.empty((0, 2), dtype=np.float64)
+        while True:
+            rows = result.fetchmany(self.CHUNK)
+            if not rows:
+                break
+            data = np.concatenate((carry, np.asarray(rows, dtype=np.float64)))
+            full = (data.shape[0] // self.BUCKET) * self.BUCKET
+            if full:
+                blocks.append(self._reduce(data[:full], self.BUCKET))
+            carry = data[full:]
+        if carry.shape[0]:
+            blocks.append(self._reduce(carry, carry.shape[0]))
+
+        levels = [np.concatenate(blocks, axis=1)]
+        while levels[-1].shape[1] > self.TILE:
+            levels.append(self._merge(levels[-1]))
+        return levels
+
+    @staticmethod
+    def _reduce(data: np.ndarray, size: int) -> np.ndarray:
+        """(n, 2) [time, value] samples -> (6, n/size) buckets."""
+        t = data[:, 0].reshape(-1, size)
+        y = data[:, 1].reshape(-1, size)
+        rows = np.arange(t.shape[0])
+        i_lo = y.argmin(axis=1)
+        i_hi = y.argmax(axis=1)
+        return np.vstack((t[:, 0], t[:, -1], t[rows, i_lo], y[rows, i_lo], t[rows, i_hi], y[rows, i_hi]))
+
+    @staticmethod
+    def _merge(level: np.ndarray) -> np.ndarray:
+        """Merge bucket pairs of one level into the next one."""
+        m = level.shape[1]
+        pairs = m // 2
+        a = level[:, 0 : 2 * pairs : 2]
+        b = level[:, 1 : 2 * pairs : 2]
+
+        out = np.empty((6, pairs + m % 2), dtype=np.float64)
+        out[0, :pairs] = a[0]
+        out[1, :pairs] = b[1]
+        lo_b = b[3] < a[3]
+        out[2, :pairs] = np.where(lo_b, b[2], a[2])
+        out[3, :pairs] = np.where(lo_b, b[3], a[3])
+        hi_b = b[5] > a[5]
+        out[4, :pairs] = np.where(hi_b, b[4], a[4])
+        out[5, :pairs] = np.where(hi_b, b[5], a[5])
+        if m % 2:
+            out[:, -1] = level[:, -1]
+        return out
+
+    # ── Fetch ──────────────────────────────────────────────────────────────────
+
+    def time_span(self) -> Optional[Tuple[float, float]]:
+        """First and last sample time over all topics (None if nothing was built)."""
+        if not self.levels:
+            return None
+        t_first = min(levels[0][0, 0] for levels in self.levels.values())
+        t_last = max(levels[0][1, -1] for levels in self.levels.values())
+        return float(t_first), float(t_last)
+
+    def fetch(self, topic: str, x0: float, x1: float, n_pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (t, y) covering [x0, x1] with about 2 points per pixel.
+
+        The level is the finest one with at most `n_pixels` buckets in range; raw samples
+        are read from the database when even level 0 would be too coarse.
+        """
+        levels = self.levels.get(topic)
+        if not levels:
+            return np.empty(0), np.empty(0)
+
+        base = levels[0]
+        i0, i1 = self._bucket_range(base, x0, x1)
+        if (i1 - i0) * self.BUCKET <= 2 * n_pixels:
+            return self._fetch_raw(topic, x0, x1)
+
+        level = 0
+        while level + 1 < len(levels) and (i1 - i0) > n_pixels:
+            level += 1
+            i0, i1 = self._bucket_range(levels[level], x0, x1)
+
+        buckets = self._read(topic, level, i0, i1)
+        # Interleave min/max of each bucket in time order
+        lo_first = buckets[2] <= buckets[4]
+        t = np.empty(2 * buckets.shape[1])
+        y = np.empty(2 * buckets.shape[1])
+        t[0::2] = np.where(lo_first, buckets[2], buckets[4])
+        y[0::2] = np.where(lo_first, buckets[3], buckets[5])
+        t[1::2] = np.where(lo_first, buckets[4], buckets[2])
+        y[1::2] = np.where(lo_first, buckets[5], buckets[3])
+        return t, y
+
+    @staticmethod
+    def _bucket_range(level: np.ndarray, x0: float, x1: float) -> Tuple[int, int]:
+        """Buckets overlapping [x0, x1], plus one on each side so the line reaches the border."""
+        i0 = max(int(np.searchsorted(level[1], x0, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(level[0], x1, side="right")) + 1, level.shape[1])
+        return i0, i1
+
+    def _read(self, topic: str, level: int, i0: int, i1: int) -> np.ndarray:
+        """Assemble buckets [i0, i1) of a level from its tiles."""
+        parts = []
+        for tile in range(i0 // self.TILE, (i1 - 1) // self.TILE + 1):
+            data = self._tile(topic, level, tile)
+            start = tile * self.TILE
+            parts.append(data[:, max(i0 - start, 0) : i1 - start])
+        return np.concatenate(parts, axis=1) if len(parts) > 1 else parts[0]
+
+    def _tile(self, topic: str, level: int, tile: int) -> np.ndarray:
+        key = (topic, level, tile)
+        data = self._tiles.get(key)
+        if data is None:
+            start = tile * self.TILE
+            data = np.array(self.levels[topic][level][:, start : start + self.TILE])  # copy out of the mmap
+            self._tiles[key] = data
+            if len(self._tiles) > self.MAX_TILES:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+        return data
+
+    def _drop_tiles(self, topic: str) -> None:
+        for key in [k for k in self._tiles if k[0] == topic]:
+            del self._tiles[key]
+
+    def _fetch_raw(self, topic: str, x0: float, x1: float) -> Tuple[np.ndarray, np.ndarray]:
+        with self.db.get_session() as session:
+            rows = session.execute(
+                select(Sample.time, Sample.value)
+                .where(Sample.topic == topic, Sample.time >= x0, Sample.time <= x1)
+                .order_by(Sample.time)
+            ).all()
+        if not rows:
+            return np.empty(0), np.empty(0)
+        data = np.asarray(rows, dtype=np.float64)
+        return data[:, 0], data[:, 1]
+
+    # ── Persistence ────────────────────────────────────────────────────────────
+
+    def _file(self, topic: str, level: int) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", topic)
+        return os.path.join(self.folder, f"{safe}_L{level}.npy")
+
+    def _load_meta(self) -> Dict[str, Dict[str, float]]:
+        if not self.persist:
+            return {}
+        try:
+            with open(os.path.join(self.folder, "meta.json"), "r") as json_file:
+                return json.load(json_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, "meta.json"), "w") as json_file:
+            json.dump(self.meta, json_file)
+
+    def _load_levels(self, topic: str, nb_levels: int) -> bool:
+        try:
+            self.levels[topic] = [np.load(self._file(topic, k), mmap_mode="r") for k in range(nb_levels)]
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _save_levels(self, topic: str, levels: List[np.ndarray]) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        for k, level in enumerate(levels):
+            np.save(self._file(topic, k), level)
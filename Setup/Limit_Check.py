@@ -2,8 +2,12 @@
 Data validation utility that checks values against predefined limits with color-coded status indicators.
 It returns a dictionary which contains the result of the check, including
 status messages (Good, Fail, Warning, etc.) and colors based on the results of these checks.
+The array form checks a whole value matrix against per-channel limit vectors at once and
+returns int8 levels (same codes as the `warning` integer keys).
 """
 
+import numpy as np
+
 class LimitCheck:
     """Class for checking data against predefined limits and managing associated states."""
     
@@ -91,3 +95,38 @@ class LimitCheck:
 
         return self.test_status[value]
 
+    # ── Array form (all channels at once) ─────────────────────────────────────
+
+    def limit_vectors(self, lim_list):
+        """Stack per-channel {"LL","L","H","HH"} dicts into a (4, channels) array [LL, L, H, HH]."""
+        return np.array([[lim["LL"], lim["L"], lim["H"], lim["HH"]] for lim in lim_list], dtype=float).T
+
+    def level_check_array(self, values, limits):
+        """
+        Vectorized level_check over a value matrix.
+
+        values : (..., channels) array, NaN for missing values
+        limits : (4, channels) array [LL, L, H, HH] (see limit_vectors)
+
+        Returns an int8 array of levels: 3 HH, 2 H, -3 LL, -2 L, 1 pass, 0 NA.
+        The checks keep the priority of level_check (HH, H, LL, L).
+        """
+        values = np.asarray(values, dtype=float)
+        LL, L, H, HH = np.asarray(limits, dtype=float)
+        conditions = [np.isnan(values), values > HH, values > H, values < LL, values < L]
+        return np.select(conditions, [0, 3, 2, -3, -2], default=1).astype(np.int8)
+
+    def changed_levels(self, levels, previous=None):
+        """
+        Warning details only for the cells whose level differs from `previous`.
+
+        Returns a list of (index, warning dict); index is an int for 1-D arrays, a tuple otherwise.
+        With previous=None every cell is returned (first display).
+        """
+        levels = np.asarray(levels)
+        changed = np.ones(levels.shape, dtype=bool) if previous is None else levels != previous
+        result = []
+        for index in np.argwhere(changed):
+            key = int(index[0]) if levels.ndim == 1 else tuple(int(i) for i in index)
+            result.append((key, self.warning[int(levels[key])]))
+        return result
@@ -2,9 +2,9 @@
 A linear buffer with also ring buffer capabilities for real-time data storage and time-based data retrieval.
 Provides efficient data buffering capabilities with support for multi-channel data streams, automatic
 time indexing, and sliding window operations.
+The ring holds any number of channels (e.g. all 24 RTD + 6 ADC channels) in a single array.
 """
 
-from dvg_ringbuffer import RingBuffer
 import numpy as np
 
 
@@ -34,36 +34,35 @@ class LinearBuffer:
 
         self.log_index = 0  # log index is the index of the total number of values that has been entered, it keeps going up even after crossing the ringbuffer boundary
         self.index_correction = 0
-        self.rb_array = np.zeros((self.size_line, self.ring), dtype=float)  # numpy array that will store the data
         self.previous_start_index = 0
         self.rb_array_slice = np.zeros((self.size_line, self.ring), dtype=float)  # numpy array that will store the data
 
         # Ring Buffer
-        self.rbX = RingBuffer(self.ring, dtype=np.float32, allow_overwrite=True)  # ring buffer for time
-        self.rbA0 = RingBuffer(self.ring, dtype=np.float32, allow_overwrite=True)  # ring buffer for channel 1
-        self.rbA1 = RingBuffer(self.ring, dtype=np.float32, allow_overwrite=True)  # ring buffer for channel 2
-
-    #       self.rbX.extend(np.arange(0,self.ring*self.dt,self.dt,dtype=np.float32))
-    #       self.rbA0.extend(np.zeros((self.ring,),dtype=np.float32))
-    #       self.rbA1.extend(np.zeros((self.ring,),dtype=np.float32))
+        # Time and every channel share one (size_line, ring) block written in place at `rb_head`.
+        # A contiguous copy (rb_array) is only built when it is requested and the data wraps.
+        self.rb_data = np.zeros((self.size_line, self.ring), dtype=float)  # row 0: time, rows 1..nb_lines: channels
+        self.rb_head = 0  # next write position in [0, ring)
+        self.rb_count = 0  # number of valid samples in the ring (<= ring)
+        self._rb_snapshot = np.zeros((self.size_line, self.ring), dtype=float)  # backing store of the unwrapped copy
+        self._rb_snapshot_valid = False  # True while _rb_snapshot matches the ring
 
     # Clear the buffer
     def clear(self):
         self.log_index = 0
         self.previous_start_index = 0
         self.index_correction = 0
-        self.rbX.clear()
-        self.rbA0.clear()
-        self.rbA1.clear()
+        self.rb_head = 0
+        self.rb_count = 0
+        self._rb_snapshot_valid = False
 
     # Clear the buffer (identical to the above function??)
     def clear_full(self):
         self.log_index = 0
         self.previous_start_index = 0
         self.index_correction = 0
-        self.rbX.clear()
-        self.rbA0.clear()
-        self.rbA1.clear()
+        self.rb_head = 0
+        self.rb_count = 0
+        self._rb_snapshot_valid = False
 
     # Append data to the buffer
     def append_full_data(self, VA_input):
@@ -73,80 +72,102 @@ class LinearBuffer:
 
         self.np_slice = self.np_array[:, 0 : self.log_index]  # update the slice of the buffer
 
+    # Write a (size_line, k) block [time, channels...] into the ring, O(k)
+    def _rb_extend(self, block):
+        length = block.shape[-1]
+        if length > self.ring:  # only the newest `ring` samples can be kept
+            block = block[:, -self.ring :]
+            length = self.ring
+
+        first = min(length, self.ring - self.rb_head)  # samples that fit before the end of the ring
+        self.rb_data[:, self.rb_head : self.rb_head + first] = block[:, :first]
+        self.rb_data[:, : length - first] = block[:, first:]  # wrapped part, if any
+
+        self.rb_head = (self.rb_head + length) % self.ring
+        self.rb_count = min(self.rb_count + length, self.ring)
+        self._rb_snapshot_valid = False
+
+    # Start position of the oldest sample in the ring
+    def _rb_start(self):
+        return (self.rb_head - self.rb_count) % self.ring
+
+    # Contiguous (size_line, rb_count) array of the ring, oldest sample first
+    @property
+    def rb_array(self):
+        start = self._rb_start()
+        if start + self.rb_count <= self.ring:
+            return self.rb_data[:, start : start + self.rb_count]  # not wrapped: view, no copy
+
+        if not self._rb_snapshot_valid:
+            older = self.ring - start
+            self._rb_snapshot[:, :older] = self.rb_data[:, start:]
+            self._rb_snapshot[:, older:] = self.rb_data[:, : self.rb_head]
+            self._rb_snapshot_valid = True
+        return self._rb_snapshot
+
     # Append data to the buffer with the time based on the time step
     def RT_append_data(self, VA_input):  # append data to the buffer in real time?
         lengthVA = VA_input.shape[-1]  # length of the input
         if lengthVA < 1:
             return
-        if len(self.rbX) < 1:
+        if self.rb_count < 1:
             start_x = 0
         else:
-            start_x = self.rbX[-1] + self.dt
-
-        stop_x = start_x + (lengthVA - 1) * self.dt
+            start_x = self.rb_data[0, self.rb_head - 1] + self.dt
 
         self.log_index = self.log_index + lengthVA  # update the index
 
-        self.rbX.extend(np.linspace(start_x, stop_x, num=lengthVA, dtype=np.float32))  # append the time to the buffer
+        block = np.empty((self.size_line, lengthVA), dtype=float)
+        block[0] = start_x + np.arange(lengthVA) * self.dt  # time of the new samples
+        block[1:] = VA_input[: self.size_line - 1, :]  # channel data
+        self._rb_extend(block)
 
-        self.rbA0.extend(VA_input[0, :])  # append the data to the buffer
-        self.rbA1.extend(VA_input[1, :])  # append the data to the buffer
-        try:
-            self.rb_array = np.array([self.rbX[:], self.rbA0[:], self.rbA1[:]])  # update the slice of the buffer
-        except:
-            print("error")
-
-    # Append the data to the buffer including the time
+    # Append the data to the buffer including the time (time must be monotonic)
     def RT_append_full_data(self, VA_input):
 
         self.log_index = self.log_index + VA_input.shape[-1]  # update the index
 
-        self.rbX.extend(VA_input[0, :])  # append the time to the buffer
-        self.rbA0.extend(VA_input[1, :])  # append the data to the buffer
-        self.rbA1.extend(VA_input[2, :])  # append the data to the buffer
-        self.rb_array = np.array([self.rbX[:], self.rbA0[:], self.rbA1[:]])  # update the slice of the buffer
+        self._rb_extend(VA_input[: self.size_line, :])  # append time and data to the buffer
 
     # return the last numbers of data from the ring buffer. The number of points returned is the "start"
     def slice_data(self, start):
 
         index_start = self.log_index - start
-        return np.array([np.array(self.rbX[-index_start:]), np.array(self.rbA0[-index_start:]), np.array(self.rbA1[-index_start:])])  # update the slice of the buffer
+        return self.rb_array[:, -index_start:]
 
     def rb_array_time(self, time_length):
-        # Convert the ring buffers to numpy arrays for easier slicing
-
-        time_array = np.array(self.rbX[:])
-
-        ### load the previous start index (the next one should be close )
-        previous_start_index = self.previous_start_index
-
-        # Find the index where the time difference is greater than or equal to the time_length
-        current_time = time_array[-1]  # The time of the last element in the ring buffer
-        start_time = current_time - time_length  # The time of the first element in the 30 second slice
-
-        # Find the index where time is greater than or equal to start_time
-        indices = np.where(time_array >= start_time)[0]
-
-        # Check if the time at the current `previous_start_index` is still within the desired time range
-        if time_array[previous_start_index] < start_time:
-            # If the current `previous_start_index` is too far in the past, search forward from this point
-            indices = np.where(time_array[previous_start_index:] >= start_time)[0]
-            if len(indices) == 0:
-                return None  # No data for the given time length
-            previous_start_index += indices[0]  # Adjust the `start_index` based on the search
+        """
+        Return a (size_line, N) array [time, channels...] holding the last `time_length` of data.
+
+        The time row is monotonic inside each of the two ring segments, so the window start is
+        found with a binary search (O(log n)). When the window lies in one segment the result is a
+        view of the ring, valid until the next append; when it crosses the wrap, only the window is
+        copied (O(window), not O(ring)).
+        """
+        if self.rb_count < 1:
+            return None  # No data for the given time length
+
+        start = self._rb_start()
+        newest = self.rb_data[0, self.rb_head - 1]
+        start_time = newest - time_length  # The time of the first element in the slice
+
+        if start + self.rb_count <= self.ring:
+            # Not wrapped: one contiguous segment
+            time_array = self.rb_data[0, start : start + self.rb_count]
+            start_index = int(np.searchsorted(time_array, start_time, side="left"))
+            self.rb_array_slice = self.rb_data[:, start + start_index : start + self.rb_count]
         else:
-            # If `start_index` is already within or too far into the future, search backward
-            while previous_start_index > 0 and time_array[previous_start_index] > start_time:
-                previous_start_index -= 1
-
-            # Ensure that the `start_index` is the first one meeting the condition
-            if time_array[previous_start_index] < start_time:
-                previous_start_index += 1
-
-        # Return the array in the same format as self.rb_array
-        self.rb_array_slice = np.array([np.array(self.rbX[previous_start_index:]), np.array(self.rbA0[previous_start_index:]), np.array(self.rbA1[previous_start_index:])])
-
-        # Update the `previous_start_index` for future calls
-        self.previous_start_index = previous_start_index
+            # Wrapped: older segment [start, ring) then newer segment [0, rb_head)
+            older = self.ring - start
+            if self.rb_data[0, self.ring - 1] < start_time:
+                # Window lies entirely in the newer segment: view
+                start_index = older + int(np.searchsorted(self.rb_data[0, : self.rb_head], start_time, side="left"))
+                self.rb_array_slice = self.rb_data[:, start_index - older : self.rb_head]
+            else:
+                start_index = int(np.searchsorted(self.rb_data[0, start:], start_time, side="left"))
+                # Window crosses the wrap: copy just the window
+                self.rb_array_slice = np.concatenate((self.rb_data[:, start + start_index :], self.rb_data[:, : self.rb_head]), axis=1)
+
+        self.previous_start_index = start_index
 
         return self.rb_array_slice
@@ -0,0 +1,224 @@
+"""
+Module: Setup/Metrics.py
+
+Purpose
+-------
+Hot-path instrumentation shared by the driver and GUI processes:
+- monotonic counters (datagrams, frames, queue batches, samples, commits...)
+- HDR-style latency histograms (log-linear buckets, ~12 % resolution, 1 ns .. 18 min)
+
+One block of shared memory holds a section per process role ("driver", "gui");
+each section is written by its own process only (no locks), any process reads all.
+Recording is a few integer operations on a memoryview (~0.3 us per counter,
+~1.2 us per histogram value), so hooks are placed per batch / per call, never per sample.
+
+Usage
+-----
+launcher : block = Metrics.create()       # before starting the processes (sets METRICS_ENV)
+child    : metrics = init_metrics("gui")  # attaches to the launcher block
+anywhere : metrics = get_metrics()        # process-wide instance (private memory if none attached)
+           metrics.count("queue_sent")
+           metrics.record("refresh_ns", time.perf_counter_ns() - t0)
+           metrics.snapshot() / metrics.export(path)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+METRICS_ENV = "TEMP_LOGGING_METRICS"  # shared memory name, inherited by the child processes
+
+ROLES = ("driver", "gui")
+COUNTERS = (
+    "datagrams",  # driver: receives (datagrams or serial chunks)
+    "bytes",
+    "frames",  # valid PPP frames
+    "bad_frames",  # length / CRC errors
+    "unknown_cmd",  # messages with a CMD byte missing from the command table (skipped)
+    "values",  # routed samples
+    "queue_sent",  # JSON_Q messages sent
+    "queue_full",  # JSON_Q sends refused (queue full)
+    "queue_received",  # JSON_Q messages received
+    "samples",  # gui: samples taken from the queue
+    "db_commits",
+    "db_rows",
+    "db_errors",
+)
+HISTOGRAMS = (
+    "decode_ns",  # driver: PPP decoding of one receive
+    "driver_step_ns",  # driver: receive -> decode -> route -> sink of one receive
+    "queue_latency_ns",  # gui: driver receive -> GUI dequeue (batching + transfer)
+    "refresh_ns",  # gui: one refresh_display call
+    "plot_ns",  # gui: graph update inside refresh_display
+    "db_commit_ns",  # gui: one database_write transaction
+)
+
+SUB_BITS = 3  # 8 sub-buckets per power of two
+BUCKETS = 320  # covers values up to 2**40 ns
+HIST_HEADER = 3  # count, sum, max
+HIST_SIZE = HIST_HEADER + BUCKETS
+ROLE_SIZE = len(COUNTERS) + len(HISTOGRAMS) * HIST_SIZE
+
+
+def bucket_of(value: int) -> int:
+    """Log-linear bucket index (exact below 16)."""
+    if value < 16:
+        return value if value > 0 else 0
+    shift = value.bit_length() - (SUB_BITS + 1)
+    index = (shift << SUB_BITS) + (value >> shift)
+    return index if index < BUCKETS else BUCKETS - 1
+
+
+def _bucket_values() -> np.ndarray:
+    """Representative (middle) value of every bucket, for percentiles."""
+    values = np.zeros(BUCKETS)
+    for index in range(BUCKETS):
+        if index < 16:
+            values[index] = index
+        else:
+            shift = (index >> SUB_BITS) - 1
+            top = index - (shift << SUB_BITS)
+            values[index] = (top << shift) + (1 << shift) / 2
+    return values
+
+
+BUCKET_VALUES = _bucket_values()
+
+
+class Metrics:
+    """
+    Counters and histograms of every role, over shared (or private) memory.
+
+    Parameters
+    ----------
+    role : str
+        Section written by this process ("driver" or "gui").
+    name : str, optional
+        Shared memory block to attach to; None = private memory (single process).
+    """
+
+    def __init__(self, role: str = "gui", name: Optional[str] = None) -> None:
+        self.role = role
+        self.shm = None
+        if name is None:
+            buffer = bytearray(len(ROLES) * ROLE_SIZE * 8)
+        else:
+            # Children share the launcher's resource tracker: attaching does not add a
+            # second registration, and the block is unlinked once, by the launcher
+            self.shm = shared_memory.SharedMemory(name=name)
+            buffer = self.shm.buf
+        self.data = np.ndarray((len(ROLES), ROLE_SIZE), dtype=np.int64, buffer=buffer)  # reading
+
+        # Recording goes through a plain int64 memoryview of this role's section:
+        # item access is several times cheaper than on a NumPy array
+        offset = ROLES.index(role) * ROLE_SIZE
+        self._section = memoryview(buffer).cast("q")[offset : offset + ROLE_SIZE]
+        self._counter_index = {counter: i for i, counter in enumerate(COUNTERS)}
+        self._hist_index = {histogram: len(COUNTERS) + i * HIST_SIZE for i, histogram in enumerate(HISTOGRAMS)}
+        self._t_snapshot = time.perf_counter()
+        self._previous = None
+
+    @classmethod
+    def create(cls) -> shared_memory.SharedMemory:
+        """Launcher: allocate the zeroed block and publish its name to the child processes."""
+        shm = shared_memory.SharedMemory(create=True, size=len(ROLES) * ROLE_SIZE * 8)
+        np.ndarray((len(ROLES), ROLE_SIZE), dtype=np.int64, buffer=shm.buf)[:] = 0
+        os.environ[METRICS_ENV] = shm.name
+        return shm
+
+    # ── Recording (hot path) ────────────────────────────────────────────────────
+
+    def count(self, counter: str, n: int = 1) -> None:
+        self._section[self._counter_index[counter]] += n
+
+    def record(self, histogram: str, value_ns: int) -> None:
+        base = self._hist_index[histogram]
+        section = self._section
+        section[base] += 1
+        section[base + 1] += value_ns
+        if value_ns > section[base + 2]:
+            section[base + 2] = value_ns
+        section[base + HIST_HEADER + bucket_of(value_ns)] += 1
+
+    # ── Reading ─────────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        {role: {"counters": {name: {"total", "rate_s"}}, "histograms": {name: {"count", "mean_us", "p50_us", "p99_us", "max_us"}}}}
+
+        Rates are per second since the previous snapshot of this instance.
+        """
+        data = self.data.copy()
+        now = time.perf_counter()
+        elapsed = max(now - self._t_snapshot, 1e-9)
+        previous = self._previous if self._previous is not None else np.zeros_like(data)
+        self._t_snapshot, self._previous = now, data
+
+        result = {}
+        for r, role in enumerate(ROLES):
+            row = data[r]
+            counters = {counter: {"total": int(row[i]), "rate_s": float(row[i] - previous[r, i]) / elapsed} for i, counter in enumerate(COUNTERS)}
+            histograms = {}
+            for histogram, base in self._hist_index.items():
+                count, total, maximum = (int(x) for x in row[base : base + HIST_HEADER])
+                buckets = row[base + HIST_HEADER : base + HIST_SIZE]
+                histograms[histogram] = {
+                    "count": count,
+                    "mean_us": total / count / 1e3 if count else 0.0,
+                    "p50_us": percentile(buckets, 50) / 1e3,
+                    "p99_us": percentile(buckets, 99) / 1e3,
+                    "max_us": maximum / 1e3,
+                }
+            result[role] = {"counters": counters, "histograms": histograms}
+        return result
+
+    def export(self, path: str) -> None:
+        """Write a snapshot (and the raw buckets, to merge or re-plot later) as JSON."""
+        snapshot = self.snapshot()
+        raw = {role: {histogram: self.data[r, base + HIST_HEADER : base + HIST_SIZE].tolist() for histogram, base in self._hist_index.items()} for r, role in enumerate(ROLES)}
+        with open(path, "w") as json_file:
+            json.dump({"date": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": snapshot, "buckets": raw, "sub_bits": SUB_BITS}, json_file, indent=2)
+
+    def close(self) -> None:
+        if self.shm is not None:
+            self.data = None
+            self._section.release()
+            self._section = None
+            self.shm.close()
+            self.shm = None
+
+
+def percentile(buckets: np.ndarray, q: float) -> float:
+    total = buckets.sum()
+    if total == 0:
+        return 0.0
+    index = int(np.searchsorted(np.cumsum(buckets), total * q / 100.0))
+    return float(BUCKET_VALUES[min(index, BUCKETS - 1)])
+
+
+_metrics: Optional[Metrics] = None
+
+
+def init_metrics(role: str) -> Metrics:
+    """Process start: attach this process's role to the launcher block (private memory without launcher)."""
+    global _metrics
+    name = os.environ.get(METRICS_ENV)
+    try:
+        _metrics = Metrics(role, name)
+    except FileNotFoundError:
+        _metrics = Metrics(role)
+    return _metrics
+
+
+def get_metrics() -> Metrics:
+    """Instance of the current process (private "gui" section when init_metrics was not called)."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
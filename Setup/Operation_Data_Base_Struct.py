@@ -103,6 +103,28 @@ class Operation_Data_Base_Struct:
         self.data_base["Live_SBO"]["Result"]["CAL_ST"].update({"val":None})
         self.data_base["Live_SBO"]["Result"]["PICO"].update({"val":None})
         self.data_base["Live_SBO"]["Result"]["SSR_ST"].update({"val":None})
+
+
+        #initialize the live alarm data base (thresholds of the streaming alarm stage)
+        # "default" applies per channel group (RTD, ADC1 = 5v rail, ADC2 = battery), "channels" overrides single topics
+        # hyst: hysteresis band to leave a level, debounce_s: minimum duration before a level change, rate_max: max |dV/dt| per second
+        self.data_base.update({"Alarm":{}})
+        self.data_base["Alarm"].update({"default":{}})
+        self.data_base["Alarm"]["default"].update({"RTD":{"unit": "C","LL": -20,"L": -10,"H": 80,"HH": 100,"hyst": 1.0,"debounce_s": 2.0,"rate_max": 5.0}})
+        self.data_base["Alarm"]["default"].update({"ADC1":{"unit": "V","LL": 4.5,"L": 4.75,"H": 5.25,"HH": 5.5,"hyst": 0.05,"debounce_s": 1.0,"rate_max": 1.0}})
+        self.data_base["Alarm"]["default"].update({"ADC2":{"unit": "V","LL": 3.0,"L": 3.3,"H": 4.3,"HH": 4.5,"hyst": 0.05,"debounce_s": 5.0,"rate_max": 1.0}})
+        self.data_base["Alarm"].update({"channels":{}})
+
+        #initialize the driver data base (MCU link of the driver process, see Driver/Driver_Core.py)
+        # transport: "udp" (RJ45), "serial" (USB) or "replay" (capture files); flush_ms/batch_max: batching of the samples sent to the GUI
+        self.data_base.update({"Driver":{}})
+        self.data_base["Driver"].update({"transport":"udp"})
+        self.data_base["Driver"].update({"udp":{"host_port": 8888,"mcu_ip": None,"mcu_port": None,"recv_size": 2048}})
+        self.data_base["Driver"]["udp"].update({"capture":{"enabled": True,"directory": "Capture","max_bytes": 67108864,"max_files": 50}})  # raw datagram recorder (rotating files), on by default
+        self.data_base["Driver"].update({"serial":{"vid": 11914,"pid": None,"baudrate": 921600}})
+        self.data_base["Driver"].update({"replay":{"paths": [],"speed": 1.0,"loop": False}})  # capture files (glob), speed 0 = as fast as possible
+        self.data_base["Driver"].update({"flush_ms":20})
+        self.data_base["Driver"].update({"batch_max":256})
    
 
 
@@ -82,6 +82,26 @@ class Operation_JSON_Loader:
 
         return data_base
 
+    def Load_Alarm(self):
+        """
+        Loads only the "Alarm" section of the Operation database (live channel thresholds).
+        Does not need the SN list nor the OPCheck config files.
+        """
+        root_path = rooth_path_finder()
+        Database_file_path = os.path.join(root_path, "Setup/Operation_database.json")
+        with open(Database_file_path, "r") as json_file:
+            return json.load(json_file)["Alarm"]
+
+    def Load_Driver(self):
+        """
+        Loads only the "Driver" section of the Operation database (MCU transport and batching).
+        Used by the driver process, which has no GUI configuration.
+        """
+        root_path = rooth_path_finder()
+        Database_file_path = os.path.join(root_path, "Setup/Operation_database.json")
+        with open(Database_file_path, "r") as json_file:
+            return json.load(json_file)["Driver"]
+
     def find_latest_file_by_timestamp(self, directory, ending_str=".json"):
         """
         Finds the latest file in a directory matching a date and index pattern in the filename.
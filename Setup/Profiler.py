@@ -0,0 +1,182 @@
+"""
+Module: Setup/Profiler.py
+
+Purpose
+-------
+On-demand profiling of the driver and GUI processes, without code changes:
+- "sample"   : a background thread samples the stacks of every thread of the process
+               (default every 5 ms) and writes collapsed stacks, ready for flame graph
+               tools (flamegraph.pl, speedscope, inferno)
+- "cprofile" : cProfile on the process loop thread, written as a pstats file
+               (python -m pstats, snakeviz)
+
+One file per process and window: Profiles/<role>_<YYYY_MM_DD_HH_MM_SS>_<pid>.collapsed|.pstats
+
+Switching on
+------------
+environment : TEMP_LOGGING_PROFILE=<mode>[:<seconds>]   e.g. sample:60, cprofile
+              (read by init_profiler() at child start, profiles the first window)
+GUI         : Metrics dock -> Profile; the GUI profiles itself and sends
+              {"PROFILE": mode, "SECONDS": s} to the driver process
+
+The loop thread of each process calls poll() to close the window (cProfile must be
+stopped from the thread it profiles).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from Setup.Rooth_Path_Finder import rooth_path_finder
+
+PROFILE_ENV = "TEMP_LOGGING_PROFILE"
+MODES = ("sample", "cprofile")
+DEFAULT_SECONDS = 30
+
+
+class Profiler:
+    """
+    Parameters
+    ----------
+    role : str
+        Process role, used in the file names ("driver", "gui").
+    directory : str
+        Output folder (relative paths are below the project root).
+    interval_s : float
+        Sampling period of the "sample" mode.
+    """
+
+    def __init__(self, role: str = "gui", directory: str = "Profiles", interval_s: float = 0.005) -> None:
+        self.role = role
+        self.directory = directory if os.path.isabs(directory) else os.path.join(rooth_path_finder(), directory)
+        self.interval_s = interval_s
+
+        self.mode: Optional[str] = None  # None = not profiling
+        self.deadline = 0.0
+        self.started = ""
+        self._profile: Optional[cProfile.Profile] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stacks: Counter = Counter()
+        self.samples = 0
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    def start(self, mode: str, seconds: float = DEFAULT_SECONDS) -> bool:
+        """Open a profiling window (from the loop thread); False if one is already open or the mode is unknown."""
+        if self.active or mode not in MODES:
+            return False
+        self.mode = mode
+        self.deadline = time.perf_counter() + seconds
+        self.started = time.strftime("%Y_%m_%d_%H_%M_%S")
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._stacks = Counter()
+            self.samples = 0
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="Profiler_sampler", daemon=True)
+            self._thread.start()
+        print(f"Profiler ({self.role}): {mode} for {seconds:g} s")
+        return True
+
+    def start_from_env(self) -> bool:
+        """Start the window requested by PROFILE_ENV ("<mode>[:<seconds>]"), if any."""
+        value = os.environ.get(PROFILE_ENV, "").strip()
+        if not value:
+            return False
+        mode, _, seconds = value.partition(":")
+        try:
+            duration = float(seconds) if seconds else DEFAULT_SECONDS
+        except ValueError:
+            duration = DEFAULT_SECONDS
+        if mode not in MODES:
+            print(f"Profiler: unknown mode {mode!r} in {PROFILE_ENV} (expected one of {', '.join(MODES)})")
+            return False
+        return self.start(mode, duration)
+
+    def poll(self) -> Optional[str]:
+        """Loop thread: close the window once its time is up; returns the written file."""
+        if self.active and time.perf_counter() >= self.deadline:
+            return self.stop()
+        return None
+
+    def stop(self) -> Optional[str]:
+        """Close the window now and write its file (path returned, None if not profiling)."""
+        if not self.active:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{self.role}_{self.started}_{os.getpid()}")
+        try:
+            if self.mode == "cprofile":
+                self._profile.disable()
+                path = base + ".pstats"
+                self._profile.dump_stats(path)
+                self._profile = None
+            else:
+                self._stop_event.set()
+                self._thread.join(timeout=1)
+                self._thread = None
+                path = base + ".collapsed"
+                with open(path, "w") as collapsed:
+                    for stack, count in self._stacks.most_common():
+                        collapsed.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"Profiler ({self.role}): write error: {e}")
+            path = None
+        else:
+            print(f"Profiler ({self.role}): written {path}")
+        self.mode = None
+        return path
+
+    # ── Stack sampling ──────────────────────────────────────────────────────────
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        stacks = self._stacks
+        while not self._stop_event.wait(self.interval_s) and time.perf_counter() < self.deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        """thread;outer_function (file:line);...;inner_function (file:line)"""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        parts.append(thread_name)
+        return ";".join(reversed(parts))
+
+
+_profiler: Optional[Profiler] = None
+
+
+def init_profiler(role: str) -> Profiler:
+    """Process start: create the instance of this role and open the PROFILE_ENV window, if set."""
+    global _profiler
+    _profiler = Profiler(role)
+    _profiler.start_from_env()
+    return _profiler
+
+
+def get_profiler() -> Profiler:
+    """Instance of the current process (role "gui" when init_profiler was not called)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
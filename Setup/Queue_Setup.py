@@ -34,6 +34,10 @@ import pickle
 import multiprocessing as mp
 from typing import Any, Dict, Mapping
 
+from Setup.Metrics import get_metrics
+
+DRIVER_PORT = "RJ45_UDP"  # driver <-> GUI port (name kept for the GUI); here so the launcher needs no driver import
+
 
 # ── Group/Pair builders ─────────────────────────────────────────────────────────
 
@@ -155,6 +159,7 @@ class JSON_Q:
         self.JSON_in: Dict[str, Any] = {}
         self.JSON_out: Dict[str, Any] = {}
         self.NP_in: np.ndarray = np.empty((2, 50))  # placeholder
+        self.metrics = get_metrics()  # queue_sent / queue_full / queue_received counters of this process
 
     # ── Dict payloads ──────────────────────────────────────────────────────────
 
@@ -163,8 +168,10 @@ class JSON_Q:
         try:
             self.q_out.put_nowait(self.JSON_out)
         except Exception:
+            self.metrics.count("queue_full")
             return False
         else:
+            self.metrics.count("queue_sent")
             return True
 
     def isempty(self) -> bool:
@@ -218,6 +225,7 @@ class JSON_Q:
             return False
         else:
             self.JSON_in = buff
+            self.metrics.count("queue_received")
             return True
 
     # ── NumPy payloads (pickled) ───────────────────────────────────────────────
@@ -233,8 +241,10 @@ class JSON_Q:
         try:
             self.q_out.put_nowait(pickle.dumps(nump_array))
         except Exception:
+            self.metrics.count("queue_full")
             return False
         else:
+            self.metrics.count("queue_sent")
             return True
 
     def receive_last_NP(self) -> bool:
@@ -277,4 +287,5 @@ class JSON_Q:
             return False
         else:
             self.NP_in = pickle.loads(buff)
+            self.metrics.count("queue_received")
             return True
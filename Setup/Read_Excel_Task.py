@@ -2,6 +2,11 @@
 Excel data processing utility that converts configuration Excel files to JSON format for the BlueSoft system.
 Handles importing test limits, serial number lists, test settings, and default configurations from Excel
 spreadsheets and transforms them into structured JSON databases for runtime use.
+
+Each workbook is read once (all the sheets it needs in one read_excel call) and compiled
+to its nested dict with whole-column operations. The result is kept in "<workbook>.cache"
+next to the workbook, keyed by file mtime + size and content hash: an unchanged
+workbook is loaded from the cache in milliseconds, without pandas.
 """
 
 # ---------------------------------------------------------------------------
@@ -14,10 +19,13 @@ PACKAGES_DIR = os.path.join(rooth_path_finder(), "packages")
 if PACKAGES_DIR not in sys.path:
     sys.path.insert(0, PACKAGES_DIR)
 
+import hashlib
 import json
-import pandas as pd
 import os.path
+import pickle
+import tempfile
 
+CACHE_VERSION = 1  # bump when a compile_* method changes: cached results are then rebuilt
 
 
 class Read_Excel_Task:
@@ -39,88 +47,167 @@ class Read_Excel_Task:
         self.import_default_config()
         self.excel_dict()
 
+    ################################   compiled cache    ###########################
+    def compiled(self, relative_path, compiler, key=""):
+        """
+        Nested dict of one workbook: from "<workbook>.cache" when the workbook is unchanged
+        (same mtime and size, or same content hash after a copy/touch), else compiler(path).
+        `key` holds whatever else the result depends on (e.g. the sheets read).
+        """
+        path = os.path.join(rooth_path_finder(), relative_path)
+        cache_path = path + ".cache"
+        stat = os.stat(path)
+
+        cached = None
+        try:
+            with open(cache_path, "rb") as cache_file:
+                cached = pickle.load(cache_file)
+        except Exception:
+            pass  # no cache yet, or unreadable: rebuilt below
+        if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION or cached.get("key") != key:
+            cached = None
+
+        if cached is not None and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return cached["data"]
+
+        with open(path, "rb") as workbook:
+            digest = hashlib.sha1(workbook.read()).hexdigest()
+        if cached is not None and cached["sha1"] == digest:
+            data = cached["data"]
+        else:
+            print(f"Compiling {relative_path}")
+            data = compiler(path)
+
+        entry = {"version": CACHE_VERSION, "key": key, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest, "data": data}
+        try:
+            # Written next to the cache and renamed: a crash never leaves a half-written cache
+            with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(cache_path), delete=False) as temp_file:
+                pickle.dump(entry, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file.name, cache_path)
+        except OSError as e:
+            print(f"Excel cache not written for {relative_path}: {e}")
+        return data
+
+    ################################   workbook compilers    ###########################
+    def compile_limits(self, path):
+        """{tool type: {group: {item: {measure: {"unit", LL/L/H/HH: value}}}}} of Limits.xlsx."""
+        import numpy as np
+        import pandas as pd  # only when the workbook changed
+
+        table = pd.read_excel(path, header=None)
+        table.loc[0:3] = table.loc[0:3].ffill(axis=1)
+        table.loc[:, 0:3] = table.loc[:, 0:3].ffill(axis=0)
+
+        lastcolumn = table.shape[1] - 1
+        rows = table.iloc[2:]
+        values = rows.iloc[:, 3:lastcolumn].to_numpy(dtype=object)  # row-major, as the cells were read before
+        n_rows, n_cols = values.shape
+
+        limits = {}
+        for level1, level5, level2, level3, level4, unit, value in zip(
+            table.iloc[0, 3:lastcolumn].tolist() * n_rows,
+            table.iloc[1, 3:lastcolumn].tolist() * n_rows,
+            np.repeat(rows[0].to_numpy(dtype=object), n_cols).tolist(),
+            np.repeat(rows[1].to_numpy(dtype=object), n_cols).tolist(),
+            np.repeat(rows[2].to_numpy(dtype=object), n_cols).tolist(),
+            np.repeat(rows[lastcolumn].to_numpy(dtype=object), n_cols).tolist(),
+            values.ravel().tolist(),
+        ):
+            node = limits.setdefault(level1, {}).setdefault(level2, {}).setdefault(level3, {}).setdefault(level4, {})
+            node.setdefault("unit", unit)
+            node.setdefault(level5, value)
+        return limits
+
+    def compile_SN_list(self, path):
+        """{tool type: {item: {"nbofitem", "sn_col", "val_col", "SN_list": {serial: {column: value}}}}} of SN_list.xlsx."""
+        import pandas as pd  # only when the workbook changed
+
+        tables = pd.read_excel(path, header=None, sheet_name=self.SN_tooltype_list)  # every sheet in one read
+        SN = {}
+        for sheet in self.SN_tooltype_list:
+            table = tables[sheet]
+            table.loc[0:3] = table.loc[0:3].ffill(axis=1)
+            header = table.iloc[0:3].to_numpy(dtype=object)
+            for col, (level1, level2, level3) in enumerate(zip(*header)):
+                if level3 == "SN":
+                    node = SN.setdefault(level1, {}).setdefault(level2, {})
+                    node.setdefault("nbofitem", table[col].last_valid_index() - 2)
+                    node.setdefault("sn_col", col)
+                else:
+                    SN[level1][level2].setdefault("val_col", {level3: col})
+
+        for sheet in self.SN_tooltype_list:
+            table = tables[sheet]
+            for level2, node in SN[sheet].items():
+                rows = table.iloc[3 : node["nbofitem"] + 3]
+                columns = {level3: rows[col].tolist() for level3, col in node.get("val_col", {}).items()}
+                SN_list = node.setdefault("SN_list", {})
+                for row, serialnb in enumerate(rows[node["sn_col"]].tolist()):
+                    item = SN_list.setdefault(serialnb, {})
+                    for level3, values in columns.items():
+                        item.setdefault(level3, values[row])
+        return SN
+
+    def compile_test_setting(self, path):
+        """{tool type: {group: {item: {setting: value}} or {setting: value} for "skip" items}} of Test_setting.xlsx."""
+        import numpy as np
+        import pandas as pd  # only when the workbook changed
+
+        table = pd.read_excel(path, header=None).astype("object")
+        table.loc[0:0] = table.loc[0:0].ffill(axis=1)
+        table.loc[:, 0:1] = table.loc[:, 0:1].ffill(axis=0)
+
+        lastcolumn = table.shape[1] - 1
+        rows = table.iloc[1:]
+        values = rows.iloc[:, 3:lastcolumn].to_numpy(dtype=object)
+        n_rows, n_cols = values.shape
+
+        settings = {}
+        for level1, level2, level3, level4, value in zip(
+            [self.tool_type_conv(tool_type) for tool_type in table.iloc[0, 3:lastcolumn].tolist()] * n_rows,
+            np.repeat(rows[0].to_numpy(dtype=object), n_cols).tolist(),
+            np.repeat(rows[1].to_numpy(dtype=object), n_cols).tolist(),
+            np.repeat(rows[2].to_numpy(dtype=object), n_cols).tolist(),
+            values.ravel().tolist(),
+        ):
+            if level2 == "PSU" or level2 == "CUP" or level2 == "PWX":
+                value = self.convert_if_no_rounding(value)
+            node = settings.setdefault(level1, {}).setdefault(level2, {})
+            if not level3 == "skip":
+                node.setdefault(level3, {}).setdefault(level4, value)
+            else:
+                node.setdefault(level4, value)
+        return settings
+
+    def compile_default_config(self, path):
+        """{name: value} of Default_config.xlsx (last row wins for a repeated name)."""
+        import pandas as pd  # only when the workbook changed
+
+        table = pd.read_excel(path, header=None)
+        return dict(zip(table[0].tolist(), table[1].tolist()))
+
+    ################################   imports    ###########################
     def import_load_limits(self):
 
         try:
-            root_path = rooth_path_finder()
-            limit_raw_table = pd.read_excel(os.path.join(root_path, "Setup/Limits.xlsx"), header=None)
+            self.limit_dict.update(self.compiled("Setup/Limits.xlsx", self.compile_limits))
         except Exception as e:
             print(e)
             self.limit_dict["status"] = False
             return False
 
-        limit_raw_table.loc[0:3] = limit_raw_table.loc[0:3].ffill(axis=1)
-        limit_raw_table.loc[:, 0:3] = limit_raw_table.loc[:, 0:3].ffill(axis=0)
-
-        lastcolumn = limit_raw_table.shape[1] - 1
-        lastrow = limit_raw_table.shape[0]
-
-        for row in range(2, lastrow):  # firstrow-1,lastrow+1
-            for col in range(3, lastcolumn):  # firstcolum,lastcolum+1
-
-                level1 = limit_raw_table.loc[0, col]
-                level2 = limit_raw_table.loc[row, 0]
-                level3 = limit_raw_table.loc[row, 1]
-                level4 = limit_raw_table.loc[row, 2]
-                level5 = limit_raw_table.loc[1, col]
-                value = limit_raw_table.loc[row, col]
-                unit = limit_raw_table.loc[row, lastcolumn]
-
-                self.limit_dict.setdefault(level1, {})
-                self.limit_dict[level1].setdefault(level2, {})
-                self.limit_dict[level1][level2].setdefault(level3, {})
-                self.limit_dict[level1][level2][level3].setdefault(level4, {})
-                self.limit_dict[level1][level2][level3][level4].setdefault("unit", unit)
-                self.limit_dict[level1][level2][level3][level4].setdefault(level5, value)
-        root_path = rooth_path_finder()
-
         self.limit_dict["status"] = True
         return True
 
     def import_SN_list(self):
 
-        for sheet in self.SN_tooltype_list:  # firstrow,lastrow+1
-
-            try:
-                root_path = rooth_path_finder()
-                SN_raw_table = pd.read_excel(os.path.join(root_path, "Datafiles/SN_list.xlsx"), header=None, sheet_name=sheet)
-            except Exception as e:
-                print(e)
-                self.SN_dict["status"] = False
-                return False
-
-            SN_raw_table.loc[0:3] = SN_raw_table.loc[0:3].ffill(axis=1)
-
-            lastcolumn = SN_raw_table.shape[1]
-            for col in range(0, lastcolumn):
-                level1 = SN_raw_table.loc[0, col]
-                level2 = SN_raw_table.loc[1, col]
-                level3 = SN_raw_table.loc[2, col]
-
-                if level3 == "SN":
-                    self.SN_dict.setdefault(level1, {})
-                    self.SN_dict[level1].setdefault(level2, {})
-                    nb_of_sn = SN_raw_table.loc[:, col].last_valid_index() - 2
-                    self.SN_dict[level1][level2].setdefault("nbofitem", nb_of_sn)
-                    self.SN_dict[level1][level2].setdefault("sn_col", col)
-                else:
-
-                    self.SN_dict[level1][level2].setdefault("val_col", {level3: col})
+        try:
+            self.SN_dict.update(self.compiled("Datafiles/SN_list.xlsx", self.compile_SN_list, key="|".join(self.SN_tooltype_list)))
+        except Exception as e:
+            print(e)
+            self.SN_dict["status"] = False
+            return False
 
-        for sheet in self.SN_tooltype_list:
-            root_path = rooth_path_finder()  # firstrow,lastrow+1
-            SN_raw_table = pd.read_excel(os.path.join(root_path, "Datafiles/SN_list.xlsx"), header=None, sheet_name=sheet)
-            SN_raw_table.loc[0:3] = SN_raw_table.loc[0:3].ffill(axis=1)
-            level2_list = self.SN_dict[sheet].keys()
-            for level2 in level2_list:
-                self.SN_dict[sheet][level2].setdefault("SN_list", {})
-                for row_nb in range(3, self.SN_dict[sheet][level2]["nbofitem"] + 3):
-                    serialnb = SN_raw_table.loc[row_nb, self.SN_dict[sheet][level2]["sn_col"]]
-                    self.SN_dict[sheet][level2]["SN_list"].setdefault(serialnb, {})
-                    level3_list = self.SN_dict[level1][level2]["val_col"].keys()
-                    for level3 in level3_list:
-                        value = SN_raw_table.loc[row_nb, self.SN_dict[sheet][level2]["val_col"][level3]]
-                        self.SN_dict[sheet][level2]["SN_list"][serialnb].setdefault(level3, value)
         root_path = rooth_path_finder()
         with open(os.path.join(root_path, "Datafiles/SN.json"), "w") as outfile:
             json.dump(self.SN_dict, outfile)
@@ -130,42 +217,12 @@ class Read_Excel_Task:
     def import_test_setting(self):
 
         try:
-            root_path = rooth_path_finder()
-            limit_raw_table = pd.read_excel(os.path.join(root_path, "Datafiles/Test_setting.xlsx"), header=None)
+            self.test_setting_dict.update(self.compiled("Datafiles/Test_setting.xlsx", self.compile_test_setting))
         except Exception as e:
             print(e)
             self.test_setting_dict["status"] = False
             return False
 
-        limit_raw_table = limit_raw_table.astype("object")
-        limit_raw_table.loc[0:0] = limit_raw_table.loc[0:0].ffill(axis=1)
-        limit_raw_table.loc[:, 0:1] = limit_raw_table.loc[:, 0:1].ffill(axis=0)
-
-        lastcolumn = limit_raw_table.shape[1] - 1
-        lastrow = limit_raw_table.shape[0]
-
-        for row in range(1, lastrow):  # firstrow-1,lastrow+1
-            for col in range(3, lastcolumn):  # firstcolum,lastcolum+1
-
-                level1 = self.tool_type_conv(limit_raw_table.loc[0, col])
-                level2 = limit_raw_table.loc[row, 0]
-                level3 = limit_raw_table.loc[row, 1]
-                level4 = limit_raw_table.loc[row, 2]
-                value = limit_raw_table.loc[row, col]
-                if level2 == "PSU" or level2 == "CUP" or level2 == "PWX":
-                    value = self.convert_if_no_rounding(value)
-                self.test_setting_dict.setdefault(level1, {})
-                self.test_setting_dict[level1].setdefault(level2, {})
-
-                if not level3 == "skip":
-                    self.test_setting_dict[level1][level2].setdefault(level3, {})
-                    self.test_setting_dict[level1][level2][level3].setdefault(level4, value)
-
-                else:
-                    self.test_setting_dict.setdefault(level1, {})
-                    self.test_setting_dict[level1].setdefault(level2, {})
-                    self.test_setting_dict[level1][level2].setdefault(level4, value)
-
         root_path = rooth_path_finder()
         with open(os.path.join(root_path, "Datafiles/Test_setting.json"), "w") as outfile:
             json.dump(self.test_setting_dict, outfile)
@@ -201,8 +258,7 @@ class Read_Excel_Task:
     def import_default_config(self):
 
         try:
-            root_path = rooth_path_finder()
-            limit_raw_table = pd.read_excel(os.path.join(root_path, "Datafiles/Default_config.xlsx"), header=None)
+            self.default_config_dict.update(self.compiled("Datafiles/Default_config.xlsx", self.compile_default_config))
         except Exception as e:
             print(e)
 
@@ -210,14 +266,6 @@ class Read_Excel_Task:
 
             return False
 
-        lastrow = limit_raw_table.shape[0]
-
-        for row in range(0, lastrow):  # firstrow-1,lastrow+1
-            level1 = limit_raw_table.loc[row, 0]
-            value = limit_raw_table.loc[row, 1]
-            self.default_config_dict.setdefault(level1, {})
-            self.default_config_dict[level1] = value
-
         root_path = rooth_path_finder()
         with open(os.path.join(root_path, "Datafiles/default_config.json"), "w") as outfile:
             json.dump(self.default_config_dict, outfile)
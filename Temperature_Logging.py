@@ -8,24 +8,20 @@ PACKAGES_DIR = os.path.join(rooth_path_finder(), "packages")
 if PACKAGES_DIR not in sys.path:
     sys.path.insert(0, PACKAGES_DIR)
 
-# Now import GUI modules that depend on PyQt6
-from GUI.Main_Project.Main_Project import Main_Project
+# Launcher imports: process management only.
+# Each child imports what its role needs inside its target function: with the spawn
+# start method every child re-imports this module (see Benchmark/Import_Times.md).
 import multiprocessing as mp
-import logging
 import time
 import atexit
 import psutil
 import traceback
 import msvcrt
 
-from PyQt6 import QtWidgets
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
-from PyQt6.QtGui import QGuiApplication
-
 # Custom Imports
 
-from Driver.RJ45_UDP import RJ45_UDP
-from Setup.Queue_Setup import Queue_Group_Creator
+from Setup.Queue_Setup import DRIVER_PORT, Queue_Group_Creator
+from Setup.Metrics import Metrics
 
 
 
@@ -92,40 +88,56 @@ def remove_lock_file():
 
 
 
-def RJ45_UDP_thread(q_group, exit_process):
-    print("DEBUG: RJ45_UDP_thread started")
-    RJ45_UDP_p = psutil.Process(os.getpid())
-    try: RJ45_UDP_p.cpu_affinity([4, 5])
+def Driver_thread(q_group, exit_process):
+    print("DEBUG: Driver_thread started")
+    from Driver.Driver_Core import Driver_Core, make_source
+    from Setup.Metrics import init_metrics
+    from Setup.Operation_JSON_Loader import Operation_JSON_Loader
+    from Setup.Profiler import init_profiler
+
+    Driver_p = psutil.Process(os.getpid())
+    try: Driver_p.cpu_affinity([4, 5])
     except Exception: pass
-    try: RJ45_UDP_p.nice(psutil.HIGH_PRIORITY_CLASS)
+    try: Driver_p.nice(psutil.HIGH_PRIORITY_CLASS)
     except Exception: pass
+    init_metrics("driver")  # before any driver object: they keep the process instance
+    init_profiler("driver")  # TEMP_LOGGING_PROFILE starts a profiling window here
 
-    print("DEBUG: About to create RJ45_UDP object")
+    # Transport (UDP or USB serial) and batching come from the "Driver" config section
+    driver_config = Operation_JSON_Loader().Load_Driver()
+    print(f"DEBUG: About to create the {driver_config['transport']} driver")
 
     try: 
-        RJ45_UDP_obj = RJ45_UDP(q_group)
-        print("DEBUG: RJ45_UDP object created successfully")
+        Driver_obj = Driver_Core(make_source(driver_config), q_group, driver_config["flush_ms"], driver_config["batch_max"])
+        print("DEBUG: Driver object created successfully")
     except Exception as e: 
-        print(f"DEBUG: Failed to create RJ45_UDP object: {e}")
-        print("DEBUG: RJ45_UDP_thread exiting due to creation failure")
+        print(f"DEBUG: Failed to create Driver object: {e}")
+        print("DEBUG: Driver_thread exiting due to creation failure")
         return
 
     print("DEBUG: Starting main loop")
     try:
-        while not exit_process.is_set():
-            RJ45_UDP_obj.read_ppp()
+        Driver_obj.run(exit_process)
 
     except Exception as e:
         print(f"DEBUG: Exception in main loop: {e}")
     finally:
-        print("RJ45_UDP_thread: clean exit")
+        print("Driver_thread: clean exit")
         sys.exit(0)
 
 def QT_thread(q_group, exit_process):
     print("DEBUG: QT_thread started")
+    from PyQt6 import QtWidgets
+    from PyQt6.QtCore import QTimer
+    from GUI.Main_Project.Main_Project import Main_Project
+    from Setup.Metrics import init_metrics
+    from Setup.Profiler import init_profiler
+
     qt_p = psutil.Process(os.getpid())
     qt_p.cpu_affinity([2, 3])
     qt_p.nice(psutil.HIGH_PRIORITY_CLASS)
+    init_metrics("gui")
+    init_profiler("gui")
 
     print("DEBUG: Creating Qt application")
     app = QtWidgets.QApplication(sys.argv)
@@ -191,19 +203,20 @@ if __name__ == "__main__":
 
     exit_process = mp.Event()
     procs = []
+    metrics_block = Metrics.create()  # shared counters/histograms, attached by the children (METRICS_ENV)
 
 
     try:
-        QT_q_group_obj = Queue_Group_Creator({"RJ45_UDP": 20,})
+        QT_q_group_obj = Queue_Group_Creator({DRIVER_PORT: 20,})
         QT_q_group = QT_q_group_obj.q_group_dict  # Get the queue group dictionnary
 
 
         # Start processes
-        procs.append(mp.Process(target=RJ45_UDP_thread, args=(QT_q_group, exit_process)))
+        procs.append(mp.Process(target=Driver_thread, args=(QT_q_group, exit_process)))
         procs.append(mp.Process(target=QT_thread, args=(QT_q_group, exit_process)))
 
         print("DEBUG: Starting processes...")
-        process_names = ["RJ45_UDP_thread", "QT_thread"]
+        process_names = ["Driver_thread", "QT_thread"]
         for i, p in enumerate(procs):
             print(f"DEBUG: Starting process {process_names[i]}")
             p.start()
@@ -247,4 +260,6 @@ if __name__ == "__main__":
         for p in procs:
             if p.is_alive():
                 p.terminate()
+        metrics_block.close()
+        metrics_block.unlink()
         remove_lock_file()
@@ -0,0 +1,39 @@
+import os
+
+from Driver.Capture_File import Capture_Recorder, read_capture
+
+
+def record_files(directory, session, files, **limits):
+    """Write `files` capture files for `session` (one record each, every write rotates)."""
+    recorder = Capture_Recorder(str(directory), max_bytes=50, flush_s=3600, **limits)
+    recorder.session = session
+    for i in range(files):
+        recorder.record(i, ("127.0.0.1", 8888), b"x" * 100)
+        recorder._write_pending()
+    recorder.close()
+    return recorder
+
+
+def test_rotation_limit_spans_sessions(tmp_path):
+    (tmp_path / "field_issue.cap").write_bytes(b"kept")  # not a recorder name
+    record_files(tmp_path, "2026_01_01_10_00_00", 3, max_files=4, max_total_bytes=10**6)
+    record_files(tmp_path, "2026_01_02_10_00_00", 3, max_files=4, max_total_bytes=10**6)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "2026_01_01_10_00_00_003.cap",
+        "2026_01_02_10_00_00_001.cap",
+        "2026_01_02_10_00_00_002.cap",
+        "2026_01_02_10_00_00_003.cap",
+        "field_issue.cap",
+    ]
+    records = list(read_capture(str(tmp_path / "2026_01_02_10_00_00_003.cap")))
+    assert [(t_ns, data) for t_ns, _, data in records] == [(2, b"x" * 100)]
+
+
+def test_rotation_total_bytes(tmp_path):
+    record_files(tmp_path, "2026_01_01_10_00_00", 2, max_files=50)
+    size = os.path.getsize(tmp_path / "2026_01_01_10_00_00_001.cap")
+    # Room for the two newest files only (the one being started counts max_bytes)
+    record_files(tmp_path, "2026_01_02_10_00_00", 2, max_files=50, max_total_bytes=size + 50)
+
+    assert sorted(os.listdir(tmp_path)) == ["2026_01_02_10_00_00_001.cap", "2026_01_02_10_00_00_002.cap"]
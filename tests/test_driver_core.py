@@ -0,0 +1,11 @@
+from Driver.Driver_Core import Channel_Router
+
+
+def test_route_skips_unknown_cmd():
+    router = Channel_Router()
+    out = []
+    router.route((0, 5, 21, 1024), 7, out)  # CMD 0 is not in the command table, 21 is RTDA1
+
+    assert out == [{"RTDA1": [7, 1024 * router.scales[21] + router.offsets[21]]}]
+    assert router.messages == 1
+    assert router.unknown_cmd == 1
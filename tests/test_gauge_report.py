@@ -0,0 +1,18 @@
+from Setup.Gauge_Report import Gauge_Report
+
+
+def gauge(val):
+    return {"val": val, "lim": {"LL": 0.0, "L": 10.0, "H": 90.0, "HH": 100.0}}
+
+
+def test_render_all_cached_image_evicted_by_same_call(monkeypatch):
+    monkeypatch.setattr(Gauge_Report, "MAX_CACHE", 3)
+    report = Gauge_Report(workers=1)
+    first = [report.render(gauge(val)).getvalue() for val in (20.0, 30.0, 40.0)]
+
+    # Storing the new image evicts the oldest cached one (20.0), which this call also returns
+    images = report.render_all([gauge(20.0), gauge(50.0)])
+
+    assert images[0].getvalue() == first[0]
+    assert images[1].getvalue().startswith(b"\x89PNG")
+    report.close()